@@ -0,0 +1,201 @@
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+
+from resampling import bootstrap_diff, permutation_test
+
+# Metrics in the experiment scorecard: key -> (label, column, kind, unit,
+# short name). 'proportion' metrics are 0/1 flags tested with a chi-square
+# test, 'mean' metrics are tested with Welch's t-test. Every column is a
+# cube measure, so the whole scorecard comes from one grouped pass.
+AB_METRICS = {
+    'conversion': ("Dönüşüm Oranı (HasPurchased)", 'HasPurchased', 'proportion', '%', "Dönüşüm Oranı"),
+    'mean_spending': ("Ortalama Harcama (TotalSpentUSD)", 'TotalSpentUSD', 'mean', '$', "Ort. Harcama"),
+    'mean_playtime': ("Ortalama Oynama Süresi (PlayTimeHours)", 'PlayTimeHours', 'mean', ' saat', "Ort. Oynama Süresi"),
+    'active_rate': ("Aktif Oyuncu Oranı (IsActive)", 'IsActive', 'proportion', '%', "Aktif Oyuncu Oranı"),
+    'mean_sessions': ("Haftalık Oturum (SessionsPerWeek)", 'SessionsPerWeek', 'mean', '', "Ort. Haftalık Oturum"),
+    'mean_session_duration': ("Oturum Süresi (AvgSessionDurationMinutes)", 'AvgSessionDurationMinutes', 'mean', ' dk', "Ort. Oturum Süresi"),
+    'mean_level': ("Oyuncu Seviyesi (PlayerLevel)", 'PlayerLevel', 'mean', '', "Ort. Seviye"),
+    'mean_achievements': ("Açılan Başarı (AchievementsUnlocked)", 'AchievementsUnlocked', 'mean', '', "Ort. Başarı"),
+    'mean_friends': ("Arkadaş Sayısı (FriendsCount)", 'FriendsCount', 'mean', '', "Ort. Arkadaş Sayısı"),
+    'mean_fps': ("Ortalama FPS (AvgFPS)", 'AvgFPS', 'mean', '', "Ort. FPS"),
+    'mean_crashes': ("Çökme Sayısı (CrashCount)", 'CrashCount', 'mean', '', "Ort. Çökme Sayısı")
+}
+
+# Dimensions the scorecard can be broken down by
+AB_SEGMENTS = {
+    'GameGenre': "Oyun Türü",
+    'GameDifficulty': "Oyun Zorluğu",
+    'Device': "Cihaz",
+    'Location': "Lokasyon",
+    'EngagementLevel': "Etkileşim Seviyesi"
+}
+
+CORRECTIONS = {
+    'holm': "Holm (FWER)",
+    'bh': "Benjamini-Hochberg (FDR)",
+    'none': "Düzeltme Yok"
+}
+
+
+def ab_measures(metrics=AB_METRICS):
+    """Columns whose sufficient statistics the scorecard needs"""
+    return list(dict.fromkeys(metric[1] for metric in metrics.values()))
+
+
+def adjust_p_values(p_values, method='holm'):
+    """
+    Multiple-testing adjusted p-values; NaN p-values are left out of the family
+
+    Parameters:
+    p_values (array-like): Raw p-values
+    method (str): 'holm' (family-wise error), 'bh' (false discovery rate)
+        or 'none'
+    """
+    p_values = np.asarray(p_values, dtype='float64')
+    adjusted = p_values.copy()
+    valid = np.flatnonzero(~np.isnan(p_values))
+    m = len(valid)
+    if method == 'none' or m == 0:
+        return adjusted
+    order = valid[np.argsort(p_values[valid], kind='stable')]
+    ranked = p_values[order]
+    if method == 'holm':
+        stepped = np.maximum.accumulate((m - np.arange(m)) * ranked)
+    elif method == 'bh':
+        stepped = np.minimum.accumulate((m / np.arange(1, m + 1) * ranked)[::-1])[::-1]
+    else:
+        raise ValueError(f"Unknown correction method: {method}")
+    adjusted[order] = np.minimum(stepped, 1)
+    return adjusted
+
+
+def ab_scorecard(group_stats, metrics=AB_METRICS, alpha=0.05, correction='holm', control='A', treatment='B'):
+    """
+    Test every metric (and segment) of an experiment at once
+
+    All statistics are computed on (segment x metric) arrays from the
+    sufficient statistics of each group, without touching player rows.
+
+    Parameters:
+    group_stats (DataFrame): sufficient_stats() grouped by AB_Group, or by
+        [AB_Group, segment dimension]
+    metrics (dict): Metrics to test (see AB_METRICS)
+    alpha (float): Significance level, also used for the confidence intervals
+    correction (str): Multiple-testing correction, see adjust_p_values()
+    control, treatment (str): AB_Group values; differences are treatment - control
+
+    Returns:
+    DataFrame: One row per (segment, metric) with group sizes and means,
+        difference and confidence interval, test statistic, raw and
+        adjusted p-values, effect size and significance; empty if either
+        group is missing
+    """
+    groups = group_stats.index.get_level_values(0)
+    if control not in groups or treatment not in groups:
+        return pd.DataFrame()
+    if group_stats.index.nlevels > 1:
+        a = group_stats.xs(control, level=0)
+        b = group_stats.xs(treatment, level=0)
+        segments = a.index.intersection(b.index)
+        a, b = a.loc[segments], b.loc[segments]
+    else:
+        a = group_stats.loc[[control]]
+        b = group_stats.loc[[treatment]]
+        segments = pd.Index(["Tümü"])
+
+    keys = list(metrics)
+    columns = [metrics[key][1] for key in keys]
+    is_proportion = np.array([metrics[key][2] == 'proportion' for key in keys])
+
+    # (segment x metric) arrays
+    n_a = a['count'].to_numpy(dtype='float64')[:, None]
+    n_b = b['count'].to_numpy(dtype='float64')[:, None]
+    sum_a = a[[f'{c}_sum' for c in columns]].to_numpy(dtype='float64')
+    sum_b = b[[f'{c}_sum' for c in columns]].to_numpy(dtype='float64')
+    sumsq_a = a[[f'{c}_sumsq' for c in columns]].to_numpy(dtype='float64')
+    sumsq_b = b[[f'{c}_sumsq' for c in columns]].to_numpy(dtype='float64')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_a = sum_a / n_a
+        mean_b = sum_b / n_b
+        var_a = np.maximum(sumsq_a - sum_a ** 2 / n_a, 0) / (n_a - 1)
+        var_b = np.maximum(sumsq_b - sum_b ** 2 / n_b, 0) / (n_b - 1)
+        diff = mean_b - mean_a
+
+        # Welch's t-test for means
+        se2_a, se2_b = var_a / n_a, var_b / n_b
+        se_diff = np.sqrt(se2_a + se2_b)
+        t_stat = diff / se_diff
+        welch_df = (se2_a + se2_b) ** 2 / (se2_a ** 2 / (n_a - 1) + se2_b ** 2 / (n_b - 1))
+        t_p = 2 * stats.t.sf(np.abs(t_stat), welch_df)
+        t_crit = stats.t.ppf(1 - alpha / 2, welch_df)
+        pooled_std = np.sqrt(((n_a - 1) * var_a + (n_b - 1) * var_b) / (n_a + n_b - 2))
+        cohen_d = np.where(pooled_std > 0, diff / pooled_std, 0.0)
+
+        # Chi-square test with Yates' correction on the 2x2 table, as
+        # scipy.stats.chi2_contingency computes it
+        total = n_a + n_b
+        successes = sum_a + sum_b
+        expected = np.stack([
+            n_a * successes / total, n_a * (total - successes) / total,
+            n_b * successes / total, n_b * (total - successes) / total
+        ])
+        deviation = np.abs(sum_a - n_a * successes / total)
+        corrected = np.maximum(deviation - 0.5, 0)
+        chi2 = corrected ** 2 * (1 / expected).sum(axis=0)
+        chi2_p = stats.chi2.sf(chi2, 1)
+        odds_ratio = (sum_b / (n_b - sum_b)) / (sum_a / (n_a - sum_a))
+        # Unpooled normal-approximation interval for the difference in proportions
+        prop_se = np.sqrt(mean_a * (1 - mean_a) / n_a + mean_b * (1 - mean_b) / n_b)
+        z_crit = stats.norm.ppf(1 - alpha / 2)
+
+    statistic = np.where(is_proportion, chi2, t_stat)
+    p_value = np.where(is_proportion, chi2_p, t_p)
+    margin = np.where(is_proportion, z_crit * prop_se, t_crit * se_diff)
+    effect = np.where(is_proportion, odds_ratio, cohen_d)
+    p_adjusted = adjust_p_values(p_value.ravel(), correction).reshape(p_value.shape)
+
+    n_segments, n_metrics = len(segments), len(keys)
+    scorecard = pd.DataFrame({
+        'segment': np.repeat(segments.to_numpy(dtype=object), n_metrics),
+        'metric': np.tile(keys, n_segments),
+        'label': np.tile([metrics[key][0] for key in keys], n_segments),
+        'kind': np.tile([metrics[key][2] for key in keys], n_segments),
+        'test': np.tile(np.where(is_proportion, "Chi-kare", "Welch t"), n_segments),
+        'n_a': np.broadcast_to(n_a, diff.shape).ravel().astype('int64'),
+        'n_b': np.broadcast_to(n_b, diff.shape).ravel().astype('int64'),
+        'mean_a': mean_a.ravel(),
+        'mean_b': mean_b.ravel(),
+        'std_a': np.sqrt(var_a).ravel(),
+        'std_b': np.sqrt(var_b).ravel(),
+        'diff': diff.ravel(),
+        'ci_lower': (diff - margin).ravel(),
+        'ci_upper': (diff + margin).ravel(),
+        'statistic': statistic.ravel(),
+        'p_value': p_value.ravel(),
+        'p_adjusted': p_adjusted.ravel(),
+        'effect': effect.ravel(),
+        'effect_name': np.tile(np.where(is_proportion, "Odds Oranı", "Cohen's d"), n_segments)
+    })
+    scorecard['significant'] = scorecard['p_adjusted'] < alpha
+    return scorecard
+
+
+def filtered_scorecard(grouped_stats, segment=None, alpha=0.05, correction='holm'):
+    """
+    Scorecard of the filtered players, per `segment` value when given
+
+    Parameters:
+    grouped_stats (callable): grouped_stats(by, measures) of the filtered
+        players, e.g. views.context.PageContext.grouped_stats
+    """
+    by = ['AB_Group'] if segment is None else ['AB_Group', segment]
+    return ab_scorecard(grouped_stats(by, ab_measures()), alpha=alpha, correction=correction)
+
+
+def resampling_check(rows, column, alpha=0.05):
+    """Bootstrap interval and permutation test of the B - A difference in mean `column` of `rows`"""
+    values_a = rows.loc[rows['AB_Group'] == 'A', column].to_numpy(dtype='float64')
+    values_b = rows.loc[rows['AB_Group'] == 'B', column].to_numpy(dtype='float64')
+    return bootstrap_diff(values_a, values_b, alpha=alpha), permutation_test(values_a, values_b, alpha=alpha)
@@ -0,0 +1,79 @@
+import threading
+from collections import OrderedDict
+
+
+class AggregateCache:
+    """
+    Size-bounded LRU cache for page aggregates, shared by every session in
+    the process
+
+    Keys are (dataset version, filter key, page, metric) tuples. Concurrent
+    requests for a key that is being computed wait for the first caller
+    instead of computing it again, so a popular default view is computed
+    once. Cached values are shared: callers must not mutate them.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for `key`, calling `compute()` on a miss"""
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key]
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Another session is computing this key; wait and look again
+            pending.wait()
+
+        try:
+            value = compute()
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return value
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+def make_filter_key(selections, ranges=None):
+    """Hashable, order-independent key for a filter combination"""
+    selection_key = tuple(sorted(
+        (dim, tuple(sorted(map(str, values)))) for dim, values in selections.items() if values
+    ))
+    range_key = tuple(sorted(
+        (col, tuple(str(bound) for bound in bounds)) for col, bounds in (ranges or {}).items()
+    ))
+    return selection_key, range_key
@@ -0,0 +1,433 @@
+import argparse
+import functools
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import sklearn
+
+import page_metrics
+from ab_testing import AB_METRICS, filtered_scorecard, resampling_check
+from boxstats import BoxCube
+from cube import PlayerCube
+from export import export_filtered
+from filter_index import FilterIndex, take_rows
+from generate_data import encode_csv, iter_chunks
+from histogram import HistogramCube
+from profiling import available_cpus, current_rss_mb, peak_rss_mb, reset_peak_rss
+from refresh import BOX_CUBE_COLUMNS, CUBE_COLUMNS, HISTOGRAM_CUBE_COLUMNS, RETENTION_COLUMNS
+from render import stratified_sample
+from retention import RETENTION_SEGMENTS, RetentionTables
+from segmentation import SEGMENT_FEATURES, fit_segment_model
+from sequential import SequentialMonitor, row_filter
+from storage import CSV_PATH, PARQUET_PATH, load_players, read_csv_players
+
+# Generated datasets and result files are kept here, outside version control
+BENCHMARK_DIR = '.benchmarks'
+
+DEFAULT_SIZES = ['10k', '1m', '10m']
+
+# Fixed seed and reference date, so every run benchmarks the same rows
+BENCHMARK_SEED = 42
+REFERENCE_DATE = '2025-06-01'
+
+# Sidebar filter combinations every page is computed for: 'all' takes the
+# cube paths, 'filtered' (genres plus a signup date range) the raw rows
+SCENARIOS = {
+    'all': ({}, {}),
+    'filtered': (
+        {'GameGenre': ['Action RPG', 'Strategy', 'Casual']},
+        {'SignupDate': (pd.Timestamp('2024-09-01').to_datetime64(), pd.Timestamp('2025-03-01').to_datetime64())}
+    )
+}
+
+# A stage counts as regressed when it is this much slower than the
+# baseline, and by more than REGRESSION_MIN_SECONDS (timer noise)
+REGRESSION_THRESHOLD = 0.10
+REGRESSION_MIN_SECONDS = 0.005
+
+
+def parse_size(size):
+    """Row count from '10k', '1m', '2.5m' or a plain number"""
+    size = str(size).strip().lower()
+    scale = {'k': 1_000, 'm': 1_000_000}.get(size[-1:], 1)
+    return int(float(size.rstrip('km')) * scale)
+
+
+def git_commit():
+    """(commit hash, has uncommitted changes) of the working tree, (None, None) outside git"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status.strip())
+
+
+def prepare_dataset(n_rows, seed=BENCHMARK_SEED, benchmark_dir=BENCHMARK_DIR):
+    """
+    Directory holding a generated dataset of `n_rows` players in the
+    dashboard's data/ layout (CSV plus its Parquet copy); generated once
+    and reused by later runs
+
+    Returns:
+    str: The directory; the stages run with it as working directory
+    """
+    root = os.path.abspath(os.path.join(benchmark_dir, 'data', f'players-{n_rows}-{seed}'))
+    csv_path, parquet_path = os.path.join(root, CSV_PATH), os.path.join(root, PARQUET_PATH)
+    if os.path.exists(parquet_path):
+        return root
+    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+    writer = None
+    with open(f'{csv_path}.partial', 'wb') as f:
+        for df, _ in iter_chunks(n_rows, seed, REFERENCE_DATE, workers=available_cpus()):
+            f.write(encode_csv(df, header=writer is None))
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(f'{parquet_path}.partial', table.schema)
+            writer.write_table(table)
+    writer.close()
+    # The Parquet copy is renamed last, so it is never older than the CSV
+    os.replace(f'{csv_path}.partial', csv_path)
+    os.replace(f'{parquet_path}.partial', parquet_path)
+    return root
+
+
+def filter_scenario(df, filter_index, selections, ranges):
+    """
+    The filtered players a scenario's pages compute on, selected the way
+    app.py selects them (bitmap index positions, then the rows)
+
+    Returns:
+    dict: selections, ranges, positions and rows
+    """
+    positions = filter_index.positions(selections, ranges)
+    return {'selections': selections, 'ranges': ranges, 'positions': positions, 'rows': take_rows(df, positions)}
+
+
+def page_sources(data, state):
+    """
+    The scenario's grouped_stats and filtered_retention, bound like the
+    views.context.PageContext methods the pages pass to page_metrics
+    """
+    args = (data['rows'], data['selections'], data['ranges'])
+    return (
+        functools.partial(page_metrics.grouped_stats, state['cube'], *args),
+        functools.partial(page_metrics.retention_rollup, state['retention_tables'], *args)
+    )
+
+
+def histogram(data, state, column, paying_only=False):
+    return page_metrics.histogram_counts(
+        state['histogram_cube'], data['rows'], data['selections'], data['ranges'], column, paying_only
+    )
+
+
+def box_summaries(data, state, column, positive_only=False):
+    return page_metrics.box_summaries(
+        state['box_cube'], data['rows'], data['selections'], data['ranges'], column, positive_only
+    )
+
+
+# Page computations, as the page modules in views/ run them on first view
+
+def overview_page(data, state):
+    stats, retention = page_sources(data, state)
+    return (
+        page_metrics.overview_kpis(stats),
+        page_metrics.player_counts(stats, 'GameGenre'),
+        page_metrics.player_counts(stats, 'EngagementLevel'),
+        [page_metrics.retention_curves(retention, segment) for segment in RETENTION_SEGMENTS.values()]
+    )
+
+
+def players_page(data, state):
+    return (
+        histogram(data, state, 'Age'),
+        page_metrics.gender_counts(data['rows']),
+        stratified_sample(data['rows'], 'EngagementLevel')
+    )
+
+
+def revenue_page(data, state):
+    stats, _ = page_sources(data, state)
+    return (
+        page_metrics.revenue_kpis(stats, data['rows']),
+        page_metrics.revenue_by_device(stats),
+        page_metrics.revenue_by_engagement(stats),
+        histogram(data, state, 'TotalSpentUSD', paying_only=True)
+    )
+
+
+def sessions_page(data, state):
+    _, retention = page_sources(data, state)
+    return (
+        histogram(data, state, 'SessionsPerWeek'),
+        histogram(data, state, 'AvgSessionDurationMinutes'),
+        page_metrics.playtime_by_tenure(retention),
+        box_summaries(data, state, 'AvgSessionDurationMinutes')
+    )
+
+
+def achievements_page(data, state):
+    stats, _ = page_sources(data, state)
+    return page_metrics.achievement_kpis(stats), histogram(data, state, 'AchievementsUnlocked')
+
+
+def performance_page(data, state):
+    stats, _ = page_sources(data, state)
+    return (
+        page_metrics.performance_kpis(stats),
+        histogram(data, state, 'AvgFPS'),
+        page_metrics.crash_counts(data['rows']),
+        page_metrics.performance_by_device(stats),
+        page_metrics.crashes_by_guild(stats)
+    )
+
+
+def social_page(data, state):
+    stats, _ = page_sources(data, state)
+    rows = data['rows']
+    return (
+        page_metrics.social_kpis(stats),
+        histogram(data, state, 'FriendsCount'),
+        page_metrics.guild_counts(stats),
+        box_summaries(data, state, 'PlayTimeHours'),
+        box_summaries(data, state, 'TotalSpentUSD', positive_only=True),
+        page_metrics.friends_playtime_trend(rows),
+        page_metrics.friends_playtime_density(rows)
+    )
+
+
+def cohort_page(data, state):
+    return page_metrics.cohorts(data['rows'], 'W')
+
+
+def segmentation_page(data, state):
+    return state['segment_model'].segments(data['rows'])
+
+
+def ab_test_page(data, state):
+    stats, _ = page_sources(data, state)
+    return filtered_scorecard(stats), filtered_scorecard(stats, 'GameGenre')
+
+
+def ab_resampling(data, state):
+    return resampling_check(data['rows'], AB_METRICS['mean_spending'][1])
+
+
+def ab_sequential(data, state):
+    monitor = SequentialMonitor()
+    monitor.sync(state['df'], row_filter(data['selections'], data['ranges']))
+    return monitor.summary()
+
+
+def export_csv(data, state):
+    return export_filtered(state['df'], data['positions'], 'csv').read()
+
+
+def export_parquet(data, state):
+    return export_filtered(state['df'], data['positions'], 'parquet').read()
+
+
+# Stages run per scenario: name -> function(filter_scenario(...), state)
+SCENARIO_STAGES = {
+    'page.overview': overview_page,            # Genel Bakış
+    'page.players': players_page,              # Oyuncu Analizi
+    'page.revenue': revenue_page,              # Gelir Analizi
+    'page.sessions': sessions_page,            # Oturum Analizi
+    'page.achievements': achievements_page,    # Başarı Takibi
+    'page.performance': performance_page,      # Teknik Performans
+    'page.social': social_page,                # Sosyal Analiz
+    'page.cohort': cohort_page,                # Kohort Analizi
+    'page.segmentation': segmentation_page,    # Oyuncu Segmentasyonu
+    'page.ab_test': ab_test_page,              # A/B Test Analizi
+    'ab.resampling': ab_resampling,
+    'ab.sequential': ab_sequential,
+    'export.csv': export_csv,
+    'export.parquet': export_parquet
+}
+
+
+def measure(fn, repeat=1, trace=True):
+    """
+    Run `fn` `repeat` times and measure it
+
+    Returns:
+    (object, dict): The last result, and the median and minimum wall time,
+        peak RSS and its growth over the RSS before the stage, and (with
+        `trace`, on one extra traced run) the peak traced allocation size
+        and the number of allocated blocks still live when `fn` returns
+    """
+    times, peaks, growths = [], [], []
+    result = None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        reset_peak_rss()
+        before = current_rss_mb()
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+        peaks.append(peak_rss_mb())
+        growths.append(peaks[-1] - before)
+    record = {
+        'seconds': float(np.median(times)),
+        'seconds_min': min(times),
+        'peak_rss_mb': max(peaks),
+        'rss_growth_mb': max(growths)
+    }
+    if trace:
+        result = None
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        blocks = sum(stat.count_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, 'filename'))
+        tracemalloc.stop()
+        record.update(alloc_peak_mb=(peak_bytes - start_bytes) / 2 ** 20, alloc_blocks=blocks)
+    return result, record
+
+
+def run_size(n_rows, stages=None, repeat=1, trace=True, log=print):
+    """
+    Benchmark every stage on a generated dataset of `n_rows` players
+
+    Parameters:
+    n_rows (int): Dataset size
+    stages (list or None): Stage name prefixes to run ('page', 'load.csv',
+        ...); the load and build stages always run since later stages need
+        their output
+    repeat (int): Timed runs per stage
+    trace (bool): Also measure allocations with tracemalloc
+    log (callable): Progress output
+
+    Returns:
+    list: One result dict per (stage, scenario)
+    """
+    root = prepare_dataset(n_rows)
+    results = []
+    state = {}
+
+    def run(stage, fn, scenario=None, required=False):
+        if not required and stages and not any(stage.startswith(prefix) for prefix in stages):
+            return None
+        result, record = measure(fn, repeat, trace)
+        results.append(dict(rows=n_rows, stage=stage, scenario=scenario, **record))
+        log(f"{n_rows:>12,} {scenario or '-':<9} {stage:<22} {record['seconds']:>9.3f} sn {record['peak_rss_mb']:>9.1f} MB")
+        return result
+
+    cwd = os.getcwd()
+    # Every module reads data/ relative to the working directory
+    os.chdir(root)
+    try:
+        df = state['df'] = run('load.parquet', lambda: load_players()[0], required=True)
+        run('load.csv', lambda: read_csv_players())
+        filter_index = run('build.filter_index', lambda: FilterIndex(df), required=True)
+        state['cube'] = run('build.cube', lambda: PlayerCube(df[CUBE_COLUMNS]), required=True)
+        state['histogram_cube'] = run('build.histogram_cube', lambda: HistogramCube(df[HISTOGRAM_CUBE_COLUMNS]), required=True)
+        state['retention_tables'] = run('build.retention_tables', lambda: RetentionTables(df[RETENTION_COLUMNS]), required=True)
+        state['box_cube'] = run('build.box_cube', lambda: BoxCube(df[BOX_CUBE_COLUMNS]), required=True)
+        state['segment_model'] = run('build.segment_model', lambda: fit_segment_model(df[SEGMENT_FEATURES]), required=True)
+        for scenario, (selections, ranges) in SCENARIOS.items():
+            data = run('filter', lambda: filter_scenario(df, filter_index, selections, ranges), scenario, required=True)
+            for stage, fn in SCENARIO_STAGES.items():
+                run(stage, lambda: fn(data, state), scenario)
+            del data
+    finally:
+        os.chdir(cwd)
+    return results
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, stages=None, repeat=1, trace=True, log=print):
+    """
+    Run the suite for every size
+
+    Returns:
+    dict: 'meta' (commit, environment, settings) and 'results'
+    """
+    commit, dirty = git_commit()
+    meta = {
+        'commit': commit,
+        'dirty': dirty,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': available_cpus(),
+        'versions': {'numpy': np.__version__, 'pandas': pd.__version__, 'pyarrow': pa.__version__, 'scikit-learn': sklearn.__version__},
+        'seed': BENCHMARK_SEED,
+        'repeat': repeat,
+        'tracemalloc': trace
+    }
+    results = []
+    for size in sizes:
+        results += run_size(parse_size(size), stages, repeat, trace, log)
+    return {'meta': meta, 'results': results}
+
+
+def compare_results(baseline, current, threshold=REGRESSION_THRESHOLD, min_seconds=REGRESSION_MIN_SECONDS):
+    """
+    Match the stages of two result files
+
+    Returns:
+    DataFrame: One row per (rows, scenario, stage) present in both, with
+        both timings and peak RSS, their ratios and a 'regressed' flag
+    """
+    key = ['rows', 'scenario', 'stage']
+    columns = key + ['seconds', 'peak_rss_mb']
+    base = pd.DataFrame(baseline['results'])[columns].fillna({'scenario': '-'})
+    new = pd.DataFrame(current['results'])[columns].fillna({'scenario': '-'})
+    merged = base.merge(new, on=key, suffixes=('_base', '_new'), sort=False)
+    merged['time_ratio'] = merged['seconds_new'] / merged['seconds_base']
+    merged['rss_ratio'] = merged['peak_rss_mb_new'] / merged['peak_rss_mb_base']
+    merged['regressed'] = (
+        (merged['time_ratio'] > 1 + threshold)
+        & (merged['seconds_new'] - merged['seconds_base'] > min_seconds)
+    )
+    return merged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Panel sayfalarının hesaplama süresini ölçer (Dashboard compute benchmark)")
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES), help="Veri boyutları, ör. 10k,1m,10m")
+    parser.add_argument('--stages', help="Yalnızca bu önekle başlayan aşamalar, ör. page,export")
+    parser.add_argument('--repeat', type=int, default=1, help="Aşama başına ölçüm sayısı")
+    parser.add_argument('--no-tracemalloc', action='store_true', help="Bellek ayırma ölçümünü atla")
+    parser.add_argument('--output', help="Sonuç dosyası (varsayılan: .benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'), help="İki sonuç dosyasını karşılaştır")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD, help="Gerileme eşiği (oran)")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        comparison = compare_results(baseline, current, args.threshold)
+        with pd.option_context('display.max_rows', None, 'display.width', 200):
+            print(comparison.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+        regressions = comparison[comparison['regressed']]
+        print(f"\n{len(regressions)} aşamada gerileme (> %{args.threshold * 100:.0f} daha yavaş)")
+        sys.exit(1 if len(regressions) else 0)
+
+    report = run_benchmarks(
+        args.sizes.split(','), args.stages.split(',') if args.stages else None, args.repeat, not args.no_tracemalloc
+    )
+    output = args.output or os.path.join(BENCHMARK_DIR, 'results', f"{(report['meta']['commit'] or 'worktree')[:12]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=1)
+    print(f"\nSonuçlar kaydedildi: {output}")
@@ -0,0 +1,314 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from filter_index import FILTER_DIMENSIONS
+
+# Outlier points drawn per box; the rest are only counted
+MAX_OUTLIERS = 500
+
+# Columns drawn as box plots per GuildMember; the box cube keeps a
+# quantile sketch of each per combination of BOX_DIMENSIONS
+BOX_COLUMNS = ['AvgSessionDurationMinutes', 'PlayTimeHours', 'TotalSpentUSD']
+BOX_DIMENSIONS = FILTER_DIMENSIONS + ['GuildMember']
+
+# Every quantile a sketch returns is within this fraction of the value of
+# the right rank
+SKETCH_ACCURACY = 0.01
+
+# Magnitudes below this are counted as zero by a sketch
+SKETCH_MIN_VALUE = 1e-9
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative accuracy (DDSketch-style)
+
+    Values are counted in logarithmic buckets whose numbers grow with the
+    value (negative values get negative numbers, zero is bucket 0), so a
+    sketch is a sorted array of bucket numbers and their counts. Sketches
+    of disjoint rows merge by adding the counts of equal buckets, which
+    gives the same sketch as one built from all the rows.
+    """
+
+    gamma = (1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY)
+    # Bucket of the smallest magnitude that is not zero
+    _key_offset = int(np.ceil(np.log(SKETCH_MIN_VALUE) / np.log(gamma))) - 1
+
+    def __init__(self, buckets, counts):
+        self.buckets = buckets
+        self.counts = counts
+
+    @classmethod
+    def bucket_of(cls, values):
+        """Bucket number of each value (NaN values must be removed first)"""
+        values = np.asarray(values, dtype='float64')
+        magnitudes = np.abs(values)
+        nonzero = magnitudes >= SKETCH_MIN_VALUE
+        keys = np.zeros(len(values), dtype=np.int64)
+        keys[nonzero] = np.ceil(np.log(magnitudes[nonzero]) / np.log(cls.gamma)).astype(np.int64) - cls._key_offset
+        return np.sign(values).astype(np.int64) * keys
+
+    @classmethod
+    def value_of(cls, buckets):
+        """Value standing for each bucket, within SKETCH_ACCURACY of every value in it"""
+        buckets = np.asarray(buckets)
+        keys = np.abs(buckets) + cls._key_offset
+        return np.sign(buckets) * 2 * cls.gamma ** keys.astype('float64') / (cls.gamma + 1)
+
+    @classmethod
+    def from_values(cls, values):
+        values = np.asarray(values, dtype='float64')
+        buckets, counts = np.unique(cls.bucket_of(values[~np.isnan(values)]), return_counts=True)
+        return cls(buckets, counts)
+
+    @classmethod
+    def merged(cls, buckets, counts):
+        """Sketch of unsorted (bucket, count) pairs, equal buckets added up"""
+        if len(buckets) == 0:
+            return cls(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        low = buckets.min()
+        totals = np.bincount(buckets - low, weights=counts).astype(np.int64)
+        present = np.flatnonzero(totals)
+        return cls(present + low, totals[present])
+
+    def merge(self, other):
+        """Sketch of the values of both sketches"""
+        return QuantileSketch.merged(np.concatenate([self.buckets, other.buckets]), np.concatenate([self.counts, other.counts]))
+
+    def positive(self):
+        """Sketch of the values above zero only"""
+        keep = self.buckets > 0
+        return QuantileSketch(self.buckets[keep], self.counts[keep])
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def quantile(self, q):
+        """Approximate q-quantile (0 <= q <= 1); NaN when the sketch is empty"""
+        n = self.count
+        if n == 0:
+            return np.nan
+        rank = q * (n - 1)
+        index = np.searchsorted(np.cumsum(self.counts), rank, side='right')
+        return float(self.value_of(self.buckets[min(index, len(self.buckets) - 1)]))
+
+
+def _sample_outliers(outliers, max_outliers, random_state):
+    # A deterministic sample that always keeps the extremes
+    rng = np.random.default_rng(random_state)
+    extremes = [outliers.argmin(), outliers.argmax()]
+    sample = rng.choice(len(outliers), max_outliers - 2, replace=False)
+    return outliers[np.union1d(extremes, sample)]
+
+
+def box_summary(values, max_outliers=MAX_OUTLIERS, random_state=42):
+    """
+    Box-plot statistics of `values`, computed like Plotly's defaults
+
+    Quartiles use linear interpolation, whiskers reach the furthest values
+    within 1.5 IQR of the box, and values beyond them are outliers.
+
+    Parameters:
+    values (array-like): Values of one box
+    max_outliers (int): Outliers returned for drawing; a deterministic
+        sample when there are more, always including the extremes
+    random_state (int): Seed of the outlier sample
+
+    Returns:
+    dict or None: n, q1, median, q3, lowerfence, upperfence, outliers and
+        n_outliers; None when there are no values
+    """
+    values = np.asarray(values, dtype='float64')
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return None
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+
+    iqr = q3 - q1
+    inside = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+    outliers = values[~inside]
+    n_outliers = len(outliers)
+    if n_outliers > max_outliers:
+        outliers = _sample_outliers(outliers, max_outliers, random_state)
+    return {
+        'n': len(values),
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'lowerfence': values[inside].min() if inside.any() else q1,
+        'upperfence': values[inside].max() if inside.any() else q3,
+        'outliers': outliers,
+        'n_outliers': n_outliers
+    }
+
+
+def grouped_box_summaries(df, by, column):
+    """box_summary() of `column` for each value of `by`, as a dict keyed by group"""
+    return {
+        group: box_summary(values)
+        for group, values in df.groupby(by, observed=True)[column]
+    }
+
+
+def sketch_box_summary(sketch, max_outliers=MAX_OUTLIERS, random_state=42):
+    """
+    box_summary() from a QuantileSketch: the quartiles are within
+    SKETCH_ACCURACY of the exact ones, and the whiskers and outliers are
+    bucket values, so an outlier point stands for every value in its bucket
+    """
+    n = sketch.count
+    if n == 0:
+        return None
+    q1, median, q3 = (sketch.quantile(q) for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+    values = sketch.value_of(sketch.buckets)
+    inside = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+    outliers = values[~inside]
+    if len(outliers) > max_outliers:
+        outliers = _sample_outliers(outliers, max_outliers, random_state)
+    return {
+        'n': n,
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'lowerfence': values[inside].min() if inside.any() else q1,
+        'upperfence': values[inside].max() if inside.any() else q3,
+        'outliers': outliers,
+        'n_outliers': int(sketch.counts[~inside].sum())
+    }
+
+
+class BoxCube:
+    """
+    Quantile sketches of every box column per combination of
+    BOX_DIMENSIONS
+
+    A column's sketches are kept as one run of (cell, bucket, count)
+    entries sorted by cell, so they take the populated buckets only. Box
+    statistics for any selection on the dimensions come from merging the
+    selected cells' sketches, which costs the number of entries, not rows.
+    """
+
+    def __init__(self, df, columns=BOX_COLUMNS, dimensions=BOX_DIMENSIONS):
+        self.dimensions = list(dimensions)
+        # Combine the per-dimension codes into one cell number per row
+        codes, uniques = zip(*(pd.factorize(df[dim], sort=True) for dim in self.dimensions))
+        shape = [len(values) for values in uniques]
+        cell_ids, cell_codes = np.unique(np.ravel_multi_index(codes, shape), return_inverse=True)
+        cell_dim_codes = np.unravel_index(cell_ids, shape)
+        self.cells = pd.DataFrame({
+            dim: np.asarray(values)[dim_codes]
+            for dim, values, dim_codes in zip(self.dimensions, uniques, cell_dim_codes)
+        })
+        self.sketches = {}
+        for col in columns:
+            values = df[col].to_numpy(dtype='float64')
+            valid = ~np.isnan(values)
+            self.sketches[col] = self._entries(cell_codes[valid], QuantileSketch.bucket_of(values[valid]))
+
+    @staticmethod
+    def _entries(cells, buckets, counts=None):
+        # (cell, bucket) pairs summed and sorted by cell, then bucket
+        low = buckets.min() if len(buckets) else 0
+        span = (buckets.max() - low + 1) if len(buckets) else 1
+        pairs, inverse = np.unique(cells.astype(np.int64) * span + (buckets - low), return_inverse=True)
+        totals = np.bincount(inverse, weights=counts, minlength=len(pairs)).astype(np.int64)
+        return (pairs // span).astype(np.int32), (pairs % span + low).astype(np.int32), totals
+
+    def append(self, rows):
+        """Cube with `rows` added; returns a new cube and leaves this one unchanged"""
+        delta = BoxCube(rows, columns=list(self.sketches), dimensions=self.dimensions)
+        # Existing cells keep their numbers; new combinations are numbered after them
+        cells = pd.concat([self.cells, delta.cells], ignore_index=True)
+        cell_codes, unique_cells = pd.MultiIndex.from_frame(cells).factorize()
+        cube = copy.copy(self)
+        cube.cells = unique_cells.set_names(self.dimensions).to_frame(index=False)
+        delta_codes = cell_codes[len(self.cells):]
+        cube.sketches = {}
+        for col, (entry_cells, buckets, counts) in self.sketches.items():
+            delta_cells, delta_buckets, delta_counts = delta.sketches[col]
+            cube.sketches[col] = self._entries(
+                np.concatenate([entry_cells, delta_codes[delta_cells]]),
+                np.concatenate([buckets, delta_buckets]),
+                np.concatenate([counts, delta_counts])
+            )
+        return cube
+
+    def covers(self, column, selections, by='GuildMember'):
+        """True when the cube can answer box statistics of `column` by `by` under `selections`"""
+        return (
+            column in self.sketches and by in self.dimensions
+            and all(dim in self.dimensions for dim, values in selections.items() if values)
+        )
+
+    def sketches_by(self, column, selections=None, by='GuildMember'):
+        """Merged QuantileSketch of `column` per value of `by` over the cells matching `selections`"""
+        keep = np.ones(len(self.cells), dtype=bool)
+        for dim, values in (selections or {}).items():
+            if values:
+                keep &= self.cells[dim].isin(values).to_numpy()
+        entry_cells, buckets, counts = self.sketches[column]
+        groups = self.cells[by].to_numpy()
+        merged = {}
+        for group in np.unique(groups[keep]):
+            selected = (keep & (groups == group))[entry_cells]
+            merged[group] = QuantileSketch.merged(buckets[selected], counts[selected])
+        return merged
+
+    def summaries(self, column, selections=None, by='GuildMember', positive_only=False):
+        """
+        sketch_box_summary() of `column` per value of `by`, like
+        grouped_box_summaries(); `positive_only` keeps values above zero
+        """
+        summaries = {}
+        for group, sketch in self.sketches_by(column, selections, by).items():
+            if positive_only:
+                sketch = sketch.positive()
+            if sketch.count:
+                summaries[group] = sketch_box_summary(sketch)
+        return summaries
+
+
+def box_figure(summaries, title, x_title, y_title, names=None):
+    """
+    Box plot drawn from precomputed statistics; only the (capped)
+    outliers are sent as points
+
+    Parameters:
+    summaries (dict): Group -> box_summary() result
+    names (dict or None): Group -> axis label
+    """
+    fig = go.Figure()
+    color = '#636efa'
+    for group, summary in summaries.items():
+        if summary is None:
+            continue
+        name = (names or {}).get(group, str(group))
+        fig.add_trace(go.Box(
+            x=[name],
+            q1=[summary['q1']],
+            median=[summary['median']],
+            q3=[summary['q3']],
+            lowerfence=[summary['lowerfence']],
+            upperfence=[summary['upperfence']],
+            name=name,
+            marker_color=color,
+            boxpoints=False,
+            showlegend=False
+        ))
+        if len(summary['outliers']):
+            fig.add_trace(go.Scatter(
+                x=[name] * len(summary['outliers']),
+                y=summary['outliers'],
+                mode='markers',
+                marker=dict(color=color, size=4),
+                name=name,
+                showlegend=False,
+                hovertemplate=f"%{{y}}<extra>{summary['n_outliers']:,} aykırı değer</extra>"
+            ))
+    fig.update_layout(title=title, xaxis_title=x_title, yaxis_title=y_title)
+    return fig
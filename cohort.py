@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+# Supported cohort grains: key -> (label, cohort column name, period name, cohort axis title)
+COHORT_GRAINS = {
+    'D': ("Günlük", 'SignupDay', "Gün", "Kayıt Günü"),
+    'W': ("Haftalık", 'SignupWeek', "Hafta", "Kayıt Haftası"),
+    'M': ("Aylık", 'SignupMonth', "Ay", "Kayıt Ayı")
+}
+
+
+def period_index(values, grain):
+    """
+    Integer period number of each datetime64 value
+
+    Weeks start on Monday, matching pandas' 'W' periods: day 0 of the
+    epoch (1970-01-01) is a Thursday, so shifting by 3 days aligns weeks.
+    """
+    values = np.asarray(values, dtype='datetime64[ns]')
+    if grain == 'M':
+        return values.astype('datetime64[M]').astype(np.int64)
+    days = values.astype('datetime64[D]').astype(np.int64)
+    if grain == 'D':
+        return days
+    if grain == 'W':
+        return (days + 3) // 7
+    raise ValueError(f"Unknown cohort grain: {grain}")
+
+
+def period_labels(periods, grain):
+    """Readable labels for period numbers, in the same format as str(pd.Period)"""
+    periods = np.asarray(periods, dtype=np.int64)
+    if grain == 'M':
+        return np.datetime_as_string(periods.astype('datetime64[M]'), unit='M')
+    if grain == 'D':
+        return np.datetime_as_string(periods.astype('datetime64[D]'), unit='D')
+    week_start = (periods * 7 - 3).astype('datetime64[D]')
+    week_end = week_start + np.timedelta64(6, 'D')
+    return np.char.add(
+        np.char.add(np.datetime_as_string(week_start, unit='D'), '/'),
+        np.datetime_as_string(week_end, unit='D')
+    )
+
+
+def cohort_matrix(signup_dates, last_active_dates, grain='W'):
+    """
+    Retention matrix of signup cohorts by periods since signup
+
+    A player counts as retained for age k when their last activity falls
+    k periods after their signup period. Cohort and age are integer
+    arithmetic on datetime64 values and the matrix is a single bincount.
+
+    Parameters:
+    signup_dates (array-like): SignupDate values
+    last_active_dates (array-like): LastActiveDate values
+    grain (str): 'D', 'W' or 'M'
+
+    Returns:
+    (DataFrame, Series): Retention (%) indexed by cohort label with one
+        column per age, and cohort sizes; both empty if no valid rows
+    """
+    signup_dates = np.asarray(signup_dates, dtype='datetime64[ns]')
+    last_active_dates = np.asarray(last_active_dates, dtype='datetime64[ns]')
+    cohort_name = COHORT_GRAINS[grain][1]
+
+    # Drop missing dates and activity before signup
+    valid = ~(np.isnat(signup_dates) | np.isnat(last_active_dates))
+    signup_period = period_index(signup_dates[valid], grain)
+    age = period_index(last_active_dates[valid], grain) - signup_period
+    signup_period = signup_period[age >= 0]
+    age = age[age >= 0]
+    if len(age) == 0:
+        return pd.DataFrame(), pd.Series(dtype='int64', name=cohort_name)
+
+    first_period = signup_period.min()
+    cohort = signup_period - first_period
+    n_cohorts = int(cohort.max()) + 1
+    n_ages = int(age.max()) + 1
+    counts = np.bincount(cohort * n_ages + age, minlength=n_cohorts * n_ages).reshape(n_cohorts, n_ages)
+    sizes = counts.sum(axis=1)
+
+    # Only cohorts with players become rows
+    observed = sizes > 0
+    labels = pd.Index(period_labels(np.flatnonzero(observed) + first_period, grain), name=cohort_name)
+    retention = pd.DataFrame(
+        counts[observed] / sizes[observed, None] * 100,
+        index=labels,
+        columns=pd.RangeIndex(n_ages, name='CohortAge')
+    )
+    cohort_size = pd.Series(sizes[observed], index=labels, name='Oyuncu Sayısı')
+    return retention, cohort_size
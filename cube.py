@@ -0,0 +1,175 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+# Dimensions every chart groups by (a subset of). All are low-cardinality,
+# so the cube has at most the product of their cardinalities cells
+# whatever the row count; per-day curves come from retention.py's tables
+CUBE_DIMENSIONS = [
+    'GameGenre',
+    'GameDifficulty',
+    'Device',
+    'Location',
+    'EngagementLevel',
+    'GuildMember',
+    'AB_Group'
+]
+
+# Numeric metrics stored per cell as count, sum, sum of squares, min and max
+CUBE_MEASURES = [
+    'Age',
+    'TotalSpentUSD',
+    'PayingSpentUSD',
+    'PlayTimeHours',
+    'SessionsPerWeek',
+    'AvgSessionDurationMinutes',
+    'PlayerLevel',
+    'AchievementsUnlocked',
+    'FriendsCount',
+    'AvgFPS',
+    'CrashCount',
+    'IsActive',
+    'HasPurchased'
+]
+
+# Measures derived from other columns: name -> (inputs, function)
+DERIVED_MEASURES = {
+    # Spending of paying players only, so ARPPU can be answered from sums
+    'PayingSpentUSD': (['TotalSpentUSD', 'HasPurchased'], lambda df: df['TotalSpentUSD'] * df['HasPurchased'])
+}
+
+STATS = ['sum', 'sumsq', 'min', 'max']
+
+
+def measure_inputs(measures):
+    """Raw columns needed to compute `measures`"""
+    columns = []
+    for measure in measures:
+        columns += DERIVED_MEASURES[measure][0] if measure in DERIVED_MEASURES else [measure]
+    return list(dict.fromkeys(columns))
+
+
+def sufficient_stats(df, by, measures):
+    """
+    Count, sum, sum of squares, min and max of each measure per group
+
+    Parameters:
+    df (DataFrame): Player rows
+    by (list): Columns to group by; empty for a single total row
+    measures (list): Measures to summarise (see CUBE_MEASURES)
+
+    Returns:
+    DataFrame: One row per group with a `count` column and
+        `<measure>_<stat>` columns for each stat in STATS
+    """
+    by = list(by)
+    values = {}
+    for measure in measures:
+        if measure in DERIVED_MEASURES:
+            column = DERIVED_MEASURES[measure][1](df)
+        else:
+            column = df[measure]
+        values[measure] = column.to_numpy(dtype='float64')
+    frame = pd.DataFrame({f'{m}_sum': v for m, v in values.items()}, index=df.index)
+    for m, v in values.items():
+        frame[f'{m}_sumsq'] = v * v
+        frame[f'{m}_min'] = v
+        frame[f'{m}_max'] = v
+    frame['count'] = 1
+
+    if not by:
+        totals = {'count': len(frame)}
+        for m in measures:
+            totals[f'{m}_sum'] = frame[f'{m}_sum'].sum()
+            totals[f'{m}_sumsq'] = frame[f'{m}_sumsq'].sum()
+            totals[f'{m}_min'] = frame[f'{m}_min'].min() if len(frame) else np.nan
+            totals[f'{m}_max'] = frame[f'{m}_max'].max() if len(frame) else np.nan
+        return pd.DataFrame([totals])
+
+    for col in by:
+        frame[col] = df[col]
+    return frame.groupby(by, observed=True).agg(_aggregations(measures))
+
+
+def _aggregations(measures):
+    aggregations = {'count': 'sum'}
+    for m in measures:
+        aggregations.update({f'{m}_sum': 'sum', f'{m}_sumsq': 'sum', f'{m}_min': 'min', f'{m}_max': 'max'})
+    return aggregations
+
+
+def mean_of(stats, measure):
+    """Mean of a measure from sufficient statistics"""
+    return stats[f'{measure}_sum'] / stats['count']
+
+
+def std_of(stats, measure, ddof=1):
+    """Standard deviation of a measure from sufficient statistics"""
+    n = stats['count']
+    variance = (stats[f'{measure}_sumsq'] - stats[f'{measure}_sum'] ** 2 / n) / (n - ddof)
+    return np.sqrt(np.maximum(variance, 0))
+
+
+class PlayerCube:
+    """
+    Materialised cube of sufficient statistics over CUBE_DIMENSIONS
+
+    Each observed combination of dimension values is one cell. Any chart
+    that groups by a subset of the dimensions, under any sidebar
+    selection on them, is answered by filtering and rolling up cells, so
+    its cost depends on the number of cells rather than players. Only
+    add low-cardinality dimensions: one with a value per few players
+    gives a cell per player and a cube larger than the frame.
+    """
+
+    def __init__(self, df, dimensions=CUBE_DIMENSIONS, measures=CUBE_MEASURES):
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.n_rows = len(df)
+        # Indexed by the dimensions, so appended cells align with existing ones
+        self.cells = sufficient_stats(df, self.dimensions, self.measures)
+
+    def append(self, rows):
+        """
+        Cube with `rows` added; only the new rows are aggregated, and their
+        cells are added to the matching existing cells (new combinations
+        become new cells). Returns a new cube and leaves this one unchanged.
+        """
+        cube = copy.copy(self)
+        cube.n_rows = self.n_rows + len(rows)
+        delta = sufficient_stats(rows, self.dimensions, self.measures)
+        aggregations = _aggregations(self.measures)
+        sums = [col for col, how in aggregations.items() if how == 'sum']
+        cells = self.cells[sums].add(delta[sums], fill_value=0)
+        old, new = self.cells.reindex(cells.index), delta.reindex(cells.index)
+        for col, how in aggregations.items():
+            if how != 'sum':
+                # fmin/fmax skip the NaN of a cell missing on one side
+                cells[col] = (np.fmin if how == 'min' else np.fmax)(old[col], new[col])
+        cells['count'] = cells['count'].astype(self.cells['count'].dtype)
+        cube.cells = cells[list(self.cells.columns)]
+        return cube
+
+    def rollup(self, by=(), selections=None):
+        """
+        Sufficient statistics grouped by `by` for the selected cells
+
+        Parameters:
+        by (list): Cube dimensions to keep; empty for a single total row
+        selections (dict or None): Dimension -> accepted values, as passed
+            to FilterIndex.select
+        """
+        cells = self.cells
+        for dim, values in (selections or {}).items():
+            if values:
+                cells = cells[cells.index.get_level_values(dim).isin(values)]
+        by = list(by)
+        if not by:
+            totals = cells[_aggregations(self.measures).keys()].agg(_aggregations(self.measures))
+            return totals.to_frame().T
+        return cells.groupby(level=by, observed=True).agg(_aggregations(self.measures))
+
+    def covers(self, by, measures):
+        """True when the cube can answer a grouping of `measures` by `by`"""
+        return set(by) <= set(self.dimensions) and set(measures) <= set(self.measures)
@@ -0,0 +1,100 @@
+import gzip
+import tempfile
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from schema import BOOL_COLUMNS
+
+# Rows encoded per chunk; peak memory depends on this, not on the export size
+EXPORT_CHUNK_ROWS = 100_000
+
+# Exports larger than this are spooled to a temporary file on disk
+SPOOL_MAX_BYTES = 32 * 1024 ** 2
+
+# Format key -> (label, mime type, file extension)
+EXPORT_FORMATS = {
+    'csv': ("CSV", 'text/csv', '.csv'),
+    'csv.gz': ("CSV (gzip)", 'application/gzip', '.csv.gz'),
+    'csv.zst': ("CSV (zstd)", 'application/zstd', '.csv.zst'),
+    'parquet': ("Parquet", 'application/vnd.apache.parquet', '.parquet')
+}
+
+
+def iter_filtered_batches(df, positions, batch_rows=EXPORT_CHUNK_ROWS):
+    """
+    Yield the rows of `df` at `positions` batch by batch; None yields
+    every row
+
+    `df` must be the frame of the snapshot the positions were computed on
+    (see refresh.DatasetSnapshot.frame), so the export holds exactly the
+    filtered rows even if the data files changed since.
+    """
+    n_rows = len(df) if positions is None else len(positions)
+    if n_rows == 0:
+        # Nothing matched: still emit the columns so the file has a header
+        yield df.iloc[:0]
+    for start in range(0, n_rows, batch_rows):
+        if positions is None:
+            yield df.iloc[start:start + batch_rows]
+        else:
+            yield df.take(positions[start:start + batch_rows])
+
+
+def iter_csv_chunks(batches):
+    """Encode DataFrame batches as UTF-8 CSV, with the header on the first chunk only"""
+    header = True
+    for batch in batches:
+        # Flags are written as 0/1, like the source CSV
+        batch = batch.astype({col: 'int8' for col in BOOL_COLUMNS if col in batch.columns})
+        yield batch.to_csv(index=False, header=header).encode('utf-8')
+        header = False
+
+
+def write_export(batches, fmt, sink):
+    """
+    Stream DataFrame batches into a binary file-like `sink`
+
+    Parameters:
+    batches (iterable): DataFrames to write, in order
+    fmt (str): One of EXPORT_FORMATS
+    sink (file-like): Binary, writable
+    """
+    if fmt == 'csv':
+        for chunk in iter_csv_chunks(batches):
+            sink.write(chunk)
+    elif fmt == 'csv.gz':
+        with gzip.GzipFile(fileobj=sink, mode='wb') as compressed:
+            for chunk in iter_csv_chunks(batches):
+                compressed.write(chunk)
+    elif fmt == 'csv.zst':
+        # One zstd frame per chunk; concatenated frames form a valid zstd
+        # stream. pyarrow ships the codec, so no extra dependency is needed
+        codec = pa.Codec('zstd')
+        for chunk in iter_csv_chunks(batches):
+            sink.write(codec.compress(chunk, asbytes=True))
+    elif fmt == 'parquet':
+        writer = None
+        for batch in batches:
+            table = pa.Table.from_pandas(batch, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(sink, table.schema)
+            writer.write_table(table)
+        if writer is not None:
+            writer.close()
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+
+def export_filtered(df, positions, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Export the rows of `df` at `positions` in `fmt`, encoded one chunk at
+    a time (see iter_filtered_batches)
+
+    Returns a rewound binary file object; small exports stay in memory,
+    larger ones are spooled to disk.
+    """
+    sink = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    write_export(iter_filtered_batches(df, positions, chunk_rows), fmt, sink)
+    sink.seek(0)
+    return sink
@@ -0,0 +1,242 @@
+import copy
+
+import numpy as np
+
+from profiling import count_copy
+
+# Sidebar dimensions covered by the index
+FILTER_DIMENSIONS = ['GameGenre', 'GameDifficulty', 'Device', 'Location']
+
+# Date columns that can be sliced with a range query
+RANGE_COLUMNS = ['SignupDate', 'LastActiveDate']
+
+
+class SortedIndex:
+    """
+    Sorted position index over one column for range queries
+
+    The frame itself stays in file order; `order` holds the row positions
+    sorted by value, so a range resolves with two binary searches and only
+    touches the rows inside it.
+    """
+
+    def __init__(self, values):
+        values = np.asarray(values)
+        self.order = np.argsort(values, kind='stable')
+        self.sorted_values = values[self.order]
+
+    def append(self, values, offset):
+        """
+        Index with `values` added at row positions offset, offset + 1, ...;
+        the new values are merged into the sorted order without re-sorting
+        the existing rows
+        """
+        values = np.asarray(values)
+        order = np.argsort(values, kind='stable')
+        new_sorted = values[order]
+        # Existing rows stay ahead of new rows with equal values, as a
+        # stable sort of all rows would put them
+        at = np.searchsorted(self.sorted_values, new_sorted, side='right')
+        index = copy.copy(self)
+        index.sorted_values = np.insert(self.sorted_values, at, new_sorted)
+        index.order = np.insert(self.order, at, order + offset)
+        return index
+
+    def span(self):
+        """Smallest and largest indexed value"""
+        return self.sorted_values[0], self.sorted_values[-1]
+
+    def positions(self, start=None, end=None):
+        """Unsorted positions of rows with start <= value < end (None = open)"""
+        lo = 0 if start is None else np.searchsorted(self.sorted_values, start, side='left')
+        hi = len(self.sorted_values) if end is None else np.searchsorted(self.sorted_values, end, side='left')
+        return self.order[lo:hi]
+
+
+class FilterIndex:
+    """
+    Precomputed per-value bitmaps over the sidebar filter dimensions
+
+    Each (dimension, value) pair owns a packed bitmap (one bit per row, in
+    frame order). A filter combination resolves to a row selection by
+    OR-ing the selected values within a dimension and AND-ing across
+    dimensions, so no intermediate frames are materialised. Date ranges
+    go through a SortedIndex per range column and are intersected with
+    the bitmap by probing only the rows inside the range.
+    """
+
+    def __init__(self, df, dimensions=FILTER_DIMENSIONS, range_columns=RANGE_COLUMNS):
+        self.n_rows = len(df)
+        self.range_values = {col: df[col].to_numpy() for col in range_columns if col in df.columns}
+        self.sorted = {col: SortedIndex(values) for col, values in self.range_values.items()}
+        self.bitmaps = {}
+        for dim in dimensions:
+            self.bitmaps[dim] = {}
+            for value, matches in _value_masks(df[dim]):
+                value_bitmap = np.packbits(matches)
+                value_bitmap.flags.writeable = False
+                self.bitmaps[dim][value] = value_bitmap
+        self._empty = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        self._empty.flags.writeable = False
+
+    def append(self, rows):
+        """
+        Index with `rows` added after the indexed ones
+
+        Returns a new index and leaves this one unchanged, so readers
+        holding it keep a consistent view. Only the new rows are scanned:
+        bitmaps are extended bit-wise and sorted indexes merged.
+        """
+        index = copy.copy(self)
+        index.n_rows = self.n_rows + len(rows)
+        index.range_values = {
+            col: np.concatenate([values, rows[col].to_numpy()]) for col, values in self.range_values.items()
+        }
+        index.sorted = {col: self.sorted[col].append(rows[col].to_numpy(), self.n_rows) for col in self.sorted}
+        index.bitmaps = {}
+        for dim, value_bitmaps in self.bitmaps.items():
+            new_masks = dict(_value_masks(rows[dim]))
+            index.bitmaps[dim] = {}
+            for value in dict.fromkeys(list(value_bitmaps) + list(new_masks)):
+                matches = new_masks.get(value, np.zeros(len(rows), dtype=bool))
+                index.bitmaps[dim][value] = append_bits(value_bitmaps.get(value, self._empty), self.n_rows, matches)
+        index._empty = np.zeros((index.n_rows + 7) // 8, dtype=np.uint8)
+        index._empty.flags.writeable = False
+        return index
+
+    def values(self, dim):
+        """Values present in the index for a dimension"""
+        return list(self.bitmaps[dim])
+
+    def bitmap(self, dim, values):
+        """
+        Packed bitmap of rows whose `dim` is any of `values`; a single value
+        returns the stored (read-only) bitmap without copying
+        """
+        value_bitmaps = [self.bitmaps[dim][value] for value in values if value in self.bitmaps[dim]]
+        if not value_bitmaps:
+            return self._empty
+        if len(value_bitmaps) == 1:
+            return value_bitmaps[0]
+        result = np.bitwise_or(value_bitmaps[0], value_bitmaps[1])
+        for value_bitmap in value_bitmaps[2:]:
+            np.bitwise_or(result, value_bitmap, out=result)
+        return result
+
+    def select(self, selections):
+        """
+        Intersect the selected values of each dimension
+
+        Parameters:
+        selections (dict): Dimension -> list of accepted values; dimensions
+            that are missing or have an empty list are not filtered
+
+        Returns:
+        ndarray or None: Packed bitmap of matching rows (read-only), None
+            when no dimension is filtered (every row matches)
+        """
+        dim_bitmaps = [self.bitmap(dim, values) for dim, values in selections.items() if values]
+        if not dim_bitmaps:
+            return None
+        if len(dim_bitmaps) == 1:
+            return dim_bitmaps[0]
+        result = np.bitwise_and(dim_bitmaps[0], dim_bitmaps[1])
+        for dim_bitmap in dim_bitmaps[2:]:
+            np.bitwise_and(result, dim_bitmap, out=result)
+        return result
+
+    def count(self, bitmap):
+        """Number of rows set in a packed bitmap"""
+        if bitmap is None:
+            return self.n_rows
+        return int(np.bitwise_count(bitmap).sum())
+
+    def positions(self, selections, ranges=None):
+        """
+        Row positions matching `selections` and `ranges`, or None if every
+        row matches
+
+        Parameters:
+        selections (dict): See select()
+        ranges (dict or None): Range column -> (start, end) half-open
+            interval; either bound may be None
+        """
+        bitmap = self.select(selections)
+        ranges = {col: bounds for col, bounds in (ranges or {}).items() if bounds != (None, None)}
+        if not ranges:
+            if bitmap is None:
+                return None
+            return bitmap_positions(bitmap, self.n_rows)
+
+        # Start from the narrowest range, check the others on its rows only
+        candidates = {col: self.sorted[col].positions(*bounds) for col, bounds in ranges.items()}
+        narrowest = min(candidates, key=lambda col: len(candidates[col]))
+        positions = np.sort(candidates[narrowest])
+        for col, (start, end) in ranges.items():
+            if col == narrowest:
+                continue
+            values = self.range_values[col][positions]
+            keep = np.ones(len(positions), dtype=bool)
+            if start is not None:
+                keep &= values >= start
+            if end is not None:
+                keep &= values < end
+            positions = positions[keep]
+        if bitmap is not None:
+            positions = positions[bitmap_contains(bitmap, positions)]
+        return positions
+
+    def covers(self, col, start, end):
+        """True when [start, end) spans every value of a range column"""
+        lowest, highest = self.sorted[col].span()
+        return (start is None or start <= lowest) and (end is None or end > highest)
+
+
+def _value_masks(values):
+    """(value, boolean mask) for every category of a column"""
+    values = values.astype('category')
+    codes = values.cat.codes.to_numpy()
+    for code, value in enumerate(values.cat.categories):
+        yield value, codes == code
+
+
+def append_bits(bitmap, n_rows, bits):
+    """
+    Packed bitmap of `n_rows` bits followed by the boolean array `bits`;
+    whole bytes are copied as they are and only the last partial byte is
+    repacked (read-only, like the index bitmaps)
+    """
+    whole = n_rows // 8
+    tail = np.unpackbits(bitmap[whole:], count=n_rows - whole * 8).astype(bool)
+    result = np.concatenate([bitmap[:whole], np.packbits(np.concatenate([tail, bits]))])
+    result.flags.writeable = False
+    return result
+
+
+def bitmap_contains(bitmap, positions):
+    """Boolean mask: whether each position's bit is set (packbits bit order)"""
+    return ((bitmap[positions >> 3] >> (7 - (positions & 7))) & 1).astype(bool)
+
+
+def bitmap_positions(bitmap, n_rows):
+    """Sorted row positions of the set bits; sparse bitmaps only unpack non-zero bytes"""
+    nonzero_bytes = np.flatnonzero(bitmap)
+    if len(nonzero_bytes) * 4 > len(bitmap):
+        # Dense selection: a full unpack is cheaper than gathering bytes
+        return np.flatnonzero(np.unpackbits(bitmap, count=n_rows))
+    bits = np.unpackbits(bitmap[nonzero_bytes]).reshape(-1, 8).view(bool)
+    positions = (nonzero_bytes[:, None] * 8 + np.arange(8))[bits]
+    return positions[positions < n_rows]
+
+
+def take_rows(df, positions):
+    """
+    Select rows by position
+
+    None means all rows: a shallow copy of `df` is returned, sharing its
+    columns, so a page adding or replacing a column does not change the
+    shared frame. Selected rows are a copy, counted under "take_rows".
+    """
+    if positions is None:
+        return df.copy(deep=False)
+    return count_copy('take_rows', df.take(positions))
@@ -0,0 +1,158 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from filter_index import FILTER_DIMENSIONS
+
+# Distribution charts: column -> maximum number of bins. Integer columns
+# get integer-wide bins (one per value when they fit), float columns get
+# exactly this many equal-width bins
+HISTOGRAM_COLUMNS = {
+    'Age': 100,
+    'SessionsPerWeek': 100,
+    'AvgSessionDurationMinutes': 100,
+    'AchievementsUnlocked': 100,
+    'FriendsCount': 20,
+    'AvgFPS': 40,
+    'TotalSpentUSD': 50
+}
+
+# Dimensions the histogram cube is split by: the sidebar filters plus the
+# paying flag used by the spending histogram
+HISTOGRAM_DIMENSIONS = FILTER_DIMENSIONS + ['HasPurchased']
+
+
+class HistogramBins:
+    """
+    Fixed bin edges for one column, derived once from the whole dataset
+
+    Because every filter combination is binned on the same edges, counts
+    of disjoint row sets can simply be added together.
+    """
+
+    def __init__(self, values, max_bins=100):
+        values = np.asarray(values)
+        self.integer = np.issubdtype(values.dtype, np.integer)
+        low, high = (values.min(), values.max()) if len(values) else (0, 0)
+        if self.integer:
+            self.width = max(1, -(-(int(high) - int(low) + 1) // max_bins))
+            self.low = int(low)
+            self.n_bins = (int(high) - self.low) // self.width + 1
+        else:
+            self.n_bins = max_bins
+            self.low = float(low)
+            self.width = (float(high) - self.low) / max_bins or 1.0
+        self.edges = self.low + self.width * np.arange(self.n_bins + 1)
+
+    def bin_of(self, values):
+        """Bin number of each value; values outside the edges go to the first or last bin"""
+        values = np.asarray(values)
+        if self.integer:
+            bins = (values.astype(np.int64) - self.low) // self.width
+        else:
+            bins = np.floor((values.astype('float64') - self.low) / self.width).astype(np.int64)
+        return np.clip(bins, 0, self.n_bins - 1)
+
+    def covers(self, values):
+        """True when every value falls inside the edges, so none would be clipped into an end bin"""
+        values = np.asarray(values)
+        if values.dtype.kind == 'f':
+            values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return True
+        high = values.max()
+        return values.min() >= self.edges[0] and (high < self.edges[-1] if self.integer else high <= self.edges[-1])
+
+    def counts(self, values):
+        """Number of values in each bin"""
+        values = np.asarray(values)
+        if values.dtype.kind == 'f':
+            values = values[~np.isnan(values)]
+        return np.bincount(self.bin_of(values), minlength=self.n_bins)
+
+
+class HistogramCube:
+    """
+    Bin counts of every distribution column per combination of
+    HISTOGRAM_DIMENSIONS
+
+    A histogram for any selection on those dimensions is the sum of the
+    selected cells' counts, so it costs the number of cells, not rows.
+    """
+
+    def __init__(self, df, columns=HISTOGRAM_COLUMNS, dimensions=HISTOGRAM_DIMENSIONS, bins=None):
+        self.dimensions = list(dimensions)
+        self.bins = bins or {col: HistogramBins(df[col].to_numpy(), max_bins) for col, max_bins in columns.items()}
+        # Combine the per-dimension codes into one cell number per row
+        codes, uniques = zip(*(pd.factorize(df[dim], sort=True) for dim in self.dimensions))
+        shape = [len(values) for values in uniques]
+        cell_ids, cell_codes = np.unique(np.ravel_multi_index(codes, shape), return_inverse=True)
+        cell_dim_codes = np.unravel_index(cell_ids, shape)
+        self.cells = pd.DataFrame({
+            dim: np.asarray(values)[dim_codes]
+            for dim, values, dim_codes in zip(self.dimensions, uniques, cell_dim_codes)
+        })
+        n_cells = len(self.cells)
+        self.counts = {}
+        for col, bins in self.bins.items():
+            values = df[col].to_numpy()
+            valid = ~pd.isna(values)
+            flat = cell_codes[valid] * bins.n_bins + bins.bin_of(values[valid])
+            self.counts[col] = np.bincount(flat, minlength=n_cells * bins.n_bins).reshape(n_cells, bins.n_bins)
+
+    def append(self, rows):
+        """
+        Cube with `rows` counted in, or None when one of their values falls
+        outside the fixed bin edges and the cube has to be rebuilt with new
+        edges. Returns a new cube and leaves this one unchanged.
+        """
+        if not all(bins.covers(rows[col].to_numpy()) for col, bins in self.bins.items()):
+            return None
+        delta = HistogramCube(rows, dimensions=self.dimensions, bins=self.bins)
+        # Existing cells keep their numbers; new combinations are numbered after them
+        cells = pd.concat([self.cells, delta.cells], ignore_index=True)
+        cell_codes, unique_cells = pd.MultiIndex.from_frame(cells).factorize()
+        cube = copy.copy(self)
+        cube.cells = unique_cells.set_names(self.dimensions).to_frame(index=False)
+        cube.counts = {}
+        n_old = len(self.cells)
+        for col, counts in self.counts.items():
+            merged = np.zeros((len(cube.cells), counts.shape[1]), dtype=counts.dtype)
+            merged[:n_old] = counts
+            np.add.at(merged, cell_codes[n_old:], delta.counts[col])
+            cube.counts[col] = merged
+        return cube
+
+    def covers(self, column, selections):
+        """True when the cube can answer `column` under `selections`"""
+        return column in self.counts and all(dim in self.dimensions for dim, values in selections.items() if values)
+
+    def rollup(self, column, selections=None):
+        """Bin counts of `column` over the cells matching `selections` (see FilterIndex.select)"""
+        keep = np.ones(len(self.cells), dtype=bool)
+        for dim, values in (selections or {}).items():
+            if values:
+                keep &= self.cells[dim].isin(values).to_numpy()
+        return self.counts[column][keep].sum(axis=0)
+
+
+def histogram_figure(bins, counts, title, x_title, y_title='Oyuncu Sayısı'):
+    """Bar chart of pre-binned counts drawn like a histogram"""
+    edges = bins.edges
+    if bins.integer and bins.width == 1:
+        # One bar per value, centred on it
+        bar = go.Bar(x=edges[:-1], y=counts, width=1, hovertemplate='%{x}: %{y}<extra></extra>')
+    else:
+        upper = edges[1:] - 1 if bins.integer else edges[1:]
+        bar = go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=bins.width,
+            customdata=np.column_stack([edges[:-1], upper]),
+            hovertemplate='%{customdata[0]:.4g} - %{customdata[1]:.4g}: %{y}<extra></extra>'
+        )
+    fig = go.Figure(bar)
+    fig.update_layout(title=title, xaxis_title=x_title, yaxis_title=y_title, bargap=0.05)
+    return fig
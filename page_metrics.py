@@ -0,0 +1,231 @@
+import pandas as pd
+
+from boxstats import grouped_box_summaries
+from cohort import cohort_matrix
+from cube import mean_of, sufficient_stats
+from render import density_grid, ols_line
+from retention import RetentionTables
+
+# What the dashboard pages compute, without drawing anything: the pages in
+# views/ cache and chart these results, and benchmark.py times them (the
+# A/B test page's computations are in ab_testing.py). The `stats` and
+# `retention` arguments are the page's grouped_stats and filtered_retention
+# (see views.context.PageContext); `rows` are the filtered players.
+
+# Achievements a player can unlock, for the completion rate
+MAX_ACHIEVEMENTS = 50
+
+ENGAGEMENT_ORDER = ['Düşük', 'Orta', 'Yüksek']
+
+
+# Sources: the pre-aggregated structures when the filters allow it, the
+# filtered rows otherwise. Date ranges are not dimensions of any of them,
+# so any range needs the raw rows.
+
+def grouped_stats(cube, rows, selections, ranges, by=(), measures=()):
+    """Sufficient statistics of the filtered players, rolled up from the cube when the filters allow it"""
+    if not ranges and cube.covers(by, measures):
+        return cube.rollup(by, selections)
+    return sufficient_stats(rows, by, measures)
+
+
+def histogram_counts(histogram_cube, rows, selections, ranges, column, paying_only=False):
+    """Bin counts of `column` for the filtered players, summed from the histogram cube when the filters allow it"""
+    if paying_only:
+        selections = dict(selections, HasPurchased=[True])
+    if not ranges and histogram_cube.covers(column, selections):
+        return histogram_cube.rollup(column, selections)
+    if paying_only:
+        rows = rows[rows['HasPurchased']]
+    return histogram_cube.bins[column].counts(rows[column].to_numpy())
+
+
+def retention_rollup(retention_tables, rows, selections, ranges, segment=None, measures=(), survival=False):
+    """
+    Day tables of the filtered players by `segment` (see
+    retention.RetentionRollup), summed from the snapshot's retention
+    tables (None: not built) when the filters allow it
+    """
+    if not ranges and retention_tables is not None and retention_tables.covers(segment, selections, measures, survival):
+        return retention_tables.rollup(segment, selections)
+    return RetentionTables(rows, [segment] if segment else [], measures, survival).rollup(segment)
+
+
+def box_summaries(box_cube, rows, selections, ranges, column, positive_only=False, exact=False):
+    """
+    Box-plot statistics of `column` per GuildMember for the filtered
+    players, from the merged sketches of the box cube (None: not built)
+    when the filters allow it and `exact` is not set
+
+    Parameters:
+    positive_only (bool): Only values above zero, e.g. spenders' spend
+    """
+    if not exact and not ranges and box_cube is not None and box_cube.covers(column, selections):
+        return box_cube.summaries(column, selections, positive_only=positive_only)
+    if positive_only:
+        rows = rows[rows[column] > 0]
+    return grouped_box_summaries(rows, 'GuildMember', column)
+
+
+# Genel Bakış
+
+def overview_kpis(stats):
+    """Headline figures; the averages and rates are 0 when no player is selected"""
+    totals = stats((), ['IsActive', 'TotalSpentUSD', 'PlayTimeHours', 'SessionsPerWeek']).iloc[0]
+    players = int(totals['count'])
+    active = int(totals['IsActive_sum'])
+    revenue = totals['TotalSpentUSD_sum']
+    if players == 0:
+        return {'players': 0, 'active': 0, 'revenue': revenue, 'arpu': 0, 'retention': 0, 'avg_playtime': 0, 'avg_sessions': 0}
+    return {
+        'players': players,
+        'active': active,
+        'revenue': revenue,
+        'arpu': revenue / players,
+        'retention': (active / players) * 100,
+        'avg_playtime': mean_of(totals, 'PlayTimeHours'),
+        'avg_sessions': mean_of(totals, 'SessionsPerWeek')
+    }
+
+
+def player_counts(stats, by):
+    """Players per value of `by`, largest first"""
+    return stats([by])['count'].sort_values(ascending=False)
+
+
+def retention_curves(retention, segment):
+    """Retention rate (%) and Kaplan–Meier survival by day since signup, per `segment` value"""
+    tables = retention(segment, ['IsActive'], survival=True)
+    rates = tables.mean_curve('IsActive')
+    rates['IsActive'] *= 100
+    return rates, tables.survival_curve()
+
+
+# Oyuncu Analizi
+
+def gender_counts(rows):
+    return rows['Gender'].value_counts()
+
+
+# Gelir Analizi
+
+def revenue_kpis(stats, rows):
+    totals = stats((), ['HasPurchased', 'TotalSpentUSD', 'PayingSpentUSD']).iloc[0]
+    paying_users = int(totals['HasPurchased_sum'])
+    total_users = int(totals['count'])
+    if total_users > 0:
+        conversion = (paying_users / total_users) * 100
+        # LTV is the average revenue per user in this simple model
+        ltv = totals['TotalSpentUSD_sum'] / total_users
+        # Medians do not roll up, so this one reads the rows
+        median_ltv = rows['TotalSpentUSD'].median()
+    else:
+        conversion = ltv = median_ltv = 0
+    return {
+        'paying_users': paying_users,
+        'conversion': conversion,
+        'arppu': totals['PayingSpentUSD_sum'] / paying_users if paying_users > 0 else 0,
+        'ltv': ltv,
+        'median_ltv': median_ltv,
+        'total_revenue': totals['TotalSpentUSD_sum']
+    }
+
+
+def revenue_by_device(stats):
+    revenue = mean_of(stats(['Device'], ['TotalSpentUSD']), 'TotalSpentUSD').rename('TotalSpentUSD').reset_index()
+    return revenue.sort_values('TotalSpentUSD', ascending=False)
+
+
+def revenue_by_engagement(stats):
+    revenue = mean_of(stats(['EngagementLevel'], ['TotalSpentUSD']), 'TotalSpentUSD').rename('TotalSpentUSD').reset_index()
+    revenue['EngagementLevel'] = pd.Categorical(revenue['EngagementLevel'], categories=ENGAGEMENT_ORDER, ordered=True)
+    return revenue.sort_values('EngagementLevel')
+
+
+# Oturum Analizi
+
+def playtime_by_tenure(retention):
+    """Mean play time by day since signup"""
+    return retention(measures=['PlayTimeHours']).mean_curve('PlayTimeHours')
+
+
+# Başarı Takibi
+
+def achievement_kpis(stats):
+    """(players, achievements unlocked, mean, max, completion rate in %)"""
+    totals = stats((), ['AchievementsUnlocked']).iloc[0]
+    players = int(totals['count'])
+    if players == 0:
+        return 0, 0, 0, 0, 0
+    unlocked = int(totals['AchievementsUnlocked_sum'])
+    completion_rate = (unlocked / (players * MAX_ACHIEVEMENTS)) * 100
+    return players, unlocked, mean_of(totals, 'AchievementsUnlocked'), int(totals['AchievementsUnlocked_max']), completion_rate
+
+
+# Teknik Performans
+
+def performance_kpis(stats):
+    totals = stats((), ['AvgFPS', 'CrashCount']).iloc[0]
+    return {
+        'avg_fps': mean_of(totals, 'AvgFPS'),
+        'min_fps': totals['AvgFPS_min'],
+        'max_fps': totals['AvgFPS_max'],
+        'total_crashes': int(totals['CrashCount_sum']),
+        'avg_crashes': mean_of(totals, 'CrashCount')
+    }
+
+
+def crash_counts(rows):
+    """Players per crash count"""
+    return rows['CrashCount'].value_counts().sort_index()
+
+
+def performance_by_device(stats):
+    device_stats = stats(['Device'], ['AvgFPS', 'CrashCount'])
+    return pd.DataFrame({measure: mean_of(device_stats, measure) for measure in ['AvgFPS', 'CrashCount']}).reset_index()
+
+
+def crashes_by_guild(stats):
+    crashes = mean_of(stats(['GuildMember'], ['CrashCount']), 'CrashCount').rename('CrashCount').reset_index()
+    crashes['GuildMember'] = crashes['GuildMember'].map({0: 'Üye Değil', 1: 'Üye'})
+    return crashes
+
+
+# Sosyal Analiz
+
+def social_kpis(stats):
+    """Friend and guild figures; the averages and shares are 0 when no player is selected"""
+    guild_stats = stats(['GuildMember'], ['FriendsCount'])
+    totals = guild_stats.sum()
+    players = int(totals['count'])
+    if players == 0:
+        return {'avg_friends': 0, 'max_friends': 0, 'guild_members': 0, 'guild_percentage': 0, 'players': 0}
+    guild_members = int(guild_stats['count'].get(True, 0))
+    return {
+        'avg_friends': mean_of(totals, 'FriendsCount'),
+        'max_friends': int(guild_stats['FriendsCount_max'].max()),
+        'guild_members': guild_members,
+        'guild_percentage': (guild_members / players) * 100,
+        'players': players
+    }
+
+
+def guild_counts(stats):
+    return stats(['GuildMember'])['count'].rename({True: 'Üye', False: 'Üye Değil'}).sort_values(ascending=False)
+
+
+def friends_playtime_trend(rows):
+    """Least-squares line of play time on friend count over every filtered player"""
+    return ols_line(rows['FriendsCount'], rows['PlayTimeHours'])
+
+
+def friends_playtime_density(rows):
+    return density_grid(rows['FriendsCount'], rows['PlayTimeHours'])
+
+
+# Kohort Analizi
+
+def cohorts(rows, grain):
+    """Cohort retention matrix and cohort sizes (see cohort.cohort_matrix)"""
+    return cohort_matrix(rows['SignupDate'], rows['LastActiveDate'], grain)
+
@@ -0,0 +1,364 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import pyinstrument
+except ImportError:  # optional: only offered when installed
+    pyinstrument = None
+
+# Set to '1' to time every rerun of every session, or to 'cprofile' /
+# 'pyinstrument' to also profile the calls of each rerun
+PROFILE_ENV = 'DASHBOARD_PROFILE'
+
+# Call profiles and the per-rerun metrics file are written here
+PROFILE_DIR = 'profiles'
+METRICS_FILE = 'reruns.jsonl'
+
+# Functions listed in the dashboard's cProfile summary
+PROFILE_TOP = 25
+
+CALL_PROFILERS = {
+    None: "Yok",
+    'cprofile': "cProfile",
+    'pyinstrument': "pyinstrument"
+}
+
+_metrics_lock = threading.Lock()
+
+
+def current_rss_mb():
+    """Resident set size of this process in megabytes"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except OSError:
+        # No /proc (e.g. macOS): the peak is the closest available figure
+        return peak_rss_mb()
+
+
+def reset_peak_rss():
+    """Reset the kernel's peak RSS mark (Linux); False where that is not possible"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb():
+    """Peak RSS since the last reset_peak_rss(), else since the process started"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+
+def available_cpus():
+    """CPUs this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class CopyCounter:
+    """
+    Process-wide counts of DataFrame row copies, by the place they are made
+
+    Snapshot frames and unfiltered pages share the loaded columns; only
+    the places that materialise rows call count_copy(), so these counters
+    show how often and how much the dashboard copies.
+    """
+
+    def __init__(self):
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, site, frame):
+        nbytes = int(frame.memory_usage(index=False, deep=False).sum())
+        with self._lock:
+            counts = self._counts.setdefault(site, {'copies': 0, 'rows': 0, 'mb': 0.0})
+            counts['copies'] += 1
+            counts['rows'] += len(frame)
+            counts['mb'] += nbytes / 2 ** 20
+
+    def totals(self):
+        """site -> {'copies', 'rows', 'mb'} so far"""
+        with self._lock:
+            return {site: dict(counts) for site, counts in self._counts.items()}
+
+
+FRAME_COPIES = CopyCounter()
+
+
+def count_copy(site, frame):
+    """Record `frame` as a copy made at `site` and return it"""
+    FRAME_COPIES.record(site, frame)
+    return frame
+
+
+def copies_since(before, after=None):
+    """Copy counters accumulated between two CopyCounter.totals() results (`after` defaults to now)"""
+    after = FRAME_COPIES.totals() if after is None else after
+    zero = {'copies': 0, 'rows': 0, 'mb': 0.0}
+    return {
+        site: {key: value - before.get(site, zero)[key] for key, value in counts.items()}
+        for site, counts in after.items()
+        if counts['copies'] != before.get(site, zero)['copies']
+    }
+
+
+def call_profilers():
+    """Call profilers that can be used here (see CALL_PROFILERS)"""
+    return [key for key in CALL_PROFILERS if key != 'pyinstrument' or pyinstrument is not None]
+
+
+def profiling_from_env():
+    """
+    (timings on, call profiler) requested through PROFILE_ENV
+
+    Returns:
+    (bool, str or None): Whether to time reruns, and 'cprofile',
+        'pyinstrument' or None
+    """
+    value = os.environ.get(PROFILE_ENV, '').strip().lower()
+    if value in ('', '0', 'false', 'no'):
+        return False, None
+    return True, value if value in call_profilers() and value is not None else None
+
+
+def stage_name(metric):
+    """Readable stage name for an aggregate cache metric (a string or a tuple)"""
+    if isinstance(metric, tuple):
+        return ' · '.join(str(part) for part in metric)
+    return str(metric)
+
+
+class RerunProfiler:
+    """
+    Timings and memory counters for one run of the dashboard script
+
+    The run is cut into consecutive segments by checkpoint() (load, sidebar,
+    page); stage() times work nested inside the current segment (aggregate
+    computations, chart serialisation) and adds up repeated calls. A
+    disabled profiler hands out no-op contexts and the unwrapped functions,
+    so it costs nothing when off.
+    """
+
+    def __init__(self, enabled=False, call_profiler=None):
+        self.enabled = enabled
+        self.call_profiler = call_profiler if enabled else None
+        self.segments = []
+        self.cache = {'hits': 0, 'misses': 0}
+        # Copies are counted process-wide, so concurrent reruns of other sessions show up too
+        self._copies_start = FRAME_COPIES.totals() if enabled else {}
+        self.profile_path = None
+        self._nested = {}
+        self._stack = []
+        self._start = self._mark = time.perf_counter()
+        self._rss_start = self._rss_mark = current_rss_mb() if enabled else 0.0
+        self._profiler = None
+        if self.call_profiler == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.call_profiler == 'pyinstrument':
+            self._profiler = pyinstrument.Profiler()
+            self._profiler.start()
+
+    def checkpoint(self, name):
+        """Close the segment running since the previous checkpoint under `name`"""
+        if not self.enabled:
+            return
+        now, rss = time.perf_counter(), current_rss_mb()
+        self.segments.append({
+            'stage': name,
+            'seconds': now - self._mark,
+            'calls': 1,
+            'rss_delta_mb': rss - self._rss_mark,
+            'parent': None
+        })
+        for nested_name, record in self._nested.items():
+            self.segments.append(dict(record, stage=nested_name, parent=name))
+        self._nested = {}
+        self._mark, self._rss_mark = now, rss
+
+    def stage(self, name):
+        """Context timing nested work inside the current segment; repeated names add up"""
+        if not self.enabled:
+            return nullcontext()
+        return self._timed_stage(name)
+
+    @contextmanager
+    def _timed_stage(self, name):
+        # A stage inside another stage is only counted once, by the outer one
+        if self._stack:
+            yield
+            return
+        self._stack.append(name)
+        start, rss = time.perf_counter(), current_rss_mb()
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            record = self._nested.setdefault(name, {'seconds': 0.0, 'calls': 0, 'rss_delta_mb': 0.0})
+            record['seconds'] += time.perf_counter() - start
+            record['calls'] += 1
+            record['rss_delta_mb'] += current_rss_mb() - rss
+
+    def timed(self, name, fn):
+        """`fn` wrapped in stage(name); `fn` itself when disabled"""
+        if not self.enabled:
+            return fn
+
+        def wrapper(*args, **kwargs):
+            with self.stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def cached(self, cache, key, compute, name):
+        """
+        cache.get_or_compute(key, compute), counted as a hit or a miss of
+        this rerun; on a miss the computation is timed as stage `name`
+        """
+        if not self.enabled:
+            return cache.get_or_compute(key, compute)
+        computed = []
+
+        def timed_compute():
+            computed.append(True)
+            with self.stage(name):
+                return compute()
+
+        value = cache.get_or_compute(key, timed_compute)
+        self.cache['misses' if computed else 'hits'] += 1
+        return value
+
+    def finish(self, name):
+        """Close the last segment under `name` and stop the call profiler"""
+        self.checkpoint(name)
+        if self.call_profiler == 'cprofile':
+            self._profiler.disable()
+        elif self.call_profiler == 'pyinstrument':
+            self._profiler.stop()
+
+    def copies(self):
+        """DataFrame copies made during this rerun, by site (see CopyCounter)"""
+        return copies_since(self._copies_start) if self.enabled else {}
+
+    @property
+    def total_seconds(self):
+        return sum(segment['seconds'] for segment in self.segments if segment['parent'] is None)
+
+    def breakdown(self):
+        """
+        Per-stage table for the dashboard
+
+        Returns:
+        DataFrame: Stage (nested stages indented under their segment),
+            time in ms, calls, share of the rerun and RSS change
+        """
+        total = self.total_seconds or 1.0
+        rows = [
+            {
+                'Aşama': segment['stage'] if segment['parent'] is None else f"   ↳ {segment['stage']}",
+                'Süre (ms)': segment['seconds'] * 1000,
+                'Çağrı': segment['calls'],
+                'Pay (%)': segment['seconds'] / total * 100,
+                'Bellek Değişimi (MB)': segment['rss_delta_mb']
+            }
+            for segment in self.segments
+        ]
+        return pd.DataFrame(rows, columns=['Aşama', 'Süre (ms)', 'Çağrı', 'Pay (%)', 'Bellek Değişimi (MB)'])
+
+    def profile_report(self, limit=PROFILE_TOP):
+        """Text summary of the call profile: top functions by cumulative time (cProfile) or the call tree (pyinstrument)"""
+        if self.call_profiler == 'cprofile':
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).strip_dirs().sort_stats('cumulative').print_stats(limit)
+            return out.getvalue()
+        if self.call_profiler == 'pyinstrument':
+            return self._profiler.output_text(unicode=True, color=False)
+        return None
+
+    def dump_profile(self, profile_dir=PROFILE_DIR, label='rerun'):
+        """
+        Save the call profile (.prof for cProfile, .html for pyinstrument)
+
+        Returns:
+        str or None: Path written, None without a call profiler
+        """
+        if self.call_profiler is None:
+            return None
+        os.makedirs(profile_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        if self.call_profiler == 'cprofile':
+            path = os.path.join(profile_dir, f'{label}-{stamp}.prof')
+            self._profiler.dump_stats(path)
+        else:
+            path = os.path.join(profile_dir, f'{label}-{stamp}.html')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self._profiler.output_html())
+        self.profile_path = path
+        return path
+
+    def write_metrics(self, profile_dir=PROFILE_DIR, **context):
+        """
+        Append this rerun's timings as one JSON line to METRICS_FILE, for
+        trend analysis across reruns and commits
+
+        Parameters:
+        profile_dir (str): Directory of the metrics file
+        **context: Extra fields (page, dataset version, row counts, ...)
+        """
+        record = {
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            **context,
+            'total_seconds': self.total_seconds,
+            'rss_mb': current_rss_mb(),
+            'stages': [
+                {key: segment[key] for key in ('stage', 'parent', 'seconds', 'calls', 'rss_delta_mb')}
+                for segment in self.segments
+            ],
+            'cache': self.cache,
+            'copies': self.copies(),
+            'profile': self.profile_path
+        }
+        os.makedirs(profile_dir, exist_ok=True)
+        line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        with _metrics_lock, open(os.path.join(profile_dir, METRICS_FILE), 'a', encoding='utf-8') as f:
+            f.write(line)
+
+
+def load_metrics(profile_dir=PROFILE_DIR):
+    """
+    Rerun metrics written so far, one row per (rerun, stage)
+
+    Returns:
+    DataFrame: timestamp, page and the other context fields, plus stage,
+        parent, seconds, calls and rss_delta_mb
+    """
+    path = os.path.join(profile_dir, METRICS_FILE)
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    with open(path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return pd.json_normalize(
+        records, 'stages', [key for key in records[0] if key not in ('stages', 'cache')], errors='ignore'
+    ) if records else pd.DataFrame()
@@ -0,0 +1,425 @@
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from boxstats import BOX_COLUMNS, BOX_DIMENSIONS, BoxCube
+from cube import CUBE_DIMENSIONS, CUBE_MEASURES, PlayerCube, measure_inputs
+from filter_index import FILTER_DIMENSIONS, RANGE_COLUMNS, FilterIndex
+from histogram import HISTOGRAM_COLUMNS, HISTOGRAM_DIMENSIONS, HistogramCube
+from retention import RetentionTables, retention_columns
+from storage import (
+    CSV_PATH, DATASET_DIR, PARQUET_PATH, PARTITION_DIR, hive_column_span, hive_files, is_partitioned,
+    load_players, partition_files, read_csv_tail, read_hive_file, read_parquet_players
+)
+
+# Columns each incrementally maintained structure is built from
+FILTER_INDEX_COLUMNS = FILTER_DIMENSIONS + RANGE_COLUMNS
+CUBE_COLUMNS = list(dict.fromkeys(CUBE_DIMENSIONS + measure_inputs(CUBE_MEASURES)))
+HISTOGRAM_CUBE_COLUMNS = list(dict.fromkeys(HISTOGRAM_DIMENSIONS + list(HISTOGRAM_COLUMNS)))
+BOX_CUBE_COLUMNS = BOX_DIMENSIONS + BOX_COLUMNS
+RETENTION_COLUMNS = retention_columns()
+
+# Bytes just before the CSV read position that must be unchanged for new
+# bytes to count as appended rows; otherwise the file was rewritten
+CSV_MARK_BYTES = 4096
+
+# Seconds between checks of an open dashboard for new rows
+REFRESH_POLL_SECONDS = 10
+
+# Times the initial load is retried when the files change while it reads them
+LOAD_ATTEMPTS = 3
+
+# Spare rows allocated past the end of a column, as a fraction of its
+# rows; a column that runs out grows by COLUMN_GROWTH, so appends cost
+# the appended rows (amortised) rather than a copy of the column
+COLUMN_HEADROOM = 0.125
+COLUMN_GROWTH = 1.5
+
+
+def _stat(path):
+    """(size, mtime_ns) of a file, None when it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def scope_suffix(prune):
+    """Version suffix telling the snapshots of a pruned store apart from the full dataset's"""
+    if prune is None:
+        return ''
+    return '@' + hashlib.sha1(repr(prune).encode()).hexdigest()[:8]
+
+
+def _read_mark(path, offset):
+    with open(path, 'rb') as f:
+        f.seek(max(offset - CSV_MARK_BYTES, 0))
+        return f.read(min(offset, CSV_MARK_BYTES))
+
+
+class GrowableColumn:
+    """
+    One column's values in a buffer with spare rows at the end
+
+    Snapshots hold Series viewing the first n rows. Appended rows are
+    written past the end of every existing view, so older snapshots keep
+    seeing exactly their own rows while the new one sees the longer
+    prefix. Categorical columns keep their codes in the buffer.
+    """
+
+    def __init__(self, values, capacity=None):
+        self.name = values.name
+        self.dtype = values.dtype
+        data = self._raw(values)
+        self.length = len(data)
+        self._data = np.empty(max(capacity or 0, int(self.length * (1 + COLUMN_HEADROOM)) + 1), dtype=data.dtype)
+        self._data[:self.length] = data
+
+    def _raw(self, values):
+        if isinstance(self.dtype, pd.CategoricalDtype):
+            return values.cat.codes.to_numpy()
+        return values.to_numpy()
+
+    def series(self, n_rows):
+        """Series viewing the first `n_rows` rows (no copy)"""
+        data = self._data[:n_rows]
+        if isinstance(self.dtype, pd.CategoricalDtype):
+            data = pd.Categorical.from_codes(data, dtype=self.dtype, validate=False)
+        return pd.Series(data, name=self.name, copy=False)
+
+    def append(self, n_rows, values):
+        """
+        Column with `values` added after the first `n_rows` rows: this
+        one, written in place, when those rows are its end and the spare
+        room suffices; else a new, larger copy
+
+        Returns:
+        GrowableColumn: Column holding n_rows + len(values) rows
+        """
+        if values.dtype != self.dtype:
+            # e.g. categories outside the schema's: let pandas find the common dtype
+            return GrowableColumn(pd.concat([self.series(n_rows), values], ignore_index=True))
+        end = n_rows + len(values)
+        # Rows past n_rows already belong to another snapshot when length differs
+        if n_rows != self.length or end > len(self._data):
+            column = GrowableColumn(self.series(n_rows), capacity=int(end * COLUMN_GROWTH))
+            return column.append(n_rows, values)
+        self._data[n_rows:end] = self._raw(values)
+        self.length = end
+        return self
+
+
+class DataDirectoryHandler(FileSystemEventHandler):
+    """Marks the store dirty whenever a file in the data directory changes"""
+
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+
+    def on_any_event(self, event):
+        # Reads (including the store's own) do not change the data
+        if not event.is_directory and event.event_type not in ('opened', 'closed_no_write'):
+            self.store.mark_dirty()
+
+
+class DatasetSnapshot:
+    """
+    The dataset at one version: the loaded columns plus the filter index
+    and cubes built on them
+
+    A rerun reads everything from a single snapshot, so its frame, index
+    and cubes always describe the same rows even while a refresh swaps in
+    the next snapshot. Snapshots are shared by every session: callers must
+    not mutate what they return.
+    """
+
+    def __init__(self, store, version, base_version, n_rows, columns, filter_index, cube,
+                 histogram_cube=None, info=None, retention_tables=None, box_cube=None, growable=None):
+        # version also tells pruned scopes apart; base_version names the
+        # data files only, whatever the scope
+        self.version = version
+        self.base_version = base_version
+        self.prune = store.prune
+        self.n_rows = n_rows
+        self.columns = columns
+        self.filter_index = filter_index
+        self.cube = cube
+        self.info = dict(info or {}, version=version, rows=n_rows)
+        self._store = store
+        self._histogram_cube = histogram_cube
+        self._retention_tables = retention_tables
+        self._box_cube = box_cube
+        # Column buffers that appends write into; columns without one get
+        # it on their first append
+        self._growable = growable or {}
+        self._frames = {}
+        self._spans = {}
+        self._lock = threading.Lock()
+
+    def frame(self, columns):
+        """
+        DataFrame of `columns` in file order; columns not loaded yet are
+        read once and kept for the following snapshots
+        """
+        key = tuple(columns)
+        with self._lock:
+            if key not in self._frames:
+                missing = [col for col in key if col not in self.columns]
+                if missing:
+                    loaded = self._store.read_columns(missing, self.n_rows)
+                    self.columns.update({col: loaded[col] for col in missing})
+                # Columns are not copied: frames share the snapshot's (or a
+                # shared image's mapped) arrays
+                self._frames[key] = pd.DataFrame({col: self.columns[col] for col in key}, copy=False)
+            return self._frames[key]
+
+    def span(self, column):
+        """
+        (min, max) of a range column over the whole dataset; a pruned
+        snapshot reads it from the Parquet footers of every partition
+        """
+        if self.prune is None:
+            return self.filter_index.sorted[column].span()
+        with self._lock:
+            if column not in self._spans:
+                self._spans[column] = hive_column_span(column, self._store.dataset_dir)
+            return self._spans[column]
+
+    def histogram_cube(self):
+        """Histogram cube of this snapshot, built on first use and then kept up to date by appends"""
+        with self._lock:
+            if self._histogram_cube is None:
+                self._histogram_cube = HistogramCube(self._store.read_columns(HISTOGRAM_CUBE_COLUMNS, self.n_rows))
+            return self._histogram_cube
+
+    def box_cube(self):
+        """Box-plot sketch cube of this snapshot, built on first use and then kept up to date by appends"""
+        with self._lock:
+            if self._box_cube is None:
+                self._box_cube = BoxCube(self._store.read_columns(BOX_CUBE_COLUMNS, self.n_rows))
+            return self._box_cube
+
+    def retention_tables(self):
+        """Retention and survival tables of this snapshot, built on first use and then kept up to date by appends"""
+        with self._lock:
+            if self._retention_tables is None:
+                self._retention_tables = RetentionTables(self._store.read_columns(RETENTION_COLUMNS, self.n_rows))
+            return self._retention_tables
+
+    def append(self, rows, seconds):
+        """
+        Next snapshot with `rows` added: the rows are written into the
+        columns' spare room, and only structures already built are extended
+        """
+        n_rows = self.n_rows + len(rows)
+        growable = {}
+        for col, values in self.columns.items():
+            column = self._growable[col] if col in self._growable else GrowableColumn(values)
+            growable[col] = column.append(self.n_rows, rows[col])
+        columns = {col: column.series(n_rows) for col, column in growable.items()}
+        histogram_cube = self._histogram_cube.append(rows) if self._histogram_cube is not None else None
+        retention_tables = self._retention_tables.append(rows) if self._retention_tables is not None else None
+        box_cube = self._box_cube.append(rows) if self._box_cube is not None else None
+        info = dict(self.info, seconds=seconds, appended=len(rows))
+        return DatasetSnapshot(
+            self._store, f"{self.base_version}#{n_rows}{scope_suffix(self.prune)}", self.base_version, n_rows, columns,
+            self.filter_index.append(rows), self.cube.append(rows), histogram_cube, info, retention_tables, box_cube, growable
+        )
+
+
+class DatasetStore:
+    """
+    Process-wide player dataset that follows appends to the data files
+
+    The data directory is watched with watchdog. Rows appended to the CSV,
+    or new Parquet files in PARTITION_DIR, are read on their own and folded
+    into the filter index, the OLAP cube and the histogram cube, so an
+    hourly append costs the new rows rather than a full reload. Anything
+    that is not a pure append (a rewritten or removed file, a reconverted
+    Parquet copy, CSV appends alongside partition files) triggers a full
+    reload, which also starts a new base version.
+
+    With the Hive-partitioned layout (DATASET_DIR) a store can be scoped
+    to a partition_prune() filter: it then reads, indexes and follows only
+    the files of the matching partitions.
+    """
+
+    def __init__(self, parquet_path=PARQUET_PATH, csv_path=CSV_PATH, partition_dir=PARTITION_DIR, watch=True,
+                 dataset_dir=DATASET_DIR, prune=None):
+        self.parquet_path = parquet_path
+        self.csv_path = csv_path
+        self.partition_dir = partition_dir
+        self.dataset_dir = dataset_dir
+        self.prune = prune
+        self._lock = threading.RLock()
+        self._dirty = threading.Event()
+        self._observer = None
+        self._load()
+        if watch:
+            self._start_watcher()
+
+    def _file_state(self):
+        if is_partitioned(self.dataset_dir):
+            return {'hive': tuple((path, _stat(path)) for path in hive_files(self.dataset_dir, self.prune))}
+        partitions = partition_files(self.partition_dir)
+        return {
+            'parquet': _stat(self.parquet_path),
+            'csv': _stat(self.csv_path),
+            'partitions': tuple((path, _stat(path)) for path in partitions)
+        }
+
+    def _load(self):
+        """Full load: read the index and cube columns and build everything from scratch"""
+        start = time.perf_counter()
+        for _ in range(LOAD_ATTEMPTS):
+            state = self._file_state()
+            df, info = load_players(
+                list(dict.fromkeys(FILTER_INDEX_COLUMNS + CUBE_COLUMNS)),
+                self.parquet_path, self.csv_path, self.partition_dir, self.dataset_dir, self.prune
+            )
+            if self._file_state() == state:
+                break
+        self._state = state
+        if 'csv' in state:
+            # The Parquet copy, when current, holds the CSV's rows up to its present size
+            self._csv_offset = state['csv'][0]
+            self._csv_mark = _read_mark(self.csv_path, self._csv_offset)
+        # Copied into buffers with room for appends, which also frees the
+        # cube columns once the cube is built
+        growable = {col: GrowableColumn(df[col]) for col in FILTER_INDEX_COLUMNS}
+        self._snapshot = DatasetSnapshot(
+            self, info['version'] + scope_suffix(self.prune), info['version'], len(df),
+            {col: column.series(len(df)) for col, column in growable.items()},
+            FilterIndex(df), PlayerCube(df[CUBE_COLUMNS]),
+            info={'source': info['source'], 'seconds': time.perf_counter() - start, 'appended': 0},
+            growable=growable
+        )
+
+    def _start_watcher(self):
+        data_dirs = [os.path.dirname(os.path.abspath(path)) for path in (self.csv_path, self.dataset_dir)]
+        if os.path.commonpath(data_dirs) == data_dirs[0]:
+            data_dirs = data_dirs[:1]
+        observer = Observer()
+        observer.daemon = True
+        try:
+            for data_dir in data_dirs:
+                observer.schedule(DataDirectoryHandler(self), data_dir, recursive=True)
+            observer.start()
+        except OSError:
+            # e.g. out of inotify watches: snapshot() then checks the files on every call
+            return
+        self._observer = observer
+
+    def mark_dirty(self):
+        """Have the next snapshot() check the data files"""
+        self._dirty.set()
+
+    @property
+    def watching(self):
+        return self._observer is not None and self._observer.is_alive()
+
+    def snapshot(self):
+        """Current snapshot, refreshed first when the watcher saw the data files change (or on every call without a watcher)"""
+        if self._dirty.is_set() or not self.watching:
+            self.refresh()
+        return self._snapshot
+
+    def read_columns(self, columns, n_rows):
+        """
+        Read `columns` of the first `n_rows` rows from the data files;
+        rows appended after the snapshot was taken are cut off
+        """
+        with self._lock:
+            df, _ = load_players(
+                list(columns), self.parquet_path, self.csv_path, self.partition_dir, self.dataset_dir, self.prune
+            )
+        if len(df) < n_rows:
+            # The files were rewritten with fewer rows; the next refresh reloads them
+            self.mark_dirty()
+            raise RuntimeError("Veri dosyası okunurken değişti, lütfen sayfayı yenileyin.")
+        return df.iloc[:n_rows].reset_index(drop=True)
+
+    def _delta(self, state):
+        """
+        Rows appended since the last refresh, as (rows or None, new CSV
+        offset); raises LookupError when the change is not a pure append
+        """
+        old = self._state
+        if state.keys() != old.keys():
+            raise LookupError("storage layout changed")
+        if 'hive' in state:
+            # New batches sort after the existing files (see write_hive_dataset)
+            if state['hive'][:len(old['hive'])] != old['hive']:
+                raise LookupError("dataset files changed")
+            new_files = [path for path, _ in state['hive'][len(old['hive']):]]
+            if not new_files:
+                return None, None
+            return pd.concat([read_hive_file(path, dataset_dir=self.dataset_dir) for path in new_files], ignore_index=True), None
+        if state['parquet'] != old['parquet']:
+            raise LookupError("Parquet copy changed")
+        old_partitions = old['partitions']
+        if state['partitions'][:len(old_partitions)] != old_partitions:
+            raise LookupError("partition files changed")
+        new_partitions = [path for path, _ in state['partitions'][len(old_partitions):]]
+
+        deltas = []
+        csv_offset = self._csv_offset
+        if state['csv'] != old['csv']:
+            # Row order would differ from load_players (CSV rows come first)
+            if state['partitions']:
+                raise LookupError("CSV appended alongside partition files")
+            if state['csv'] is None or state['csv'][0] < self._csv_offset:
+                raise LookupError("CSV truncated")
+            if _read_mark(self.csv_path, self._csv_offset) != self._csv_mark:
+                raise LookupError("CSV rewritten")
+            rows, csv_offset = read_csv_tail(self.csv_path, self._csv_offset)
+            if rows is not None:
+                deltas.append(rows)
+        deltas += [read_parquet_players(path) for path in new_partitions]
+        if not deltas:
+            return None, csv_offset
+        return pd.concat(deltas, ignore_index=True), csv_offset
+
+    def refresh(self):
+        """
+        Bring the snapshot up to date with the data files
+
+        Returns:
+        int: Rows appended; the whole row count after a full reload
+        """
+        with self._lock:
+            self._dirty.clear()
+            state = self._file_state()
+            if state == self._state:
+                return 0
+            start = time.perf_counter()
+            try:
+                rows, csv_offset = self._delta(state)
+            except LookupError:
+                self._load()
+                return self._snapshot.n_rows
+            except Exception:
+                # A file being written may not be readable yet; try again on the next event
+                self.mark_dirty()
+                return 0
+            self._state = state
+            if rows is None:
+                return 0
+            if csv_offset is not None and csv_offset != self._csv_offset:
+                self._csv_offset = csv_offset
+                self._csv_mark = _read_mark(self.csv_path, csv_offset)
+            self._snapshot = self._snapshot.append(rows, time.perf_counter() - start)
+            return len(rows)
+
+    def stop(self):
+        """Stop watching the data directory"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Scatter plots with more rows than this are sampled or binned before they
+# are sent to the browser, so the chart payload does not grow with the data
+MAX_SCATTER_POINTS = 20_000
+
+# Bins per axis of the density view
+DENSITY_BINS = 80
+
+
+def stratified_sample(df, by=None, max_points=MAX_SCATTER_POINTS, random_state=42):
+    """
+    At most `max_points` rows of `df`, sampled per group of `by`
+
+    Every group keeps a share of the points even when it is small, so a
+    colour that is rare in the data does not disappear from the chart. The
+    sample is deterministic and stays in frame order.
+
+    Parameters:
+    df (DataFrame): Rows to plot
+    by (str or None): Column the chart colours by; None samples uniformly
+    max_points (int): Point budget
+    random_state (int): Seed of the sample
+
+    Returns:
+    DataFrame: `df` itself when it is within the budget, else the sample
+    """
+    if len(df) <= max_points:
+        return df
+    rng = np.random.default_rng(random_state)
+    if by is None:
+        return df.take(np.sort(rng.choice(len(df), max_points, replace=False)))
+
+    codes, _ = pd.factorize(df[by], use_na_sentinel=False)
+    sizes = np.bincount(codes)
+    # Groups are sampled proportionally to their size, but small groups are
+    # raised to a minimum share and the others split what is left
+    floor = max_points // (4 * len(sizes))
+    small = max_points * sizes // len(df) < floor
+    quotas = np.zeros_like(sizes)
+    quotas[small] = np.minimum(sizes[small], floor)
+    if (~small).any():
+        rest = max_points - quotas[small].sum()
+        quotas[~small] = rest * sizes[~small] // sizes[~small].sum()
+    quotas = np.minimum(sizes, quotas)
+    positions = [
+        rng.choice(np.flatnonzero(codes == code), quota, replace=False)
+        for code, quota in enumerate(quotas) if quota > 0
+    ]
+    return df.take(np.sort(np.concatenate(positions)))
+
+
+def density_grid(x, y, bins=DENSITY_BINS):
+    """
+    2-D histogram of (x, y) computed on the server
+
+    Returns:
+    dict: Bin centres `x` and `y`, and `counts` (rows = y bins) with empty
+        bins as NaN so they are drawn transparent
+    """
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    counts = counts.T
+    counts[counts == 0] = np.nan
+    return {
+        'x': (x_edges[:-1] + x_edges[1:]) / 2,
+        'y': (y_edges[:-1] + y_edges[1:]) / 2,
+        'counts': counts
+    }
+
+
+def density_figure(grid, title, x_title, y_title):
+    """Heatmap figure of a density_grid() result"""
+    fig = go.Figure(go.Heatmap(
+        x=grid['x'],
+        y=grid['y'],
+        z=grid['counts'],
+        colorscale='Viridis',
+        colorbar=dict(title='Oyuncu Sayısı'),
+        hoverongaps=False,
+        hovertemplate='x: %{x:.1f}<br>y: %{y:.1f}<br>Oyuncu: %{z}<extra></extra>'
+    ))
+    fig.update_layout(title=title, xaxis_title=x_title, yaxis_title=y_title)
+    return fig
+
+
+def ols_line(x, y):
+    """
+    Least-squares line of y on x over every row
+
+    Returns:
+    dict or None: slope, intercept, r2, n and the x range; None when there
+        are fewer than two distinct x values
+    """
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[valid], y[valid]
+    if len(x) < 2 or x.min() == x.max():
+        return None
+    slope, intercept = np.polyfit(x, y, 1)
+    residuals = y - (slope * x + intercept)
+    total = ((y - y.mean()) ** 2).sum()
+    r2 = 1 - (residuals ** 2).sum() / total if total > 0 else 1.0
+    return {
+        'slope': slope,
+        'intercept': intercept,
+        'r2': r2,
+        'n': len(x),
+        'x_range': (x.min(), x.max())
+    }
+
+
+def add_trendline(fig, trend, color='red'):
+    """Draw an ols_line() result on `fig`; nothing is drawn for None"""
+    if trend is None:
+        return fig
+    x = np.array(trend['x_range'])
+    fig.add_trace(go.Scatter(
+        x=x,
+        y=trend['slope'] * x + trend['intercept'],
+        mode='lines',
+        line=dict(color=color),
+        name='OLS',
+        hovertemplate=(
+            f"OLS: y = {trend['slope']:.4f} x + {trend['intercept']:.2f}"
+            f"<br>R² = {trend['r2']:.4f} (n = {trend['n']})<extra></extra>"
+        )
+    ))
+    return fig
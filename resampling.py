@@ -0,0 +1,208 @@
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from profiling import available_cpus
+
+# Resamples are drawn in batches; each batch has its own seed derived from
+# the root seed, so results do not depend on the number of workers
+N_RESAMPLES = 10_000
+
+# Batches run between two convergence checks; fixed so that early stopping
+# is reproducible
+ROUND_BATCHES = 8
+
+# Resamples drawn before the stopping rules are checked
+MIN_RESAMPLES = 2_000
+
+# Bootstrap: stop once neither interval bound moves by more than this
+# fraction of the interval width between two rounds
+CI_TOLERANCE = 0.01
+
+# Work (resamples x distinct values) below which no process pool is used
+PARALLEL_MIN_WORK = 20_000_000
+
+# Groups with at least this many players use the Poisson bootstrap, whose
+# independent per-value draws are about twice as fast as a multinomial
+POISSON_MIN_ROWS = 100_000
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _start_method():
+    # The dashboard process runs Streamlit's and watchdog's threads, and a
+    # forked child can inherit a lock one of them holds and deadlock; the
+    # workers are started from a clean process instead
+    methods = multiprocessing.get_all_start_methods()
+    return 'forkserver' if 'forkserver' in methods else 'spawn'
+
+
+def _shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+
+def get_executor():
+    """Process pool shared by every resampling call in this process, shut down at exit"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=available_cpus(), mp_context=multiprocessing.get_context(_start_method())
+            )
+            atexit.register(_shutdown_executor)
+        return _executor
+
+
+def value_counts(values):
+    """Distinct values and their counts; NaN values are dropped"""
+    values = np.asarray(values, dtype='float64')
+    values = values[~np.isnan(values)]
+    unique, counts = np.unique(values, return_counts=True)
+    return unique, counts
+
+
+def _resample_means(rng, values, counts, size):
+    # Resampling n players with replacement is a multinomial draw of how
+    # often each distinct value is picked, so a resample costs O(distinct
+    # values) instead of O(players). Large groups draw each value's count
+    # from Poisson(count) instead (Poisson bootstrap)
+    n = counts.sum()
+    if n >= POISSON_MIN_ROWS:
+        draws = rng.poisson(counts, size=(size, len(counts)))
+        return draws @ values / draws.sum(axis=1)
+    draws = rng.multinomial(n, counts / n, size=size)
+    return draws @ values / n
+
+
+def _bootstrap_batch(values_a, counts_a, values_b, counts_b, size, seed):
+    rng = np.random.default_rng(seed)
+    return _resample_means(rng, values_b, counts_b, size) - _resample_means(rng, values_a, counts_a, size)
+
+
+def _permutation_batch(values, counts, n_b, size, seed):
+    # Relabelling players at random is a multivariate hypergeometric draw
+    # of how many players of each distinct value land in group B
+    rng = np.random.default_rng(seed)
+    in_b = rng.multivariate_hypergeometric(counts, n_b, size=size, method='marginals')
+    sum_b = in_b @ values
+    n_a = counts.sum() - n_b
+    return sum_b / n_b - (counts @ values - sum_b) / n_a
+
+
+def _run_batches(worker, args, n_resamples, n_values, seed, workers, should_stop):
+    """
+    Run `worker(*args, size, seed)` over seeded batches until `n_resamples`
+    are drawn or `should_stop(resamples)` is true after a round
+    """
+    # Bound the memory of one batch (size x distinct values draws)
+    batch_size = int(np.clip(2_000_000 // max(n_values, 1), 16, 1_000))
+    sizes = [min(batch_size, n_resamples - start) for start in range(0, n_resamples, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if workers is None:
+        workers = available_cpus() if n_resamples * n_values >= PARALLEL_MIN_WORK else 1
+    executor = get_executor() if workers > 1 else None
+
+    resamples = []
+    for start in range(0, len(sizes), ROUND_BATCHES):
+        round_sizes = sizes[start:start + ROUND_BATCHES]
+        round_seeds = seeds[start:start + ROUND_BATCHES]
+        if executor is None:
+            results = [worker(*args, size, batch_seed) for size, batch_seed in zip(round_sizes, round_seeds)]
+        else:
+            futures = [executor.submit(worker, *args, size, batch_seed) for size, batch_seed in zip(round_sizes, round_seeds)]
+            results = [future.result() for future in futures]
+        resamples.extend(results)
+        drawn = np.concatenate(resamples)
+        if len(drawn) >= MIN_RESAMPLES and should_stop(drawn):
+            break
+    return np.concatenate(resamples)
+
+
+def bootstrap_diff(values_a, values_b, n_resamples=N_RESAMPLES, alpha=0.05, seed=0, workers=None,
+                   tolerance=CI_TOLERANCE):
+    """
+    Percentile bootstrap interval for the difference in means (B - A)
+
+    Parameters:
+    values_a, values_b (array-like): Metric values of each group
+    n_resamples (int): Maximum number of bootstrap resamples
+    alpha (float): 1 - confidence level
+    seed (int): Root seed; the same seed gives the same result
+    workers (int or None): Processes to use; None picks by problem size
+    tolerance (float): Early-stopping tolerance, see CI_TOLERANCE
+
+    Returns:
+    dict: diff, ci_lower, ci_upper, se, n_resamples and converged
+    """
+    unique_a, counts_a = value_counts(values_a)
+    unique_b, counts_b = value_counts(values_b)
+    diff = (unique_b @ counts_b) / counts_b.sum() - (unique_a @ counts_a) / counts_a.sum()
+    quantiles = [alpha / 2, 1 - alpha / 2]
+    previous = {}
+
+    def converged(resamples):
+        lower, upper = np.quantile(resamples, quantiles)
+        last = previous.get('ci')
+        previous['ci'] = (lower, upper)
+        width = upper - lower
+        return last is not None and max(abs(lower - last[0]), abs(upper - last[1])) <= tolerance * width
+
+    resamples = _run_batches(
+        _bootstrap_batch, (unique_a, counts_a, unique_b, counts_b),
+        n_resamples, max(len(unique_a), len(unique_b)), seed, workers, converged
+    )
+    lower, upper = np.quantile(resamples, quantiles)
+    return {
+        'diff': diff,
+        'ci_lower': lower,
+        'ci_upper': upper,
+        'se': resamples.std(ddof=1),
+        'n_resamples': len(resamples),
+        'converged': len(resamples) < n_resamples
+    }
+
+
+def permutation_test(values_a, values_b, n_resamples=N_RESAMPLES, alpha=0.05, seed=0, workers=None):
+    """
+    Two-sided permutation test for the difference in means (B - A)
+
+    Stops early once the Monte Carlo error of the p-value can no longer
+    move it across `alpha`.
+
+    Returns:
+    dict: diff, p_value, n_resamples and converged
+    """
+    unique_a, counts_a = value_counts(values_a)
+    unique_b, counts_b = value_counts(values_b)
+    n_b = counts_b.sum()
+    values, inverse = np.unique(np.concatenate([unique_a, unique_b]), return_inverse=True)
+    counts = np.bincount(inverse, weights=np.concatenate([counts_a, counts_b]), minlength=len(values)).astype(np.int64)
+    observed = (unique_b @ counts_b) / n_b - (unique_a @ counts_a) / counts_a.sum()
+    # Tolerance for float noise when comparing resampled to observed differences
+    threshold = abs(observed) * (1 - 1e-9)
+
+    def p_value(resamples):
+        return (1 + (np.abs(resamples) >= threshold).sum()) / (1 + len(resamples))
+
+    def decided(resamples):
+        p = p_value(resamples)
+        return abs(p - alpha) > 3 * np.sqrt(p * (1 - p) / len(resamples))
+
+    resamples = _run_batches(
+        _permutation_batch, (values, counts, n_b),
+        n_resamples, len(values), seed, workers, decided
+    )
+    return {
+        'diff': observed,
+        'p_value': p_value(resamples),
+        'n_resamples': len(resamples),
+        'converged': len(resamples) < n_resamples
+    }
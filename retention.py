@@ -0,0 +1,303 @@
+import copy
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.colors import qualitative
+
+from filter_index import FILTER_DIMENSIONS
+
+# Dimensions the tables are split by: the sidebar filters plus the
+# segmentations of the retention curves
+RETENTION_DIMENSIONS = FILTER_DIMENSIONS + ['EngagementLevel']
+
+# Per-player values summed by days since signup, for mean-by-day curves
+RETENTION_MEASURES = ['IsActive', 'PlayTimeHours']
+
+# Columns survival (Kaplan–Meier) tables are built from
+SURVIVAL_COLUMNS = ['SignupDate', 'LastActiveDate', 'IsActive', 'DaysSinceSignup']
+
+# Segmentations offered for the retention and survival curves: label -> column
+RETENTION_SEGMENTS = {
+    "Genel": None,
+    "Cihaz": "Device",
+    "Oyun Türü": "GameGenre",
+    "Oyun Zorluğu": "GameDifficulty",
+    "Etkileşim Seviyesi": "EngagementLevel"
+}
+
+
+def retention_columns(dimensions=RETENTION_DIMENSIONS, measures=RETENTION_MEASURES, survival=True):
+    """Columns RetentionTables reads for the given layout"""
+    return list(dict.fromkeys(
+        list(dimensions) + ['DaysSinceSignup'] + list(measures) + (SURVIVAL_COLUMNS if survival else [])
+    ))
+
+
+def player_lifetimes(df):
+    """
+    Kaplan–Meier durations: (days observed, churned) per player
+
+    A churned player (IsActive False) was last seen LastActiveDate -
+    SignupDate days after signing up; an active one is censored at
+    DaysSinceSignup, the time they have been observed so far.
+    """
+    tenure = df['DaysSinceSignup'].to_numpy().astype(np.int64)
+    churned = ~df['IsActive'].to_numpy(dtype=bool)
+    signup = np.asarray(df['SignupDate'], dtype='datetime64[D]').astype(np.int64)
+    last_active = np.asarray(df['LastActiveDate'], dtype='datetime64[D]').astype(np.int64)
+    lifetime = np.clip(last_active - signup, 0, tenure)
+    return np.where(churned, lifetime, tenure), churned
+
+
+def _cell_codes(df, dimensions):
+    """(cells, cell number of each row): one cell per observed combination of `dimensions`"""
+    if not dimensions:
+        return pd.DataFrame(index=pd.RangeIndex(1)), np.zeros(len(df), dtype=np.int64)
+    codes, uniques = zip(*(pd.factorize(df[dim], sort=True) for dim in dimensions))
+    shape = [len(values) for values in uniques]
+    cell_ids, cell_codes = np.unique(np.ravel_multi_index(codes, shape), return_inverse=True)
+    cell_dim_codes = np.unravel_index(cell_ids, shape)
+    cells = pd.DataFrame({
+        dim: np.asarray(values)[dim_codes]
+        for dim, values, dim_codes in zip(dimensions, uniques, cell_dim_codes)
+    })
+    return cells, cell_codes
+
+
+class RetentionTables:
+    """
+    Day-indexed counts and sums per combination of RETENTION_DIMENSIONS
+
+    The tables count players by days since signup (players) and sum each
+    measure over them (sum:<measure>); with survival on, events and
+    censored count churned and still-active players by lifetime in days
+    (see player_lifetimes). Only populated (cell, day) pairs are kept:
+    entry_cells and entry_days list them sorted by cell, then day, and
+    every table holds one value per entry. A curve for any segmentation
+    and selection on the dimensions is then one np.bincount of the
+    selected entries over segment * n_days + day, rather than a groupby
+    over players.
+    """
+
+    def __init__(self, df, dimensions=RETENTION_DIMENSIONS, measures=RETENTION_MEASURES, survival=True):
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.survival = survival
+        self.cells, cell_codes = _cell_codes(df, self.dimensions)
+        days = df['DaysSinceSignup'].to_numpy().astype(np.int64)
+        self.n_days = int(days.max()) + 1 if len(days) else 1
+
+        # Table name -> (cell, day, weight or None) of each counted player
+        counted = {'players': (cell_codes, days, None)}
+        for measure in self.measures:
+            counted[f'sum:{measure}'] = (cell_codes, days, df[measure].to_numpy().astype('float64'))
+        if survival:
+            # Lifetimes never exceed days since signup, so they share the day axis
+            durations, churned = player_lifetimes(df)
+            counted['events'] = (cell_codes[churned], durations[churned], None)
+            counted['censored'] = (cell_codes[~churned], durations[~churned], None)
+
+        # Each table is binned over cell * n_days + day one at a time, and
+        # only the populated bins are kept
+        size = len(self.cells) * self.n_days
+        keys = {name: codes.astype(np.int64) * self.n_days + table_days for name, (codes, table_days, _) in counted.items()}
+        entry_keys = np.flatnonzero(np.bincount(np.concatenate(list(keys.values())), minlength=size))
+        self.entry_cells = (entry_keys // self.n_days).astype(np.int32)
+        self.entry_days = (entry_keys % self.n_days).astype(np.int32)
+        self.tables = {}
+        for name, (_, _, weights) in counted.items():
+            totals = np.bincount(keys[name], weights, minlength=size)[entry_keys]
+            self.tables[name] = totals if weights is not None else totals.astype(np.int64)
+
+    def _entry_keys(self, n_days):
+        return self.entry_cells.astype(np.int64) * n_days + self.entry_days
+
+    def append(self, rows):
+        """
+        Tables with `rows` counted in; only the new rows are binned, and
+        their entries are added to matching entries or inserted in order.
+        Returns new tables and leaves these unchanged.
+        """
+        delta = RetentionTables(rows, self.dimensions, self.measures, self.survival)
+        # Existing cells keep their numbers; new combinations are numbered after them
+        cells = pd.concat([self.cells, delta.cells], ignore_index=True)
+        cell_codes, unique_cells = pd.MultiIndex.from_frame(cells).factorize()
+        n_days = max(self.n_days, delta.n_days)
+
+        keys = self._entry_keys(n_days)
+        delta_keys = cell_codes[len(self.cells):][delta.entry_cells].astype(np.int64) * n_days + delta.entry_days
+        order = np.argsort(delta_keys)
+        delta_keys = delta_keys[order]
+        at = np.searchsorted(keys, delta_keys)
+        found = at < len(keys)
+        found[found] = keys[at[found]] == delta_keys[found]
+        # Delta entries are unique, so each existing entry is added to at most once
+        inserted = at[~found]
+        merged_keys = np.insert(keys, inserted, delta_keys[~found])
+
+        tables = copy.copy(self)
+        tables.cells = unique_cells.set_names(self.dimensions).to_frame(index=False)
+        tables.n_days = n_days
+        tables.entry_cells = (merged_keys // n_days).astype(np.int32)
+        tables.entry_days = (merged_keys % n_days).astype(np.int32)
+        tables.tables = {}
+        for name, values in self.tables.items():
+            delta_values = delta.tables[name][order]
+            values = values.copy()
+            values[at[found]] += delta_values[found]
+            tables.tables[name] = np.insert(values, inserted, delta_values[~found])
+        return tables
+
+    def covers(self, segment, selections, measures=(), survival=False):
+        """True when the tables can answer `segment` and `measures` under `selections`"""
+        dims = [segment] if segment else []
+        dims += [dim for dim, values in selections.items() if values]
+        return (set(dims) <= set(self.dimensions) and set(measures) <= set(self.measures)
+                and (self.survival or not survival))
+
+    def rollup(self, segment=None, selections=None):
+        """
+        Tables summed over the cells matching `selections`, one row per
+        value of `segment` (a single row when None)
+
+        Parameters:
+        segment (str or None): Dimension to split the curves by
+        selections (dict or None): Dimension -> accepted values, as passed
+            to FilterIndex.select
+
+        Returns:
+        RetentionRollup: The summed tables
+        """
+        keep = np.ones(len(self.cells), dtype=bool)
+        for dim, values in (selections or {}).items():
+            if values:
+                keep &= self.cells[dim].isin(values).to_numpy()
+        # Row of the rollup each cell is summed into; -1 for unselected cells
+        cell_rows = np.full(len(self.cells), -1, dtype=np.int64)
+        if segment is None:
+            cell_rows[keep] = 0
+            labels = pd.Index([None])
+        else:
+            cell_rows[keep], labels = pd.factorize(self.cells[segment][keep], sort=True)
+            labels = pd.Index(labels, name=segment)
+
+        entry_rows = cell_rows[self.entry_cells]
+        selected = None if keep.all() else entry_rows >= 0
+        if selected is None:
+            index = entry_rows * self.n_days + self.entry_days
+        else:
+            index = entry_rows[selected] * self.n_days + self.entry_days[selected]
+        size = len(labels) * self.n_days
+
+        def summed(name):
+            values = self.tables[name] if selected is None else self.tables[name][selected]
+            totals = np.bincount(index, values, minlength=size)
+            return totals.astype(values.dtype).reshape(len(labels), self.n_days)
+
+        return RetentionRollup(
+            segment, labels, summed('players'), {m: summed(f'sum:{m}') for m in self.measures},
+            summed('events') if self.survival else None, summed('censored') if self.survival else None
+        )
+
+
+class RetentionRollup:
+    """Day tables of one segmentation (rows: segment values; columns: days), as returned by RetentionTables.rollup"""
+
+    def __init__(self, segment, labels, players, sums, events=None, censored=None):
+        self.segment = segment
+        self.labels = labels
+        self.players = players
+        self.sums = sums
+        self.events = events
+        self.censored = censored
+
+    def _long(self, values):
+        """Long frame of per-segment day tables: [segment,] day and one column per table in `values`"""
+        n_segments, n_days = self.players.shape
+        rows = np.repeat(np.arange(n_segments), n_days)
+        frame = pd.DataFrame({name: table.ravel() for name, table in values.items()})
+        frame.insert(0, 'day', np.tile(np.arange(n_days), n_segments))
+        if self.segment is not None:
+            frame.insert(0, self.segment, self.labels[rows])
+        return frame
+
+    def mean_curve(self, measure):
+        """
+        Mean of `measure` by days since signup, per segment
+
+        Returns:
+        DataFrame: [segment,] DaysSinceSignup and the mean, for the days
+            that have players
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = self.sums[measure] / self.players
+        curve = self._long({measure: means, 'players': self.players})
+        curve = curve[curve.pop('players') > 0].rename(columns={'day': 'DaysSinceSignup'})
+        return curve.reset_index(drop=True)
+
+    def survival_curve(self, alpha=0.05):
+        """
+        Kaplan–Meier survival by days since signup, per segment, with
+        pointwise confidence intervals
+
+        Variances use Greenwood's formula, and the intervals are built on
+        the log(-log S) scale so they stay inside [0, 1].
+
+        Returns:
+        DataFrame: [segment,] day, at_risk, events, survival, ci_lower and
+            ci_upper, for the days someone is still at risk
+        """
+        events = self.events.astype('float64')
+        # At risk on day t: everyone whose duration is t or more
+        at_risk = np.cumsum((events + self.censored)[:, ::-1], axis=1)[:, ::-1]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            hazard = np.where(at_risk > 0, events / at_risk, 0.0)
+            survival = np.cumprod(1 - hazard, axis=1)
+            greenwood = np.cumsum(
+                np.where(at_risk > events, events / (at_risk * (at_risk - events)), np.where(events > 0, np.inf, 0.0)),
+                axis=1
+            )
+            log_s = np.log(survival)
+            se = np.sqrt(greenwood) / np.abs(log_s)
+            z = NormalDist().inv_cdf(1 - alpha / 2)
+            lower = np.where(survival >= 1, 1.0, np.where(survival <= 0, 0.0, survival ** np.exp(z * se)))
+            upper = np.where(survival >= 1, 1.0, np.where(survival <= 0, 0.0, survival ** np.exp(-z * se)))
+        curve = self._long({
+            'at_risk': at_risk.astype(np.int64), 'events': self.events, 'survival': survival,
+            'ci_lower': np.nan_to_num(lower, nan=0.0), 'ci_upper': np.nan_to_num(upper, nan=1.0)
+        })
+        return curve[curve['at_risk'] > 0].reset_index(drop=True)
+
+
+def survival_figure(curve, segment, title, alpha=0.05):
+    """Step lines of Kaplan–Meier survival (%) with shaded confidence bands, one per segment"""
+    fig = go.Figure()
+    groups = curve.groupby(segment, observed=True, sort=False) if segment else [(None, curve)]
+    colors = qualitative.Plotly
+    for i, (label, group) in enumerate(groups):
+        color = colors[i % len(colors)]
+        name = "Genel" if label is None else str(label)
+        fig.add_trace(go.Scatter(
+            x=np.concatenate([group['day'], group['day'][::-1]]),
+            y=np.concatenate([group['ci_upper'], group['ci_lower'][::-1]]) * 100,
+            fill='toself', fillcolor=color, opacity=0.2, line=dict(width=0, shape='hv'),
+            hoverinfo='skip', showlegend=False, legendgroup=name
+        ))
+        fig.add_trace(go.Scatter(
+            x=group['day'], y=group['survival'] * 100, name=name, legendgroup=name,
+            line=dict(color=color, shape='hv'),
+            customdata=np.column_stack([group['ci_lower'] * 100, group['ci_upper'] * 100, group['at_risk']]),
+            hovertemplate=(
+                f"{name} · gün %{{x}}: %{{y:.1f}} [%{{customdata[0]:.1f}}, %{{customdata[1]:.1f}}]"
+                "<br>Risk altında: %{customdata[2]:,}<extra></extra>"
+            )
+        ))
+    fig.update_layout(
+        title=title,
+        xaxis_title='Kayıttan Sonra Geçen Gün',
+        yaxis_title=f'Hayatta Kalma (%) · %{(1 - alpha) * 100:.0f} güven aralığı',
+        yaxis_range=[0, 100]
+    )
+    return fig
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+# Category values shared by the data generator and the dashboard
+GAME_GENRES = ['Action RPG', 'Strategy', 'Casual', 'Puzzle', 'Adventure', 'Sports', 'Battle Royale']
+DIFFICULTIES = ['Kolay', 'Orta', 'Zor']  # Turkish difficulty levels
+ENGAGEMENT_LEVELS = ['Düşük', 'Orta', 'Yüksek']  # Turkish engagement levels
+LOCATIONS = ['Türkiye', 'ABD', 'Almanya', 'İngiltere', 'Fransa', 'Rusya', 'Japonya', 'Güney Kore', 'Diğer']
+GENDERS = ['Erkek', 'Kadın', 'Diğer']  # Turkish gender labels
+DEVICES = ['Android', 'iOS', 'PC', 'Console']
+AB_GROUPS = ['A', 'B']
+
+# Compact in-memory dtype for each of the 24 dataset columns
+PLAYER_SCHEMA = {
+    'PlayerID': 'int32',
+    'Age': 'int8',
+    'Gender': pd.CategoricalDtype(GENDERS),
+    'Location': pd.CategoricalDtype(LOCATIONS),
+    'Device': pd.CategoricalDtype(DEVICES),
+    'SignupDate': 'datetime64[ns]',
+    'GameGenre': pd.CategoricalDtype(GAME_GENRES),
+    'GameDifficulty': pd.CategoricalDtype(DIFFICULTIES, ordered=True),
+    'AB_Group': pd.CategoricalDtype(AB_GROUPS),
+    'HasPurchased': 'bool',
+    'TotalSpentUSD': 'float32',
+    'PlayTimeHours': 'float32',
+    'SessionsPerWeek': 'int8',
+    'AvgSessionDurationMinutes': 'int16',
+    'PlayerLevel': 'int8',
+    'AchievementsUnlocked': 'int8',
+    'DaysSinceSignup': 'int16',
+    'IsActive': 'bool',
+    'LastActiveDate': 'datetime64[ns]',
+    'FriendsCount': 'int16',
+    'GuildMember': 'bool',
+    'AvgFPS': 'float32',
+    'CrashCount': 'int16',
+    'EngagementLevel': pd.CategoricalDtype(ENGAGEMENT_LEVELS, ordered=True)
+}
+
+BOOL_COLUMNS = [col for col, dtype in PLAYER_SCHEMA.items() if dtype == 'bool']
+
+
+class SchemaError(ValueError):
+    """Raised when a column cannot be stored in its declared dtype"""
+
+
+def _cast_column(series, dtype):
+    name = series.name
+    if isinstance(dtype, pd.CategoricalDtype):
+        values = series.astype(dtype)
+        unknown = values.isna() & series.notna()
+        if unknown.any():
+            raise SchemaError(f"{name}: unknown categories {sorted(series[unknown].astype(str).unique().tolist())}")
+        return values
+
+    if dtype.startswith('datetime64'):
+        return pd.to_datetime(series).astype(dtype)
+
+    if series.isna().any():
+        raise SchemaError(f"{name}: {int(series.isna().sum())} missing values")
+
+    if dtype == 'bool':
+        if series.dtype != bool and not series.isin([0, 1]).all():
+            raise SchemaError(f"{name}: expected only 0/1 values")
+        return series.astype('bool')
+
+    if dtype.startswith('int'):
+        info = np.iinfo(dtype)
+        if len(series) and (series.min() < info.min or series.max() > info.max):
+            raise SchemaError(f"{name}: values [{series.min()}, {series.max()}] do not fit in {dtype}")
+        if series.dtype.kind == 'f' and not np.array_equal(series, np.round(series)):
+            raise SchemaError(f"{name}: expected whole numbers")
+    return series.astype(dtype)
+
+
+def apply_schema(df, require_all=False):
+    """
+    Downcast a player frame to the declared compact dtypes, validating
+    each column on the way
+
+    Parameters:
+    df (DataFrame): Frame with any subset of the dataset columns
+    require_all (bool): Raise if any of the 24 schema columns is missing
+
+    Returns:
+    DataFrame: A new frame with the schema dtypes applied
+    """
+    if require_all:
+        missing = [col for col in PLAYER_SCHEMA if col not in df.columns]
+        if missing:
+            raise SchemaError(f"Missing columns: {missing}")
+
+    converted = {}
+    for col in df.columns:
+        dtype = PLAYER_SCHEMA.get(col)
+        if dtype is None or df[col].dtype == dtype:
+            converted[col] = df[col]
+        else:
+            converted[col] = _cast_column(df[col], dtype)
+    return pd.DataFrame(converted, index=df.index)
+
+
+def csv_dtypes(columns=None):
+    """read_csv dtype hints: categoricals are parsed directly, the rest is left to apply_schema"""
+    columns = PLAYER_SCHEMA if columns is None else columns
+    return {col: 'category' for col in columns if isinstance(PLAYER_SCHEMA.get(col), pd.CategoricalDtype)}
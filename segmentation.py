@@ -0,0 +1,152 @@
+import hashlib
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.preprocessing import StandardScaler
+
+MODEL_DIR = 'models'
+
+# Behavioural metrics the players are clustered on
+SEGMENT_FEATURES = [
+    'PlayTimeHours',
+    'TotalSpentUSD',
+    'SessionsPerWeek',
+    'AchievementsUnlocked',
+    'AvgSessionDurationMinutes',
+    'FriendsCount'
+]
+
+N_SEGMENTS = 4
+
+# Populations larger than this are fitted with MiniBatchKMeans
+MINIBATCH_MIN_ROWS = 200_000
+
+
+def feature_matrix(df, features=SEGMENT_FEATURES):
+    """Float feature matrix for clustering, missing values as 0"""
+    return df[features].to_numpy(dtype='float64', na_value=0)
+
+
+def name_segments(centers):
+    """
+    Descriptive names for clusters from their centres
+
+    Parameters:
+    centers (DataFrame): One row per cluster, feature means in original units
+
+    Returns:
+    dict: Cluster id -> segment name
+    """
+    names = {}
+    names[centers['TotalSpentUSD'].idxmax()] = "Yüksek Değerli"
+    # Lowest play time is a proxy for low engagement
+    low_engagement_id = centers['PlayTimeHours'].idxmin()
+    names.setdefault(low_engagement_id, "Düşük Etkileşimli")
+
+    # Remaining clusters by play time: the lower one plays casually, the higher one plays a lot without spending
+    remaining = centers.loc[[i for i in centers.index if i not in names], 'PlayTimeHours'].sort_values()
+    for cluster_id, name in zip(remaining.index, ["Sıradan Oyuncu", "Aktif Harcamayan"]):
+        names[cluster_id] = name
+    return {i: names.get(i, f"Segment {i+1}") for i in centers.index}
+
+
+class SegmentModel:
+    """
+    Scaler and K-Means model fitted once on the whole population
+
+    Filtered views are labelled with predict(), so changing the sidebar
+    filters never refits. Segment names are fixed at fit time.
+    """
+
+    def __init__(self, scaler, kmeans, features=SEGMENT_FEATURES, dataset_version=None):
+        self.scaler = scaler
+        self.kmeans = kmeans
+        self.features = list(features)
+        self.dataset_version = dataset_version
+        self.centers = pd.DataFrame(
+            scaler.inverse_transform(kmeans.cluster_centers_),
+            columns=self.features
+        )
+        self.names = name_segments(self.centers)
+
+    @property
+    def n_clusters(self):
+        return self.kmeans.n_clusters
+
+    def predict(self, df):
+        """Cluster id of each row"""
+        if len(df) == 0:
+            return np.empty(0, dtype=np.int32)
+        return self.kmeans.predict(self.scaler.transform(feature_matrix(df, self.features)))
+
+    def segments(self, df):
+        """Segment name of each row, as a categorical Series aligned with `df`"""
+        categories = [self.names[i] for i in range(self.n_clusters)]
+        return pd.Series(
+            pd.Categorical.from_codes(self.predict(df), categories=categories),
+            index=df.index,
+            name='Segment'
+        )
+
+
+def fit_segment_model(df, n_clusters=N_SEGMENTS, random_state=42, dataset_version=None,
+                      minibatch_min_rows=MINIBATCH_MIN_ROWS):
+    """
+    Fit the scaler and clustering model on `df`
+
+    Parameters:
+    df (DataFrame): Players with the SEGMENT_FEATURES columns
+    n_clusters (int): Number of segments
+    random_state (int): Seed for reproducible clusters
+    dataset_version (str or None): Recorded on the model
+    minibatch_min_rows (int): Row count from which MiniBatchKMeans is used
+
+    Returns:
+    SegmentModel
+    """
+    if len(df) < n_clusters:
+        raise ValueError(f"At least {n_clusters} players are needed to fit {n_clusters} segments")
+    scaler = StandardScaler()
+    scaled_features = scaler.fit_transform(feature_matrix(df))
+    if len(df) >= minibatch_min_rows:
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, n_init=3, batch_size=4096)
+    else:
+        kmeans = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10)
+    kmeans.fit(scaled_features)
+    return SegmentModel(scaler, kmeans, dataset_version=dataset_version)
+
+
+def model_path(dataset_version, n_clusters=N_SEGMENTS, model_dir=MODEL_DIR):
+    """File a model for this dataset version and configuration is saved to"""
+    key = f"{dataset_version}|{','.join(SEGMENT_FEATURES)}|{n_clusters}"
+    return os.path.join(model_dir, f"segments-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}.joblib")
+
+
+def load_or_fit_segment_model(dataset_version, load_frame, n_clusters=N_SEGMENTS, model_dir=MODEL_DIR):
+    """
+    Load the saved model for `dataset_version`, fitting and saving it if missing
+
+    Parameters:
+    dataset_version (str): Version of the dataset the model belongs to
+    load_frame (callable): Returns the player frame to fit on; only called
+        when no saved model exists
+    n_clusters (int): Number of segments
+    model_dir (str): Directory the models are saved in
+    """
+    path = model_path(dataset_version, n_clusters, model_dir)
+    if os.path.exists(path):
+        try:
+            return joblib.load(path)
+        except Exception:
+            # Unreadable (e.g. saved by another scikit-learn version): refit
+            pass
+    model = fit_segment_model(load_frame(), n_clusters, dataset_version=dataset_version)
+    os.makedirs(model_dir, exist_ok=True)
+    # Write then rename, so a concurrent reader never sees a partial file
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(model, temp_path)
+    os.replace(temp_path, path)
+    return model
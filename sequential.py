@@ -0,0 +1,200 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from ab_testing import AB_METRICS, adjust_p_values
+
+# Rows folded into the state per step; every step adds one point to the
+# p-value history
+SEQUENTIAL_BATCH_ROWS = 1_000
+
+# Points kept in the p-value history; past this every other point is
+# dropped, so the chart still spans every player seen at a coarser step
+MAX_HISTORY_POINTS = 2_000
+
+# Decisions are held back until both arms have this many players, because
+# the variance is estimated from the data
+MIN_SAMPLES_PER_ARM = 100
+
+# Standard deviation of the normal mixture over the standardised effect
+# (Cohen's d) that the test is tuned to detect
+MIXTURE_TAU = 0.1
+
+DECISIONS = {
+    'continue': "Devam",
+    'treatment': "Durdur: B daha iyi",
+    'control': "Durdur: A daha iyi"
+}
+
+
+def msprt_likelihood_ratio(diff, variance, tau=MIXTURE_TAU):
+    """
+    Mixture likelihood ratio of the mSPRT with a normal mixture N(0, tau²)
+
+    Parameters:
+    diff (array): Standardised difference of the arm means
+    variance (array): Variance of `diff` (1/n_a + 1/n_b on that scale)
+    tau (float): Mixture standard deviation
+    """
+    tau2 = tau ** 2
+    return np.sqrt(variance / (variance + tau2)) * np.exp(tau2 * diff ** 2 / (2 * variance * (variance + tau2)))
+
+
+class SequentialMonitor:
+    """
+    Always-valid A/B monitor (mixture sequential probability ratio test)
+
+    The state is the running count, sum and sum of squares of every metric
+    per arm, so each update costs O(new rows) and the test statistic is
+    recomputed from the state in O(metrics). The always-valid p-value is
+    the running minimum of 1 / likelihood ratio: it can be looked at after
+    every update without inflating the false positive rate.
+    """
+
+    def __init__(self, metrics=AB_METRICS, alpha=0.05, correction='holm', tau=MIXTURE_TAU,
+                 control='A', treatment='B', min_samples=MIN_SAMPLES_PER_ARM):
+        self.metrics = metrics
+        self.keys = list(metrics)
+        self.columns = [metrics[key][1] for key in self.keys]
+        self.alpha = alpha
+        self.correction = correction
+        self.tau = tau
+        self.arms = (control, treatment)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        n_metrics = len(self.keys)
+        self.n = np.zeros(2)
+        self.sums = np.zeros((2, n_metrics))
+        self.sumsqs = np.zeros((2, n_metrics))
+        self.p_values = np.ones(n_metrics)
+        self.likelihood_ratios = np.ones(n_metrics)
+        self.history = []
+        # Watermark: rows already folded in, and the PlayerID of the last one
+        self.rows_seen = 0
+        self.last_player_id = None
+
+    def update(self, rows):
+        """Fold new player rows (AB_Group plus the metric columns) into the state"""
+        arm = rows['AB_Group'].to_numpy()
+        values = rows[self.columns].to_numpy(dtype='float64', na_value=np.nan)
+        values = np.nan_to_num(values)
+        for i, name in enumerate(self.arms):
+            in_arm = arm == name
+            arm_values = values[in_arm]
+            self.n[i] += in_arm.sum()
+            self.sums[i] += arm_values.sum(axis=0)
+            self.sumsqs[i] += (arm_values * arm_values).sum(axis=0)
+        self._test()
+
+    def _test(self):
+        n = self.n[:, None]
+        if (self.n < max(self.min_samples, 2)).any():
+            return
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = self.sums / n
+            variances = np.maximum(self.sumsqs - self.sums ** 2 / n, 0) / (n - 1)
+            pooled_std = np.sqrt(((n - 1) * variances).sum(axis=0) / (self.n.sum() - 2))
+            standardised = (means[1] - means[0]) / pooled_std
+            variance = 1 / self.n[0] + 1 / self.n[1]
+            ratio = msprt_likelihood_ratio(standardised, variance, self.tau)
+        ratio = np.where(np.isfinite(ratio), ratio, 1.0)
+        self.likelihood_ratios = ratio
+        self.p_values = np.minimum(self.p_values, np.minimum(1, 1 / ratio))
+        self.history.append((int(self.n.sum()), self.p_values.copy()))
+        if len(self.history) > MAX_HISTORY_POINTS:
+            # Keep the latest point so the chart ends at the current state
+            self.history = self.history[-1::-2][::-1]
+
+    def sync(self, frame, row_mask=None, batch_rows=SEQUENTIAL_BATCH_ROWS):
+        """
+        Fold the rows of `frame` past the watermark into the state
+
+        `frame` holds every player in file order; rows are only ever
+        appended, so the new ones are the rows after `rows_seen`. If the
+        row before the watermark no longer has the PlayerID seen there,
+        the data was rewritten and the test starts over.
+
+        Parameters:
+        frame (DataFrame): All players, in file order, with PlayerID
+        row_mask (callable or None): Takes a batch of new rows and returns
+            a boolean mask of the rows the experiment view includes
+        batch_rows (int): Rows per update step
+
+        Returns:
+        int: Number of new rows read
+        """
+        with self._lock:
+            player_ids = frame['PlayerID']
+            if self.rows_seen > len(frame) or (
+                self.rows_seen and player_ids.iat[self.rows_seen - 1] != self.last_player_id
+            ):
+                self.reset()
+            start = self.rows_seen
+            for offset in range(start, len(frame), batch_rows):
+                batch = frame.iloc[offset:offset + batch_rows]
+                if row_mask is not None:
+                    batch = batch[row_mask(batch)]
+                self.update(batch)
+            if len(frame) > start:
+                self.rows_seen = len(frame)
+                self.last_player_id = player_ids.iat[-1]
+            return len(frame) - start
+
+    def summary(self, correction=None):
+        """
+        Current state of every metric; `correction` overrides the
+        monitor's multiple-testing correction
+
+        Returns:
+        DataFrame: Arm sizes and means, always-valid p-value (raw and
+            corrected over the metrics), likelihood ratio and decision
+        """
+        with self._lock:
+            n = self.n[:, None]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                means = self.sums / n
+            p_adjusted = adjust_p_values(self.p_values, correction or self.correction)
+            ready = (self.n >= self.min_samples).all()
+            stop = ready & (p_adjusted <= self.alpha)
+            decision = np.where(~stop, 'continue', np.where(means[1] > means[0], 'treatment', 'control'))
+            return pd.DataFrame({
+                'metric': self.keys,
+                'n_a': int(self.n[0]),
+                'n_b': int(self.n[1]),
+                'mean_a': means[0],
+                'mean_b': means[1],
+                'diff': means[1] - means[0],
+                'likelihood_ratio': self.likelihood_ratios,
+                'p_value': self.p_values,
+                'p_adjusted': p_adjusted,
+                'decision': decision
+            })
+
+    def p_value_history(self):
+        """Always-valid p-value of every metric after each update step, indexed by players seen"""
+        with self._lock:
+            if not self.history:
+                return pd.DataFrame(columns=self.keys)
+            players, p_values = zip(*self.history)
+            return pd.DataFrame(np.vstack(p_values), index=pd.Index(players, name='Oyuncu Sayısı'), columns=self.keys)
+
+
+def row_filter(selections, ranges=None):
+    """Row mask function for SequentialMonitor.sync() matching sidebar selections and date ranges"""
+    def mask(rows):
+        keep = np.ones(len(rows), dtype=bool)
+        for dim, values in selections.items():
+            if values:
+                keep &= rows[dim].isin(values).to_numpy()
+        for col, (start, end) in (ranges or {}).items():
+            values = rows[col].to_numpy()
+            if start is not None:
+                keep &= values >= start
+            if end is not None:
+                keep &= values < end
+        return keep
+    return mask
@@ -0,0 +1,322 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+import pandas as pd
+
+from refresh import REFRESH_POLL_SECONDS, DatasetSnapshot, DatasetStore
+from schema import PLAYER_SCHEMA
+from storage import DATASET_DIR
+
+# Dashboard workers started with this set to a shared directory attach to
+# the snapshots published there instead of reading the data files
+SHARED_ENV = 'DASHBOARD_SHARED_DIR'
+
+# Default shared directory; a tmpfs path (e.g. /dev/shm/dashboard) keeps
+# the images in memory only
+SHARED_DIR = 'data/serving'
+
+# File in the shared directory naming the current image
+CURRENT_FILE = 'CURRENT'
+
+# Image files: the pickled snapshot, the raw array buffers it refers to,
+# and the manifest locating those buffers
+PAYLOAD_FILE = 'snapshot.pickle'
+BUFFERS_FILE = 'buffers.bin'
+MANIFEST_FILE = 'manifest.json'
+
+# Images kept in the shared directory, the current one included; workers
+# still attached to a removed image keep their mapping until they move on
+KEEP_IMAGES = 2
+
+# Each buffer starts on a cache line
+BUFFER_ALIGNMENT = 64
+
+DEFAULT_PORT = 8501
+
+
+def shared_dir_from_env():
+    """Shared directory this process serves from, None when it reads the data files itself"""
+    return os.environ.get(SHARED_ENV) or None
+
+
+def image_name(version):
+    """Directory name of the image of a snapshot version"""
+    return hashlib.sha1(version.encode()).hexdigest()[:16]
+
+
+def _encode_columns(columns):
+    # Datetime Series unpickle into a copy of their data; plain int64
+    # arrays come back as views of the mapped buffers
+    return {
+        col: ('datetime', values.to_numpy().view('int64'), str(values.dtype)) if values.dtype.kind == 'M' else values
+        for col, values in columns.items()
+    }
+
+
+def _decode_columns(columns):
+    return {
+        col: pd.Series(values[1].view(values[2]), name=col, copy=False) if isinstance(values, tuple) else values
+        for col, values in columns.items()
+    }
+
+
+def write_image(snapshot, path):
+    """
+    Write every structure of `snapshot` to the image directory `path`
+
+    The snapshot is pickled with protocol 5 and its NumPy buffers (the
+    columns, the filter index, the cube tables and sketches) are written
+    out of band into one file, so attach_image can map them instead of
+    reading them.
+    """
+    buffers = []
+    payload = pickle.dumps({
+        'columns': _encode_columns(snapshot.columns),
+        'filter_index': snapshot.filter_index,
+        'cube': snapshot.cube,
+        'histogram_cube': snapshot.histogram_cube(),
+        'retention_tables': snapshot.retention_tables(),
+        'box_cube': snapshot.box_cube()
+    }, protocol=5, buffer_callback=buffers.append)
+
+    layout = []
+    with open(os.path.join(path, BUFFERS_FILE), 'wb') as f:
+        for buffer in buffers:
+            data = buffer.raw()
+            f.write(b'\0' * (-f.tell() % BUFFER_ALIGNMENT))
+            layout.append((f.tell(), data.nbytes))
+            f.write(data)
+    with open(os.path.join(path, PAYLOAD_FILE), 'wb') as f:
+        f.write(payload)
+    manifest = {
+        'version': snapshot.version,
+        'base_version': snapshot.base_version,
+        'rows': snapshot.n_rows,
+        'info': snapshot.info,
+        'buffers': layout,
+        'published': time.time()
+    }
+    with open(os.path.join(path, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f)
+
+
+def publish_snapshot(snapshot, shared_dir=SHARED_DIR):
+    """
+    Write `snapshot` as an image in `shared_dir` and make it current
+
+    The image is written under a temporary name and renamed into place,
+    then CURRENT is replaced atomically, so a worker never attaches to a
+    half-written image.
+
+    Parameters:
+    snapshot (DatasetSnapshot): Snapshot with every column loaded
+    shared_dir (str): Directory the workers attach from
+
+    Returns:
+    str: Name of the published image
+    """
+    os.makedirs(shared_dir, exist_ok=True)
+    name = image_name(snapshot.version)
+    path = os.path.join(shared_dir, name)
+    if not os.path.isdir(path):
+        tmp_path = os.path.join(shared_dir, f'.{name}.{os.getpid()}.tmp')
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        try:
+            write_image(snapshot, tmp_path)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+        os.rename(tmp_path, path)
+    tmp_current = os.path.join(shared_dir, f'.{CURRENT_FILE}.{os.getpid()}.tmp')
+    with open(tmp_current, 'w') as f:
+        f.write(name)
+    os.replace(tmp_current, os.path.join(shared_dir, CURRENT_FILE))
+    return name
+
+
+def prune_images(shared_dir=SHARED_DIR, keep=KEEP_IMAGES):
+    """Remove all but the `keep` most recently published images, never the current one"""
+    current = current_image(shared_dir)
+    images = [
+        name for name in os.listdir(shared_dir)
+        if os.path.isfile(os.path.join(shared_dir, name, MANIFEST_FILE))
+    ]
+    images.sort(key=lambda name: os.path.getmtime(os.path.join(shared_dir, name, MANIFEST_FILE)), reverse=True)
+    for name in images[keep:]:
+        if name != current:
+            shutil.rmtree(os.path.join(shared_dir, name), ignore_errors=True)
+
+
+def current_image(shared_dir=SHARED_DIR):
+    """Name of the current image, None before the first publish"""
+    try:
+        with open(os.path.join(shared_dir, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def attach_image(path):
+    """
+    Map an image read-only
+
+    Every array comes back as a read-only view of one shared mapping of
+    the buffers file, so workers attached to the same image share its
+    pages through the OS page cache rather than each holding a copy.
+
+    Returns:
+    (dict, dict): The manifest and the unpickled structures
+    """
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    with open(os.path.join(path, PAYLOAD_FILE), 'rb') as f:
+        payload = f.read()
+    with open(os.path.join(path, BUFFERS_FILE), 'rb') as f:
+        # An empty file cannot be mapped (no buffers at all)
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b''
+    view = memoryview(mapped)
+    structures = pickle.loads(payload, buffers=[view[offset:offset + size] for offset, size in manifest['buffers']])
+    structures['columns'] = _decode_columns(structures['columns'])
+    return manifest, structures
+
+
+class SharedDatasetStore:
+    """
+    Read-only stand-in for DatasetStore in dashboard workers
+
+    Snapshots are attached from the images a serving.py process publishes
+    in the shared directory: the frame, filter index and cubes are views
+    of the mapped image, and a new image is picked up when CURRENT changes.
+    Images hold every column and are never pruned, and the pages, the
+    segment model and the export all read the snapshot, so nothing is
+    read from the data files.
+    """
+
+    # Images always hold the whole dataset
+    prune = None
+
+    def __init__(self, shared_dir=SHARED_DIR):
+        self.shared_dir = shared_dir
+        self.dataset_dir = DATASET_DIR
+        self._lock = threading.Lock()
+        self._pointer = None
+        self._image = None
+        self._snapshot = None
+        self.snapshot()
+
+    def _attach(self, name):
+        manifest, structures = attach_image(os.path.join(self.shared_dir, name))
+        info = dict(manifest['info'], source=f"{manifest['info']['source']} (paylaşımlı)")
+        return DatasetSnapshot(
+            self, manifest['version'], manifest['base_version'], manifest['rows'], structures['columns'],
+            structures['filter_index'], structures['cube'], structures['histogram_cube'], info,
+            structures['retention_tables'], structures['box_cube']
+        )
+
+    def snapshot(self):
+        """Current snapshot, attached again when CURRENT names a new image"""
+        pointer_path = os.path.join(self.shared_dir, CURRENT_FILE)
+        with self._lock:
+            try:
+                stat = os.stat(pointer_path)
+                pointer = (stat.st_size, stat.st_mtime_ns)
+            except FileNotFoundError:
+                pointer = None
+            if pointer != self._pointer or self._snapshot is None:
+                name = current_image(self.shared_dir)
+                if name is None:
+                    raise FileNotFoundError(
+                        f"{self.shared_dir} içinde yayımlanmış veri bulunamadı; önce serving.py çalıştırılmalı."
+                    )
+                if name != self._image:
+                    self._snapshot = self._attach(name)
+                    self._image = name
+                self._pointer = pointer
+            return self._snapshot
+
+    def read_columns(self, columns, n_rows):
+        # Only reached for a column the image lacks, i.e. not in the dataset
+        raise KeyError(f"Paylaşılan veride bulunmayan sütunlar: {', '.join(columns)}")
+
+    def stop(self):
+        """Nothing to stop: the publishing process watches the data files"""
+
+
+def serve(workers, port=DEFAULT_PORT, shared_dir=SHARED_DIR, streamlit_args=()):
+    """
+    Publish the dataset, start `workers` dashboard processes attached to
+    it and republish whenever the data files change, until interrupted
+
+    Every worker maps the same image, so adding workers costs their own
+    interpreter and sessions but not another copy of the dataset.
+    """
+    store = DatasetStore()
+    snapshot = store.snapshot()
+    snapshot.frame(list(PLAYER_SCHEMA))
+    name = publish_snapshot(snapshot, shared_dir)
+    print(f"Yayımlandı: {name} ({snapshot.n_rows:,} satır) -> {shared_dir}")
+
+    env = dict(os.environ, **{SHARED_ENV: shared_dir})
+    processes = [
+        subprocess.Popen(
+            [sys.executable, '-m', 'streamlit', 'run', 'app.py', '--server.port', str(port + i),
+             '--server.headless', 'true', *streamlit_args],
+            env=env
+        )
+        for i in range(workers)
+    ]
+    for i in range(workers):
+        print(f"Çalışan {i + 1}: http://localhost:{port + i}")
+
+    try:
+        while True:
+            time.sleep(REFRESH_POLL_SECONDS)
+            latest = store.snapshot()
+            if latest.version != snapshot.version:
+                snapshot = latest
+                # Appends extend only the columns already loaded, which is all of them
+                snapshot.frame(list(PLAYER_SCHEMA))
+                name = publish_snapshot(snapshot, shared_dir)
+                prune_images(shared_dir)
+                print(f"Yayımlandı: {name} ({snapshot.n_rows:,} satır)")
+            for process in processes:
+                if process.poll() is not None:
+                    raise RuntimeError(f"Çalışan süreç {process.pid} sonlandı (çıkış kodu {process.returncode})")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.stop()
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Veri setini paylaşımlı belleğe yayımlar ve panel süreçlerini başlatır (Shared-memory serving)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Başlatılacak panel süreci sayısı; 0 yalnızca yayımlar (default: CPU count)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="İlk sürecin portu; sonrakiler birer artar")
+    parser.add_argument('--shared-dir', default=SHARED_DIR, help="Görüntülerin yazılacağı klasör (örn. /dev/shm/dashboard)")
+    parser.add_argument('--once', action='store_true', help="Bir kez yayımla ve çık")
+    args, streamlit_args = parser.parse_known_args()
+
+    if args.once:
+        store = DatasetStore(watch=False)
+        snapshot = store.snapshot()
+        snapshot.frame(list(PLAYER_SCHEMA))
+        name = publish_snapshot(snapshot, args.shared_dir)
+        prune_images(args.shared_dir)
+        print(f"Yayımlandı: {name} ({snapshot.n_rows:,} satır) -> {args.shared_dir}")
+    else:
+        serve(args.workers, args.port, args.shared_dir, streamlit_args)
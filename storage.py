@@ -0,0 +1,397 @@
+import hashlib
+import io
+import os
+import re
+import shutil
+import sys
+import time
+from urllib.parse import unquote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from schema import PLAYER_SCHEMA, apply_schema, csv_dtypes
+
+# Default locations of the player dataset
+CSV_PATH = 'data/online_gaming_behavior_dataset.csv'
+PARQUET_PATH = 'data/online_gaming_behavior_dataset.parquet'
+
+# Rows appended by the ETL as separate Parquet files; they follow the main
+# file's rows, in file name order. Files must be written atomically (write
+# to a temporary name, then rename) so a half-written one is never read
+PARTITION_DIR = 'data/partitions'
+
+# Hive-partitioned Parquet layout, readable by pyarrow, Spark or DuckDB:
+#   data/players/SignupMonth=2025-01/GameGenre=Casual/part-00000-0.parquet
+# Partition values live in the directory names only. Rows follow file name
+# order across directories (part-<batch>-<n>), so a new write batch is an
+# append. When this directory exists it replaces the CSV/Parquet files
+DATASET_DIR = 'data/players'
+HIVE_PARTITIONING = ['SignupMonth', 'GameGenre']
+
+DATE_COLUMNS = ['SignupDate', 'LastActiveDate']
+
+# Low-cardinality string dimensions, kept as pandas categoricals in memory
+CATEGORICAL_COLUMNS = [col for col, dtype in PLAYER_SCHEMA.items() if isinstance(dtype, pd.CategoricalDtype)]
+
+
+def frame_memory_mb(df):
+    """Deep memory usage of a DataFrame in megabytes"""
+    return df.memory_usage(deep=True).sum() / (1024 ** 2)
+
+
+def dataset_version(path, partitions=()):
+    """Identifies the contents of a data file (and its partition files); changes whenever one is rewritten or added"""
+    stat = os.stat(path)
+    version = f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    if partitions:
+        digest = hashlib.sha1('|'.join(dataset_version(p) for p in partitions).encode('utf-8')).hexdigest()[:12]
+        version += f"+{len(partitions)}:{digest}"
+    return version
+
+
+def base_file(parquet_path=PARQUET_PATH, csv_path=CSV_PATH):
+    """
+    The main data file to read: the Parquet copy when it is at least as
+    new as the CSV, else the CSV
+
+    Returns:
+    (str, str): Source ('parquet' or 'csv') and path
+    """
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+        return 'parquet', parquet_path
+    return 'csv', csv_path
+
+
+def partition_files(partition_dir=PARTITION_DIR):
+    """Partition files holding appended rows, in the order their rows follow the main file"""
+    if not os.path.isdir(partition_dir):
+        return []
+    return sorted(
+        os.path.join(partition_dir, name) for name in os.listdir(partition_dir)
+        if name.endswith('.parquet')
+    )
+
+
+def read_csv_players(path=CSV_PATH, columns=None):
+    """
+    Read the player CSV, parsing dates and categoricals while reading
+
+    Parameters:
+    path (str): CSV file to read
+    columns (list or None): Columns to read, None reads all of them
+    """
+    columns = list(columns) if columns is not None else None
+    date_columns = [c for c in DATE_COLUMNS if columns is None or c in columns]
+    df = pd.read_csv(path, usecols=columns, dtype=csv_dtypes(columns), parse_dates=date_columns)
+    return apply_schema(df)
+
+
+def read_parquet_players(path=PARQUET_PATH, columns=None):
+    """
+    Read the player Parquet file; files written by convert_csv_to_parquet
+    already carry the schema dtypes, so apply_schema is a no-op for them
+
+    Parameters:
+    path (str): Parquet file to read
+    columns (list or None): Columns to read, None reads all of them
+    """
+    columns = list(columns) if columns is not None else None
+    return apply_schema(pd.read_parquet(path, columns=columns, engine='pyarrow'))
+
+
+def is_partitioned(dataset_dir=DATASET_DIR):
+    """True when the dataset is stored in the Hive-partitioned layout"""
+    return os.path.isdir(dataset_dir)
+
+
+def partition_prune(genres=None, signup_start=None, signup_end=None):
+    """
+    Partition filter for the Hive layout, hashable so it can key caches
+
+    Parameters:
+    genres (list or None): GameGenre values to read; empty reads all
+    signup_start, signup_end (date-like or None): Inclusive SignupDate
+        bounds; only the months they touch are read
+
+    Returns:
+    tuple or None: (partition column, accepted values) pairs, None when
+        nothing is pruned
+    """
+    prune = []
+    if genres:
+        prune.append(('GameGenre', tuple(sorted(genres))))
+    if signup_start is not None or signup_end is not None:
+        months = tuple(None if bound is None else pd.Timestamp(bound).strftime('%Y-%m') for bound in (signup_start, signup_end))
+        prune.append(('SignupMonth', months))
+    return tuple(prune) or None
+
+
+def hive_partition(path, dataset_dir=DATASET_DIR):
+    """Partition values encoded in the directory names of a dataset file"""
+    values = {}
+    for part in os.path.relpath(os.path.dirname(path), dataset_dir).split(os.sep):
+        if '=' in part:
+            key, value = part.split('=', 1)
+            values[key] = unquote(value)
+    return values
+
+
+def _partition_matches(values, prune):
+    for key, accepted in prune or ():
+        value = values.get(key)
+        if value is None:
+            continue
+        if key == 'SignupMonth':
+            # 'YYYY-MM' strings sort chronologically
+            first, last = accepted
+            if (first is not None and value < first) or (last is not None and value > last):
+                return False
+        elif value not in accepted:
+            return False
+    return True
+
+
+def hive_files(dataset_dir=DATASET_DIR, prune=None):
+    """
+    Files of the Hive layout whose partitions pass `prune`, in row order;
+    directories starting with '_' or '.' (e.g. a write in progress) are skipped
+    """
+    files = []
+    for dirpath, dirnames, names in os.walk(dataset_dir):
+        dirnames[:] = [name for name in dirnames if not name.startswith(('_', '.'))]
+        for name in names:
+            path = os.path.join(dirpath, name)
+            if name.endswith('.parquet') and _partition_matches(hive_partition(path, dataset_dir), prune):
+                files.append(path)
+    return sorted(files, key=lambda path: (os.path.basename(path), path))
+
+
+def hive_partition_values(column, dataset_dir=DATASET_DIR):
+    """Distinct values of a partition column, from the directory names only"""
+    return sorted({hive_partition(path, dataset_dir).get(column) for path in hive_files(dataset_dir)} - {None})
+
+
+def hive_column_span(column, dataset_dir=DATASET_DIR):
+    """Smallest and largest value of a column, from the Parquet footers only"""
+    lows, highs = [], []
+    for path in hive_files(dataset_dir):
+        metadata = pq.ParquetFile(path).metadata
+        index = metadata.schema.to_arrow_schema().get_field_index(column)
+        for group in range(metadata.num_row_groups):
+            stats = metadata.row_group(group).column(index).statistics
+            if stats is not None and stats.has_min_max:
+                lows.append(stats.min)
+                highs.append(stats.max)
+    return pd.Timestamp(min(lows)).to_datetime64(), pd.Timestamp(max(highs)).to_datetime64()
+
+
+def read_hive_file(path, columns=None, dataset_dir=DATASET_DIR):
+    """
+    Read one file of the Hive layout, restoring the partition columns
+    (other than the derived SignupMonth) from its directory names
+    """
+    values = {key: value for key, value in hive_partition(path, dataset_dir).items() if key in PLAYER_SCHEMA}
+    file_columns = None if columns is None else [col for col in columns if col not in values]
+    df = pd.read_parquet(path, columns=file_columns, engine='pyarrow')
+    for key, value in values.items():
+        if columns is None or key in columns:
+            df[key] = value
+    order = list(columns) if columns is not None else [col for col in PLAYER_SCHEMA if col in df.columns]
+    df = apply_schema(df[order])
+    # Unordered categoricals compare equal whatever their category order, but
+    # files stored with another order would concatenate into object columns
+    for col in df.columns:
+        dtype = PLAYER_SCHEMA.get(col)
+        if isinstance(dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.set_categories(dtype.categories, ordered=dtype.ordered)
+    return df
+
+
+def read_hive_players(files, columns=None, dataset_dir=DATASET_DIR):
+    """Read and concatenate Hive layout files (see hive_files) into one schema-typed frame"""
+    if not files:
+        names = list(columns) if columns is not None else list(PLAYER_SCHEMA)
+        return apply_schema(pd.DataFrame({col: pd.Series([], dtype=object) for col in names}))
+    return pd.concat([read_hive_file(path, columns, dataset_dir) for path in files], ignore_index=True)
+
+
+def next_hive_batch(dataset_dir=DATASET_DIR):
+    """Batch number after the highest one in the Hive layout's file names"""
+    batches = [int(match.group(1)) for match in (re.match(r'part-(\d+)-', os.path.basename(path)) for path in hive_files(dataset_dir)) if match]
+    return max(batches) + 1 if batches else 0
+
+
+def write_hive_dataset(df, dataset_dir=DATASET_DIR, batch=None):
+    """
+    Write player rows into the Hive layout as one batch of files
+
+    Files are written to a hidden staging directory first and then moved
+    into place in row order, so a reader never sees a half-written file and
+    every move is an append (see refresh.DatasetStore).
+
+    Parameters:
+    df (DataFrame): Schema-typed player rows
+    dataset_dir (str): Root of the layout
+    batch (int or None): Batch number in the file names; None continues
+        after the highest existing batch
+
+    Returns:
+    list: Paths of the files written
+    """
+    if batch is None:
+        batch = next_hive_batch(dataset_dir) if is_partitioned(dataset_dir) else 0
+    staging = os.path.join(dataset_dir, f'_staging-{batch:05d}')
+    table = pa.Table.from_pandas(
+        df.assign(SignupMonth=df['SignupDate'].dt.strftime('%Y-%m'), GameGenre=df['GameGenre'].astype(str)),
+        preserve_index=False
+    )
+    partitioning = ds.partitioning(pa.schema([(col, pa.string()) for col in HIVE_PARTITIONING]), flavor='hive')
+    ds.write_dataset(
+        table, staging, format='parquet', partitioning=partitioning,
+        basename_template=f'part-{batch:05d}-{{i}}.parquet', preserve_order=True
+    )
+    written = []
+    for path in hive_files(staging):
+        target = os.path.join(dataset_dir, os.path.relpath(path, staging))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+        written.append(target)
+    shutil.rmtree(staging)
+    return written
+
+
+def read_csv_tail(path, offset, columns=None):
+    """
+    Read the rows appended to a CSV after byte `offset`
+
+    Only complete lines are read, so a row the writer is still appending
+    is left for the next call.
+
+    Parameters:
+    path (str): CSV file with a header line
+    offset (int): Byte position just after the last row already read
+    columns (list or None): Columns to read, None reads all of them
+
+    Returns:
+    (DataFrame or None, int): The new rows (None if there are none) and
+        the byte position after the last complete line read
+    """
+    with open(path, 'rb') as f:
+        names = pd.read_csv(f, nrows=0).columns.tolist()
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b'\n') + 1
+    if end == 0:
+        return None, offset
+    columns = list(columns) if columns is not None else None
+    date_columns = [c for c in DATE_COLUMNS if columns is None or c in columns]
+    df = pd.read_csv(
+        io.BytesIO(data[:end]), header=None, names=names, usecols=columns,
+        dtype=csv_dtypes(columns), parse_dates=date_columns
+    )
+    return apply_schema(df), offset + end
+
+
+def load_players(columns=None, parquet_path=PARQUET_PATH, csv_path=CSV_PATH, partition_dir=PARTITION_DIR,
+                 dataset_dir=DATASET_DIR, prune=None):
+    """
+    Load the player dataset: the Hive-partitioned layout when present,
+    else the columnar Parquet copy, falling back to the CSV when it has
+    not been converted yet; rows in partition files are appended after
+    the main file's
+
+    Parameters:
+    columns (list or None): Columns to read, None reads all of them
+    parquet_path (str): Columnar copy produced by convert_csv_to_parquet
+    csv_path (str): Original CSV dataset
+    partition_dir (str): Directory of appended partition files
+    dataset_dir (str): Root of the Hive-partitioned layout
+    prune (tuple or None): partition_prune() filter; only the Hive layout
+        can skip partitions, the single-file sources are read in full
+
+    Returns:
+    (DataFrame, dict): The frame and load info (source, version, seconds,
+        memory_mb, rows, columns); the version covers every file, pruned or not
+    """
+    start = time.perf_counter()
+    if is_partitioned(dataset_dir):
+        files = hive_files(dataset_dir)
+        df = read_hive_players([path for path in files if _partition_matches(hive_partition(path, dataset_dir), prune)], columns, dataset_dir)
+        source, path, partitions = 'hive', dataset_dir, files
+    else:
+        source, path = base_file(parquet_path, csv_path)
+        # Missing or stale Parquet copy: read the CSV directly
+        df = read_parquet_players(path, columns) if source == 'parquet' else read_csv_players(path, columns)
+        partitions = partition_files(partition_dir)
+        if partitions:
+            df = pd.concat([df] + [read_parquet_players(p, columns) for p in partitions], ignore_index=True)
+    info = {
+        'source': source,
+        'version': dataset_version(path, partitions),
+        'seconds': time.perf_counter() - start,
+        'memory_mb': frame_memory_mb(df),
+        'rows': len(df),
+        'columns': len(df.columns)
+    }
+    return df, info
+
+
+def convert_csv_to_parquet(csv_path=CSV_PATH, parquet_path=PARQUET_PATH):
+    """
+    One-time conversion of the player CSV into a typed Parquet file
+
+    Returns a dict comparing the CSV and Parquet load time and memory
+    """
+    # Baseline: what the old load path did (plain read_csv + to_datetime)
+    start = time.perf_counter()
+    df_plain = pd.read_csv(csv_path)
+    for col in DATE_COLUMNS:
+        df_plain[col] = pd.to_datetime(df_plain[col])
+    before = {'seconds': time.perf_counter() - start, 'memory_mb': frame_memory_mb(df_plain)}
+    del df_plain
+
+    df = apply_schema(read_csv_players(csv_path), require_all=True)
+    df.to_parquet(parquet_path, engine='pyarrow', index=False)
+
+    start = time.perf_counter()
+    df_columnar = read_parquet_players(parquet_path)
+    after = {'seconds': time.perf_counter() - start, 'memory_mb': frame_memory_mb(df_columnar)}
+    return {'rows': len(df_columnar), 'before': before, 'after': after}
+
+
+def convert_csv_to_hive(csv_path=CSV_PATH, dataset_dir=DATASET_DIR):
+    """
+    One-time conversion of the player CSV into the Hive-partitioned layout
+
+    Returns a dict with the rows, partitions and files written
+    """
+    if is_partitioned(dataset_dir):
+        raise FileExistsError(f"{dataset_dir} already exists; append with write_hive_dataset instead")
+    df = apply_schema(read_csv_players(csv_path), require_all=True)
+    files = write_hive_dataset(df, dataset_dir, batch=0)
+    return {'rows': len(df), 'partitions': len({os.path.dirname(path) for path in files}), 'files': len(files)}
+
+
+if __name__ == "__main__":
+    partitioned = '--partitioned' in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--partitioned']
+    csv_path = args[0] if args else CSV_PATH
+
+    if partitioned:
+        dataset_dir = args[1] if len(args) > 1 else DATASET_DIR
+        report = convert_csv_to_hive(csv_path, dataset_dir)
+        print(f"Converted {report['rows']:,} rows from {csv_path} to {dataset_dir} "
+              f"({report['partitions']} partitions, {report['files']} files)")
+    else:
+        parquet_path = args[1] if len(args) > 1 else PARQUET_PATH
+        report = convert_csv_to_parquet(csv_path, parquet_path)
+        print(f"Converted {report['rows']:,} rows from {csv_path} to {parquet_path}")
+
+        print("\nYükleme Karşılaştırması (Load Comparison):")
+        print("-" * 50)
+        for label, key in [("CSV (önce)", 'before'), ("Parquet (sonra)", 'after')]:
+            stats = report[key]
+            print(f"{label:<16} {stats['seconds']:.3f} sn  {stats['memory_mb']:.1f} MB")
@@ -0,0 +1,27 @@
+import numpy as np
+import scipy.stats as stats
+
+from ab_testing import AB_METRICS, ab_measures, ab_scorecard, adjust_p_values
+from cube import sufficient_stats
+from generate_data import generate_gaming_dataset
+
+
+def test_scorecard_matches_scipy_tests():
+    df = generate_gaming_dataset(4000)
+    scorecard = ab_scorecard(sufficient_stats(df, ['AB_Group', 'Device'], ab_measures()), correction='none')
+    assert len(scorecard) == df['Device'].nunique() * len(AB_METRICS)
+    for row in scorecard.itertuples():
+        players = df[df['Device'] == row.segment]
+        column, kind = AB_METRICS[row.metric][1], AB_METRICS[row.metric][2]
+        a = players.loc[players['AB_Group'] == 'A', column].to_numpy(dtype='float64')
+        b = players.loc[players['AB_Group'] == 'B', column].to_numpy(dtype='float64')
+        if kind == 'mean':
+            expected = stats.ttest_ind(b, a, equal_var=False)
+        else:
+            table = [[a.sum(), len(a) - a.sum()], [b.sum(), len(b) - b.sum()]]
+            expected = stats.chi2_contingency(table)
+        np.testing.assert_allclose(row.statistic, expected.statistic, rtol=1e-6)
+        np.testing.assert_allclose(row.p_value, expected.pvalue, rtol=1e-6, atol=1e-12)
+
+    p_values = scorecard['p_value'].to_numpy()
+    np.testing.assert_allclose(adjust_p_values(p_values, 'bh'), stats.false_discovery_control(p_values, method='bh'))
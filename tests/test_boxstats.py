@@ -0,0 +1,44 @@
+import numpy as np
+
+from boxstats import SKETCH_ACCURACY, BoxCube
+from generate_data import generate_gaming_dataset
+from refresh import BOX_CUBE_COLUMNS
+
+
+def assert_within_sketch_accuracy(sketch, values):
+    for q in [0.05, 0.25, 0.5, 0.75, 0.95]:
+        low = np.quantile(values, q, method='lower') * (1 - SKETCH_ACCURACY)
+        high = np.quantile(values, q, method='higher') * (1 + SKETCH_ACCURACY)
+        assert low <= sketch.quantile(q) <= high
+
+
+def test_merged_sketches_match_quantiles_of_the_selected_rows():
+    df = generate_gaming_dataset(20000)
+    cube = BoxCube(df[BOX_CUBE_COLUMNS])
+    selections = {'Device': ['PC', 'iOS'], 'GameDifficulty': ['Zor', 'Orta']}
+    rows = df[df['Device'].isin(['PC', 'iOS']) & df['GameDifficulty'].isin(['Zor', 'Orta'])]
+    for column in ['PlayTimeHours', 'TotalSpentUSD']:
+        sketches = cube.sketches_by(column, selections)
+        assert set(sketches) == set(rows['GuildMember'])
+        for group, sketch in sketches.items():
+            values = rows.loc[rows['GuildMember'] == group, column].to_numpy()
+            assert sketch.count == len(values)
+            assert_within_sketch_accuracy(sketch, values)
+            # Spenders only
+            assert_within_sketch_accuracy(sketch.positive(), values[values > 0])
+
+
+def test_appended_cube_equals_a_full_build():
+    df = generate_gaming_dataset(6000)
+    # Rows with combinations the first part has no cell for
+    first, rest = df[df['Device'] != 'PC'], df[df['Device'] == 'PC']
+    appended = BoxCube(first[BOX_CUBE_COLUMNS]).append(rest[BOX_CUBE_COLUMNS])
+    full = BoxCube(df[BOX_CUBE_COLUMNS])
+    selections = {'Device': ['PC', 'Android']}
+    for column in full.sketches:
+        expected = full.sketches_by(column, selections)
+        actual = appended.sketches_by(column, selections)
+        assert set(actual) == set(expected)
+        for group in expected:
+            np.testing.assert_array_equal(actual[group].buckets, expected[group].buckets)
+            np.testing.assert_array_equal(actual[group].counts, expected[group].counts)
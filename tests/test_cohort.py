@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from cohort import COHORT_GRAINS, cohort_matrix
+from generate_data import generate_gaming_dataset
+
+
+def baseline_cohorts(df, grain):
+    """The period/groupby computation cohort_matrix replaced"""
+    signup = df['SignupDate'].dt.to_period(grain)
+    age = (df['LastActiveDate'].dt.to_period(grain) - signup).apply(lambda x: x.n if pd.notna(x) else -1)
+    cohorts = pd.DataFrame({'cohort': signup.astype(str), 'age': age, 'PlayerID': df['PlayerID']})[age >= 0]
+    counts = cohorts.groupby(['cohort', 'age'])['PlayerID'].nunique().unstack(fill_value=0)
+    sizes = cohorts.groupby('cohort')['PlayerID'].nunique()
+    return counts.divide(sizes, axis=0) * 100, sizes
+
+
+def test_matrix_matches_the_groupby_baseline():
+    df = generate_gaming_dataset(3000)
+    # Missing dates and activity before signup are left out
+    df.loc[:9, 'LastActiveDate'] = pd.NaT
+    df.loc[10:19, 'LastActiveDate'] = df.loc[10:19, 'SignupDate'] - pd.Timedelta(days=40)
+    for grain in COHORT_GRAINS:
+        retention, sizes = cohort_matrix(df['SignupDate'], df['LastActiveDate'], grain)
+        expected, expected_sizes = baseline_cohorts(df, grain)
+        np.testing.assert_array_equal(sizes.index, expected_sizes.index)
+        np.testing.assert_array_equal(sizes.to_numpy(), expected_sizes.to_numpy())
+        # The baseline has no column for ages no player reached
+        expected = expected.reindex(columns=retention.columns, fill_value=0)
+        np.testing.assert_allclose(retention.to_numpy(), expected.to_numpy())
@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+
+from cube import CUBE_DIMENSIONS, CUBE_MEASURES, PlayerCube, sufficient_stats
+from generate_data import generate_gaming_dataset
+
+
+def test_cells_stay_far_below_the_row_count():
+    df = generate_gaming_dataset(50000)
+    cube = PlayerCube(df)
+    assert len(cube.cells) <= np.prod([df[dim].nunique() for dim in CUBE_DIMENSIONS])
+    assert len(cube.cells) * 5 < len(df)
+
+
+def test_rollup_matches_a_groupby_of_the_selected_rows():
+    df = generate_gaming_dataset(5000)
+    cube = PlayerCube(df)
+    selections = {'Device': ['PC', 'iOS'], 'GameDifficulty': ['Zor']}
+    expected = sufficient_stats(df[df['Device'].isin(['PC', 'iOS']) & (df['GameDifficulty'] == 'Zor')], ['GameGenre'], CUBE_MEASURES)
+    pd.testing.assert_frame_equal(cube.rollup(['GameGenre'], selections), expected, check_dtype=False, check_categorical=False)
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from filter_index import FilterIndex
+from generate_data import generate_gaming_dataset
+
+
+def mask_positions(df, selections, ranges):
+    mask = np.ones(len(df), dtype=bool)
+    for dim, values in selections.items():
+        if values:
+            mask &= df[dim].isin(values).to_numpy()
+    for col, (start, end) in ranges.items():
+        if start is not None:
+            mask &= (df[col] >= start).to_numpy()
+        if end is not None:
+            mask &= (df[col] < end).to_numpy()
+    return np.flatnonzero(mask)
+
+
+def test_positions_match_a_boolean_mask_filter():
+    df = generate_gaming_dataset(5003)
+    index = FilterIndex(df)
+    # Bounds are datetime64, as app.py passes them
+    signup = df['SignupDate'].quantile([0.2, 0.6]).to_numpy()
+    last_active = df['LastActiveDate'].quantile(0.5).to_datetime64()
+    cases = [
+        ({'Device': ['PC', 'iOS']}, {}),
+        # A single value per dimension: a sparse bitmap
+        ({'Device': ['PC'], 'GameGenre': ['Strategy'], 'GameDifficulty': ['Zor'], 'Location': ['Türkiye']}, {}),
+        ({'Device': []}, {'SignupDate': (signup[0], signup[1])}),
+        ({'GameGenre': ['Sports', 'Action RPG']}, {'SignupDate': (signup[0], None), 'LastActiveDate': (None, last_active)}),
+        ({'Device': ['PC']}, {'LastActiveDate': ((df['LastActiveDate'].max() + pd.Timedelta(days=1)).to_datetime64(), None)}),
+    ]
+    for selections, ranges in cases:
+        np.testing.assert_array_equal(index.positions(selections, ranges), mask_positions(df, selections, ranges))
+    assert index.positions({}, {}) is None
+
+    # Appended rows are found like the rows indexed at build time
+    appended = FilterIndex(df.iloc[:3001]).append(df.iloc[3001:].reset_index(drop=True))
+    for selections, ranges in cases:
+        np.testing.assert_array_equal(appended.positions(selections, ranges), mask_positions(df, selections, ranges))
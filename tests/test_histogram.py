@@ -0,0 +1,17 @@
+import numpy as np
+
+from generate_data import generate_gaming_dataset
+from histogram import HISTOGRAM_COLUMNS, HistogramCube
+
+
+def test_append_matches_a_fresh_build():
+    df = generate_gaming_dataset(2000)
+    full = HistogramCube(df)
+    # Same edges as the full build, so the appended rows always fit the bins
+    appended = HistogramCube(df.iloc[:1500], bins=full.bins).append(df.iloc[1500:].reset_index(drop=True))
+
+    assert list(appended.cells.columns) == full.dimensions
+    selections = {'GameGenre': ['Strategy', 'Sports'], 'Device': ['PC']}
+    for column in HISTOGRAM_COLUMNS:
+        np.testing.assert_array_equal(appended.rollup(column, selections), full.rollup(column, selections))
+        np.testing.assert_array_equal(appended.rollup(column), full.rollup(column))
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+import page_metrics
+from cube import PlayerCube
+from generate_data import generate_gaming_dataset
+from histogram import HistogramCube
+from refresh import CUBE_COLUMNS, HISTOGRAM_CUBE_COLUMNS, RETENTION_COLUMNS
+from retention import RetentionTables
+
+
+def test_pre_aggregated_and_row_paths_agree():
+    df = generate_gaming_dataset(5000)
+    selections = {'Device': ['PC', 'iOS'], 'GameGenre': ['Strategy']}
+    rows = df[df['Device'].isin(['PC', 'iOS']) & (df['GameGenre'] == 'Strategy')]
+    # A range spanning every signup date selects the same rows but rules
+    # out the pre-aggregated structures
+    ranges = {'SignupDate': (df['SignupDate'].min(), df['SignupDate'].max())}
+
+    cube = PlayerCube(df[CUBE_COLUMNS])
+    for by in [(), ['EngagementLevel']]:
+        from_rows = page_metrics.grouped_stats(cube, rows, selections, ranges, by, ['TotalSpentUSD'])
+        # The cube rolls up every measure at once
+        from_cube = page_metrics.grouped_stats(cube, rows, selections, {}, by, ['TotalSpentUSD'])[from_rows.columns]
+        pd.testing.assert_frame_equal(from_cube, from_rows, check_dtype=False, check_categorical=False, check_index_type=False)
+
+    histogram_cube = HistogramCube(df[HISTOGRAM_CUBE_COLUMNS])
+    for paying_only in [False, True]:
+        np.testing.assert_array_equal(
+            page_metrics.histogram_counts(histogram_cube, rows, selections, {}, 'TotalSpentUSD', paying_only),
+            page_metrics.histogram_counts(histogram_cube, rows, selections, ranges, 'TotalSpentUSD', paying_only)
+        )
+
+    tables = RetentionTables(df[RETENTION_COLUMNS])
+    expected = page_metrics.retention_rollup(tables, rows, selections, {}, measures=['PlayTimeHours']).mean_curve('PlayTimeHours')
+    # Tables not built yet: computed from the rows
+    actual = page_metrics.retention_rollup(None, rows, selections, {}, measures=['PlayTimeHours']).mean_curve('PlayTimeHours')
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_kpis_of_an_empty_selection_are_zero():
+    df = generate_gaming_dataset(2000)
+    cube = PlayerCube(df[CUBE_COLUMNS])
+    rows = df.iloc[:0]
+    # Date ranges are what can select no rows; they always read the rows
+    ranges = {'LastActiveDate': (df['LastActiveDate'].max(), None)}
+
+    def stats(by=(), measures=()):
+        return page_metrics.grouped_stats(cube, rows, {}, ranges, by, measures)
+
+    overview = page_metrics.overview_kpis(stats)
+    assert (overview['players'], overview['arpu'], overview['retention']) == (0, 0, 0)
+    social = page_metrics.social_kpis(stats)
+    assert (social['players'], social['max_friends'], social['guild_percentage']) == (0, 0, 0)
+    assert page_metrics.achievement_kpis(stats) == (0, 0, 0, 0, 0)
+    revenue = page_metrics.revenue_kpis(stats, rows)
+    assert (revenue['paying_users'], revenue['conversion'], revenue['arppu']) == (0, 0, 0)
+    assert page_metrics.crash_counts(rows).empty
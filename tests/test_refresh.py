@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from generate_data import encode_csv, generate_gaming_dataset
+from refresh import DatasetStore
+from schema import PLAYER_SCHEMA
+
+
+def open_store(tmp_path):
+    return DatasetStore(
+        parquet_path=str(tmp_path / 'players.parquet'), csv_path=str(tmp_path / 'players.csv'),
+        partition_dir=str(tmp_path / 'partitions'), dataset_dir=str(tmp_path / 'players'), watch=False
+    )
+
+
+def test_csv_appends_extend_the_snapshot_in_place(tmp_path):
+    df = generate_gaming_dataset(3000)
+    columns = list(PLAYER_SCHEMA)
+    with open(tmp_path / 'players.csv', 'wb') as f:
+        f.write(encode_csv(df.iloc[:2000], header=True))
+    store = open_store(tmp_path)
+    first = store.snapshot()
+    first_frame = first.frame(columns).copy()
+
+    snapshots = []
+    for start, end in [(2000, 2400), (2400, 3000)]:
+        with open(tmp_path / 'players.csv', 'ab') as f:
+            f.write(encode_csv(df.iloc[start:end], header=False))
+        snapshots.append(store.snapshot())
+    second, third = snapshots
+
+    # Both refreshes were appends, not reloads
+    assert (second.n_rows, second.info['appended']) == (2400, 400)
+    assert (third.n_rows, third.info['appended']) == (3000, 600)
+    # Earlier snapshots still see exactly their own rows
+    pd.testing.assert_frame_equal(first.frame(columns), first_frame)
+    assert len(second.frame(columns)) == 2400
+    # The second append wrote into the buffer the first one extended
+    codes = [snapshot.columns['Device'].cat.codes.to_numpy() for snapshot in (second, third)]
+    assert np.shares_memory(*codes)
+
+    fresh = open_store(tmp_path).snapshot()
+    pd.testing.assert_frame_equal(third.frame(columns), fresh.frame(columns))
+    selections = {'Device': ['PC', 'iOS']}
+    pd.testing.assert_frame_equal(
+        third.cube.rollup(['GameGenre'], selections), fresh.cube.rollup(['GameGenre'], selections), check_categorical=False
+    )
+    assert third.filter_index.positions(selections, {}).tolist() == fresh.filter_index.positions(selections, {}).tolist()
@@ -0,0 +1,13 @@
+import sequential
+from generate_data import generate_gaming_dataset
+from sequential import SequentialMonitor
+
+
+def test_history_is_capped_and_spans_every_player(monkeypatch):
+    monkeypatch.setattr(sequential, 'MAX_HISTORY_POINTS', 50)
+    df = generate_gaming_dataset(30000)
+    monitor = SequentialMonitor()
+    monitor.sync(df, batch_rows=100)
+    history = monitor.p_value_history()
+    assert len(history) <= 50
+    assert history.index[-1] == len(df)
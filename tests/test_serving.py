@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from generate_data import encode_csv, generate_gaming_dataset
+from refresh import DatasetStore
+from schema import PLAYER_SCHEMA
+from serving import SharedDatasetStore, publish_snapshot
+
+
+def test_published_image_attaches_as_the_same_snapshot(tmp_path):
+    df = generate_gaming_dataset(3000)
+    with open(tmp_path / 'players.csv', 'wb') as f:
+        f.write(encode_csv(df.iloc[:2500], header=True))
+    store = DatasetStore(
+        parquet_path=str(tmp_path / 'players.parquet'), csv_path=str(tmp_path / 'players.csv'),
+        partition_dir=str(tmp_path / 'partitions'), dataset_dir=str(tmp_path / 'players'), watch=False
+    )
+    columns = list(PLAYER_SCHEMA)
+    shared_dir = str(tmp_path / 'serving')
+    snapshot = store.snapshot()
+    snapshot.frame(columns)
+    publish_snapshot(snapshot, shared_dir)
+
+    shared = SharedDatasetStore(shared_dir)
+    attached = shared.snapshot()
+    assert (attached.version, attached.n_rows) == (snapshot.version, snapshot.n_rows)
+    pd.testing.assert_frame_equal(attached.frame(columns), snapshot.frame(columns))
+    # Arrays are views of the read-only mapping, not copies
+    assert not attached.columns['PlayTimeHours'].to_numpy().flags.writeable
+
+    selections = {'Device': ['PC', 'iOS']}
+    assert attached.filter_index.positions(selections).tolist() == snapshot.filter_index.positions(selections).tolist()
+    pd.testing.assert_frame_equal(attached.cube.rollup(['GameGenre'], selections), snapshot.cube.rollup(['GameGenre'], selections))
+    np.testing.assert_array_equal(
+        attached.histogram_cube().rollup('TotalSpentUSD', selections), snapshot.histogram_cube().rollup('TotalSpentUSD', selections)
+    )
+    np.testing.assert_array_equal(
+        attached.retention_tables().rollup('Device', selections).players, snapshot.retention_tables().rollup('Device', selections).players
+    )
+    expected = snapshot.box_cube().sketches_by('PlayTimeHours', selections)
+    for group, sketch in attached.box_cube().sketches_by('PlayTimeHours', selections).items():
+        np.testing.assert_array_equal(sketch.counts, expected[group].counts)
+
+    # An appended snapshot published later replaces the attached one
+    with open(tmp_path / 'players.csv', 'ab') as f:
+        f.write(encode_csv(df.iloc[2500:], header=False))
+    appended = store.snapshot()
+    appended.frame(columns)
+    publish_snapshot(appended, shared_dir)
+    assert shared.snapshot().n_rows == 3000
+    pd.testing.assert_frame_equal(shared.snapshot().frame(columns), appended.frame(columns))
@@ -0,0 +1,37 @@
+import pandas as pd
+
+from generate_data import generate_gaming_dataset
+from storage import hive_files, hive_partition, load_players, partition_prune, write_hive_dataset
+
+
+def test_hive_layout_round_trips_and_prunes_partitions(tmp_path):
+    df = generate_gaming_dataset(3000)
+    dataset_dir = str(tmp_path / 'players')
+    # Two batches, like an initial conversion followed by an append
+    write_hive_dataset(df.iloc[:2000], dataset_dir)
+    write_hive_dataset(df.iloc[2000:], dataset_dir)
+
+    def load(prune=None):
+        loaded, info = load_players(
+            parquet_path=str(tmp_path / 'missing.parquet'), csv_path=str(tmp_path / 'missing.csv'),
+            partition_dir=str(tmp_path / 'partitions'), dataset_dir=dataset_dir, prune=prune
+        )
+        assert info['source'] == 'hive'
+        # Rows come back grouped by partition
+        return loaded.sort_values('PlayerID', ignore_index=True)
+
+    expected = df.sort_values('PlayerID', ignore_index=True)
+    pd.testing.assert_frame_equal(load(), expected)
+
+    start, end = df['SignupDate'].quantile([0.3, 0.6])
+    prune = partition_prune(['Strategy', 'Casual'], start, end)
+    files = hive_files(dataset_dir, prune)
+    assert 0 < len(files) < len(hive_files(dataset_dir))
+    for path in files:
+        values = hive_partition(path, dataset_dir)
+        assert values['GameGenre'] in ('Strategy', 'Casual')
+        assert start.strftime('%Y-%m') <= values['SignupMonth'] <= end.strftime('%Y-%m')
+    # Whole partitions are read: every row of the selected genres and signup months
+    months = expected['SignupDate'].dt.strftime('%Y-%m')
+    selected = expected['GameGenre'].isin(['Strategy', 'Casual']) & months.between(start.strftime('%Y-%m'), end.strftime('%Y-%m'))
+    pd.testing.assert_frame_equal(load(prune), expected[selected].reset_index(drop=True))
@@ -0,0 +1,32 @@
+import importlib
+
+# Sidebar page name -> module in this package drawing it. Modules are
+# imported when their page is first opened, so a page's dependencies
+# (scikit-learn, SciPy, ...) load only once it is used, and a rerun runs
+# the selected page's code only.
+PAGE_MODULES = {
+    "Genel Bakış": 'overview',
+    "Oyuncu Analizi": 'players',
+    "Gelir Analizi": 'revenue',
+    "Oturum Analizi": 'sessions',
+    "Başarı Takibi": 'achievements',
+    "Teknik Performans": 'technical',
+    "Sosyal Analiz": 'social',
+    "Kohort Analizi": 'cohorts',
+    "Oyuncu Segmentasyonu": 'segments',
+    "A/B Test Analizi": 'ab_tests'
+}
+
+
+def page_view(page):
+    """
+    Module drawing `page`, imported on first use
+
+    Parameters:
+    page (str): Page name from PAGE_MODULES
+
+    Returns:
+    module: Has COLUMNS, the columns the page reads, and render(ctx),
+        which draws the page from a views.context.PageContext
+    """
+    return importlib.import_module(f'{__name__}.{PAGE_MODULES[page]}')
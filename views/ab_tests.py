@@ -0,0 +1,296 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from agg_cache import AggregateCache
+from ab_testing import AB_METRICS, AB_SEGMENTS, CORRECTIONS, ab_measures, filtered_scorecard, resampling_check
+from sequential import DECISIONS, SequentialMonitor, row_filter
+
+# Columns this page reads besides the sidebar filter columns
+COLUMNS = ['PlayerID', 'AB_Group'] + ab_measures() + list(AB_SEGMENTS)
+
+
+# Sequential monitors kept per process; the least recently viewed filter
+# combination is dropped first and starts over if it is opened again
+MAX_SEQUENTIAL_MONITORS = 32
+
+
+@st.cache_resource
+def get_sequential_monitors():
+    # Sequential A/B monitors by filter combination, shared by every session
+    return AggregateCache(max_entries=MAX_SEQUENTIAL_MONITORS)
+
+
+def render(ctx):
+    """A/B Test Analizi: scorecard, resampling tests and sequential monitoring of the experiment"""
+    st.title("🧪 A/B Test Analizi")
+    st.info("Bu sayfa, A ve B grupları arasındaki metrik farklılıklarını istatistiksel olarak analiz eder.")
+
+    # Ensure AB_Group column exists
+    if 'AB_Group' not in ctx.df_filtered.columns:
+        st.error("Veri setinde 'AB_Group' sütunu bulunamadı. Lütfen 'generate_data.py' betiğini tekrar çalıştırıp veriyi güncelleyin.")
+        st.stop()
+
+    # --- Inputs ----
+    st.subheader("📊 Analiz Edilecek Metrik")
+    # The correction applies to the whole page (every metric and segment is
+    # one test family); the metric below only changes its own fragment
+    correction = st.selectbox(
+        "Çoklu Test Düzeltmesi:",
+        options=list(CORRECTIONS.keys()),
+        format_func=lambda key: CORRECTIONS[key],
+        help="Tüm metrikler birlikte test edildiğinden p-değerleri yanlış pozitiflere karşı düzeltilir."
+    )
+
+    alpha = 0.05 # Significance level
+
+    # --- Data Preparation ---
+    # Every metric is tested at once from per-group sufficient statistics
+    scorecard = ctx.cached_aggregate(
+        ('ab_scorecard', correction),
+        lambda: filtered_scorecard(ctx.grouped_stats, alpha=alpha, correction=correction)
+    )
+
+    if scorecard.empty or (scorecard[['n_a', 'n_b']] == 0).any(axis=None):
+        st.warning("Filtrelenmiş veride A veya B grubunda yeterli kullanıcı bulunmuyor.")
+        st.stop()
+
+    def format_value(value, unit):
+        # '$' leads the number, other units follow it
+        return f"${value:.2f}" if unit == '$' else f"{value:.2f}{unit}"
+
+    # A fragment: picking another metric reruns only its results, read from
+    # the cached scorecard, not the sidebar filters or the tables below
+    @st.fragment
+    def metric_results():
+        # Available metrics for comparison (see ab_testing.AB_METRICS)
+        selected_metric = st.selectbox(
+            "Metrik Seçin:",
+            options=list(AB_METRICS.keys()),
+            format_func=lambda key: AB_METRICS[key][0]
+        )
+        metric_label, metric_column, metric_kind, metric_unit, metric_short = AB_METRICS[selected_metric]
+
+        st.divider()
+
+        # --- Perform Test and Display Results ---
+        st.subheader("📈 Test Sonuçları")
+
+        try:
+            result = scorecard.set_index('metric').loc[selected_metric]
+            p_value = result['p_value']
+            p_adjusted = result['p_adjusted']
+
+            if metric_kind == 'proportion':
+                # Compare rates of a 0/1 flag (e.g. HasPurchased)
+                successes_a = int(round(result['mean_a'] * result['n_a']))
+                successes_b = int(round(result['mean_b'] * result['n_b']))
+                st.metric(label=f"Grup A {metric_short}", value=f"{result['mean_a'] * 100:.2f}%", delta=f"{successes_a:,} / {result['n_a']:,}")
+                st.metric(label=f"Grup B {metric_short}", value=f"{result['mean_b'] * 100:.2f}%", delta=f"{successes_b:,} / {result['n_b']:,}")
+                result_text = f"Chi-kare Testi: p-değeri = {p_value:.4f}"
+                difference = result['diff'] * 100
+                effect_size = result['effect']
+                effect_label = f"Odds Oranı: {effect_size:.2f}" if np.isfinite(effect_size) else "Odds Oranı: Hesaplanamadı"
+                ci_text = f"Fark Güven Aralığı (%): [{result['ci_lower']*100:+.2f}%, {result['ci_upper']*100:+.2f}%]"
+            else:
+                # Compare means (Welch's t-test, unequal variances)
+                st.metric(label=f"Grup A {metric_short}", value=format_value(result['mean_a'], metric_unit), delta=f"Std: {result['std_a']:.2f}")
+                st.metric(label=f"Grup B {metric_short}", value=format_value(result['mean_b'], metric_unit), delta=f"Std: {result['std_b']:.2f}")
+                result_text = f"T-Testi (Welch): p-değeri = {p_value:.4f}"
+                difference = result['diff']
+                d = result['effect']
+                effect_label = f"Cohen's d: {d:.2f}"
+                unit_text = f" ({metric_unit.strip()})" if metric_unit else ""
+                if metric_unit == '$':
+                    ci_text = f"Fark Güven Aralığı ($): [${result['ci_lower']:+.2f}, ${result['ci_upper']:+.2f}]"
+                else:
+                    ci_text = f"Fark Güven Aralığı{unit_text}: [{result['ci_lower']:+.2f}, {result['ci_upper']:+.2f}]"
+
+            # --- Interpretation ---
+            st.subheader("📝 Yorum")
+        
+            # Determine significance on the corrected p-value, since every metric is tested
+            is_significant = p_adjusted < alpha
+        
+            # --- Build Interpretation String ---
+            interpretation = f"**Test Sonucu:** {result_text}. "
+            interpretation += f"Gözlemlenen fark (Grup B - Grup A): **{difference:+.2f}**"
+            interpretation += metric_unit
+            interpretation += ".\n\n"
+            if correction != 'none':
+                interpretation += f"{len(scorecard)} metrik birlikte test edildiği için {CORRECTIONS[correction]} düzeltmesiyle p-değeri **{p_adjusted:.4f}** olur.\n\n"
+        
+            # Explain p-value
+            if is_significant:
+                interpretation += f"p-değeri ({p_adjusted:.4f}), {alpha} anlamlılık seviyesinden küçük olduğu için, bu farkın **istatistiksel olarak anlamlı** olduğunu söyleyebiliriz. Bu, gözlemlenen farkın tamamen şans eseri ortaya çıkma olasılığının düşük olduğu anlamına gelir.\n\n"
+            else:
+                interpretation += f"p-değeri ({p_adjusted:.4f}), {alpha} anlamlılık seviyesinden büyük olduğu için, bu farkın **istatistiksel olarak anlamlı olmadığını** söyleyebiliriz. Gözlemlenen fark şans eseri ortaya çıkmış olabilir.\n\n"
+            
+            # Explain Confidence Interval
+            interpretation += f"**Güven Aralığı (%{ (1-alpha)*100:.0f}):** {ci_text}. Bu aralık, deney tekrarlansa elde edilecek farkın %{ (1-alpha)*100:.0f} olasılıkla düşeceği aralığı tahmin eder.\n\n"
+        
+            # Explain Effect Size
+            interpretation += f"**Etki Büyüklüğü:** {effect_label}. "
+            try:
+                if metric_kind == 'proportion' and np.isfinite(effect_size):
+                     if effect_size > 1:
+                         interpretation += f"Bu, Grup B'deki bir kullanıcının bu olayı gerçekleştirme olasılığının, Grup A'dakine göre yaklaşık **{effect_size:.1f} kat daha fazla** olduğunu gösterir. "
+                     elif effect_size < 1 and effect_size > 0:
+                         interpretation += f"Bu, Grup B'deki bir kullanıcının bu olayı gerçekleştirme olasılığının, Grup A'dakine göre yaklaşık **{1/effect_size:.1f} kat daha az** olduğunu gösterir. "
+                     else:
+                         interpretation += "Gruplar arasında olasılık açısından anlamlı bir fark gözlenmemiştir. "
+                elif metric_kind == 'mean':
+                    abs_d = abs(d)
+                    if abs_d < 0.2:
+                        interpretation += "Bu, etki büyüklüğünün **çok küçük** olduğunu gösterir. "
+                    elif abs_d < 0.5:
+                        interpretation += "Bu, etki büyüklüğünün **küçük** olduğunu gösterir. "
+                    elif abs_d < 0.8:
+                        interpretation += "Bu, etki büyüklüğünün **orta** düzeyde olduğunu gösterir. "
+                    else:
+                        interpretation += "Bu, etki büyüklüğünün **büyük** olduğunu gösterir. "
+            except:
+                 interpretation += "(Etki büyüklüğü yorumlanamadı). " # Fallback
+             
+            # --- Display Interpretation ---
+            if is_significant:
+                st.success(interpretation)
+            else:
+                st.warning(interpretation)
+            
+        except Exception as e:
+            st.error(f"A/B testi analizi sırasında bir hata oluştu: {e}")
+            # The resampling check below compares against `result`
+            return
+
+        # --- Resampling Check ---
+        # Skewed metrics (e.g. TotalSpentUSD, mostly zeros) break the normal
+        # approximation behind the Welch interval, so offer a distribution-free check
+        if st.toggle("Yeniden örnekleme ile doğrula (bootstrap / permütasyon)", help="Normal dağılım varsayımı olmadan güven aralığı ve p-değeri hesaplar."):
+            with st.spinner("Yeniden örnekleme yapılıyor..."):
+                bootstrap, permutation = ctx.cached_aggregate(
+                    ('resampling', selected_metric), lambda: resampling_check(ctx.df_filtered, metric_column, alpha=alpha)
+                )
+            scale = 100 if metric_kind == 'proportion' else 1
+            col1, col2 = st.columns(2)
+            col1.metric(
+                f"Bootstrap %{(1-alpha)*100:.0f} Güven Aralığı",
+                f"[{bootstrap['ci_lower'] * scale:+.2f}, {bootstrap['ci_upper'] * scale:+.2f}]",
+                delta=f"Welch/normal: [{result['ci_lower'] * scale:+.2f}, {result['ci_upper'] * scale:+.2f}]",
+                delta_color='off'
+            )
+            col2.metric(
+                "Permütasyon Testi p-değeri",
+                f"{permutation['p_value']:.4f}",
+                delta=f"{'Chi-kare' if metric_kind == 'proportion' else 'Welch t'}: {result['p_value']:.4f}",
+                delta_color='off'
+            )
+            st.caption(
+                f"Bootstrap {bootstrap['n_resamples']:,} örneklemde"
+                f"{' (aralık yakınsadığı için erken durdu)' if bootstrap['converged'] else ''}, "
+                f"permütasyon testi {permutation['n_resamples']:,} örneklemde"
+                f"{' (karar netleştiği için erken durdu)' if permutation['converged'] else ''} hesaplandı. "
+                "Sonuçlar sabit bir tohumla üretildiği için tekrarlanabilir; p-değeri düzeltilmemiştir."
+            )
+
+    metric_results()
+
+    # --- Experiment Scorecard ---
+    # A fragment: changing the segment breakdown reruns only this table
+    @st.fragment
+    def experiment_scorecard():
+        st.divider()
+        st.subheader("📋 Deney Karnesi (Tüm Metrikler)")
+        segment_dim = st.selectbox(
+            "Segment Kırılımı:",
+            options=[None] + list(AB_SEGMENTS.keys()),
+            format_func=lambda key: "Yok" if key is None else AB_SEGMENTS[key]
+        )
+        segment_scorecard = scorecard
+        if segment_dim is not None:
+            # Every (segment, metric) pair is one test of the corrected family
+            segment_scorecard = ctx.cached_aggregate(
+                ('ab_scorecard', correction, segment_dim),
+                lambda: filtered_scorecard(ctx.grouped_stats, segment_dim, alpha=alpha, correction=correction)
+            )
+
+        def format_diff(row):
+            unit = AB_METRICS[row['metric']][3]
+            scale = 100 if unit == '%' else 1
+            return f"{row['diff'] * scale:+.2f}{unit} [{row['ci_lower'] * scale:+.2f}, {row['ci_upper'] * scale:+.2f}]"
+
+        scorecard_display = pd.DataFrame({
+            'Metrik': segment_scorecard['metric'].map(lambda key: AB_METRICS[key][4]),
+            'Test': segment_scorecard['test'],
+            'Grup A': [format_value(v * 100, '%') if k == 'proportion' else f"{v:.2f}" for v, k in zip(segment_scorecard['mean_a'], segment_scorecard['kind'])],
+            'Grup B': [format_value(v * 100, '%') if k == 'proportion' else f"{v:.2f}" for v, k in zip(segment_scorecard['mean_b'], segment_scorecard['kind'])],
+            'Fark (B - A) [%95 GA]': segment_scorecard.apply(format_diff, axis=1) if len(segment_scorecard) else [],
+            'p-değeri': segment_scorecard['p_value'],
+            'Düzeltilmiş p': segment_scorecard['p_adjusted'],
+            'Etki': [f"{name}: {value:.2f}" for name, value in zip(segment_scorecard['effect_name'], segment_scorecard['effect'])],
+            'Anlamlı': segment_scorecard['significant']
+        })
+        if segment_dim is not None:
+            scorecard_display.insert(0, AB_SEGMENTS[segment_dim], segment_scorecard['segment'])
+            scorecard_display.insert(1, 'Oyuncu (A / B)', [f"{a:,} / {b:,}" for a, b in zip(segment_scorecard['n_a'], segment_scorecard['n_b'])])
+        st.dataframe(
+            scorecard_display.style.format({'p-değeri': '{:.4f}', 'Düzeltilmiş p': '{:.4f}'}),
+            hide_index=True
+        )
+        st.caption(f"Anlamlılık, {CORRECTIONS[correction]} ile düzeltilmiş p-değerine göre α = {alpha} seviyesinde belirlenir.")
+
+    experiment_scorecard()
+
+    # --- Sequential Monitoring ---
+    # A fragment: the toggle and the chart's metric rerun only this section
+    @st.fragment
+    def sequential_monitoring():
+        st.divider()
+        st.subheader("📡 Sıralı İzleme (Canlı Deney)")
+        if st.toggle("Sıralı test modunu aç (mSPRT)", help="Her zaman geçerli p-değerleri: sayfa istenildiği kadar yenilense de yanlış pozitif oranı artmaz."):
+            # The monitor outlives dataset versions: on a refresh only the rows
+            # appended since the last run are folded into its running sums
+            monitor = get_sequential_monitors().get_or_compute(
+                (ctx.snapshot.prune, ctx.filter_key), lambda: SequentialMonitor(alpha=alpha)
+            )
+            new_rows = monitor.sync(ctx.df, row_filter(ctx.filter_selections, ctx.filter_ranges))
+            sequential = monitor.summary(correction)
+            st.caption(f"Bu yenilemede {new_rows:,} yeni satır işlendi · Toplam {int(monitor.n.sum()):,} oyuncu izleniyor.")
+
+            sequential_display = pd.DataFrame({
+                'Metrik': sequential['metric'].map(lambda key: AB_METRICS[key][4]),
+                'Oyuncu (A / B)': [f"{a:,} / {b:,}" for a, b in zip(sequential['n_a'], sequential['n_b'])],
+                'Fark (B - A)': [
+                    f"{diff * 100:+.2f}%" if AB_METRICS[key][2] == 'proportion' else f"{diff:+.2f}"
+                    for key, diff in zip(sequential['metric'], sequential['diff'])
+                ],
+                'Olabilirlik Oranı': sequential['likelihood_ratio'],
+                'Her Zaman Geçerli p': sequential['p_value'],
+                'Düzeltilmiş p': sequential['p_adjusted'],
+                'Karar': sequential['decision'].map(DECISIONS)
+            })
+            st.dataframe(
+                sequential_display.style.format({'Olabilirlik Oranı': '{:.3g}', 'Her Zaman Geçerli p': '{:.4f}', 'Düzeltilmiş p': '{:.4f}'}),
+                hide_index=True
+            )
+
+            p_history = monitor.p_value_history()
+            if not p_history.empty:
+                history_metric = st.selectbox(
+                    "Grafik Metriği:",
+                    options=list(AB_METRICS.keys()),
+                    format_func=lambda key: AB_METRICS[key][0]
+                )
+                fig_sequential = px.line(
+                    p_history[history_metric].reset_index(),
+                    x='Oyuncu Sayısı',
+                    y=history_metric,
+                    log_y=True,
+                    title=f"Her Zaman Geçerli p-Değeri: {AB_METRICS[history_metric][4]}",
+                    labels={history_metric: 'p-değeri'}
+                )
+                fig_sequential.add_hline(y=alpha, line_dash='dash', line_color='red', annotation_text=f"α = {alpha}")
+                ctx.plotly_chart(fig_sequential, use_container_width=True)
+
+    sequential_monitoring()
@@ -0,0 +1,46 @@
+import streamlit as st
+
+import page_metrics
+from histogram import histogram_figure
+
+# Columns this page reads besides the sidebar filter columns
+COLUMNS = ['AchievementsUnlocked']
+
+
+def render(ctx):
+    """Başarı Takibi: achievement statistics and their distribution"""
+    st.title("🏆 Başarı Takibi")
+    
+    # Achievement metrics
+    col1, col2 = st.columns(2)
+    
+    total_users_ach, ach_unlocked_sum, avg_ach, max_ach, completion_rate = ctx.cached_aggregate(
+        'achievement_kpis', lambda: page_metrics.achievement_kpis(ctx.grouped_stats)
+    )
+
+    with col1:
+        st.metric(
+            "Ortalama Başarı",
+            f"{avg_ach:.1f}",
+            f"Maks: {max_ach}"
+        )
+    
+    with col2:
+        st.metric(
+            "Tamamlama Oranı (%)", # Clarified unit
+            f"{completion_rate:.1f}%", 
+            f"Toplam Açılan: {ach_unlocked_sum:,}",
+            help=f"Açılan toplam başarıların, oyuncu başına {page_metrics.MAX_ACHIEVEMENTS} başarı varsayımıyla mümkün olan maksimum başarı sayısına oranı."
+        )
+
+    # Achievement distribution
+    st.subheader("🎯 Başarı Dağılımı")
+    if total_users_ach > 0:
+        fig_ach_hist = histogram_figure(
+            *ctx.filtered_histogram('AchievementsUnlocked'),
+            title="Açılan Başarı Sayısı Dağılımı",
+            x_title='Başarı Sayısı'
+        )
+        ctx.plotly_chart(fig_ach_hist, use_container_width=True)
+    else:
+        st.info("Başarı dağılımı için veri yok.")
@@ -0,0 +1,71 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+import page_metrics
+from cohort import COHORT_GRAINS
+
+# Columns this page reads besides the sidebar filter columns
+COLUMNS = ['LastActiveDate']
+
+
+def render(ctx):
+    """Kohort Analizi: signup cohort sizes and their retention by period"""
+    # The whole page is one chart driven by the period radio: as a fragment,
+    # switching the period reruns only the cohort matrix and heatmap
+    @st.fragment
+    def cohort_view():
+        grain = st.radio(
+            "Kohort Periyodu",
+            options=list(COHORT_GRAINS),
+            index=1,
+            format_func=lambda key: COHORT_GRAINS[key][0],
+            horizontal=True
+        )
+        grain_label, cohort_name, period_name, cohort_title = COHORT_GRAINS[grain]
+        st.title(f"⏳ Kohort Analizi ({grain_label} Tutundurma)")
+        st.info("Bu analiz, oyuncuların kayıt dönemlerine göre zaman içinde ne kadar süre aktif kaldıklarını gösterir.")
+
+        # --- Cohort Calculation ---
+        try:
+            # Cohort and age are integer period arithmetic on the date columns,
+            # counted with a single bincount (see cohort.py)
+            cohort_retention, cohort_size = ctx.cached_aggregate(('cohort', grain), lambda: page_metrics.cohorts(ctx.df_filtered, grain))
+
+            if cohort_retention.empty:
+                 st.warning("Filtrelenen verilerle kohort analizi oluşturulamadı (veri yok veya geçersiz tarih)." )
+            else:
+                # --- Display Heatmap ---
+                st.subheader(f"🗓️ {grain_label} Tutundurma Oranları (%)")
+            
+                # Limit the number of periods shown for readability
+                max_periods_to_show = {'D': 60, 'W': 20, 'M': 12}[grain]
+                cohort_retention_display = cohort_retention.iloc[:, :max_periods_to_show]
+            
+                fig_cohort = go.Figure(data=go.Heatmap(
+                    z=cohort_retention_display.values,
+                    x=cohort_retention_display.columns,
+                    y=cohort_retention_display.index,
+                    colorscale='Viridis', 
+                    colorbar=dict(title='% Aktif Oyuncu'),
+                    hoverongaps=False,
+                    text=cohort_retention_display.round(1).astype(str) + '%', # Show percentage on hover
+                    texttemplate="%{text}",
+                    hoverinfo='x+y+z'
+                ))
+            
+                fig_cohort.update_layout(
+                    title=f'{grain_label} Kohortlara Göre Oyuncu Tutundurma',
+                    xaxis_title=f'Kayıttan Sonraki {period_name} Numarası',
+                    yaxis_title=cohort_title,
+                    yaxis={'type': 'category', 'categoryorder':'category descending'} # Correct value
+                )
+                ctx.plotly_chart(fig_cohort, use_container_width=True)
+            
+                st.subheader("👥 Kohort Büyüklükleri")
+                st.dataframe(cohort_size.reset_index().sort_values(cohort_name, ascending=False))
+
+        except Exception as e:
+            st.error(f"Kohort analizi sırasında bir hata oluştu: {e}")
+            st.warning("Lütfen veri dosyasındaki tarih formatlarını kontrol edin.")
+
+    cohort_view()
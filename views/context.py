@@ -0,0 +1,98 @@
+import streamlit as st
+
+import page_metrics
+from profiling import stage_name
+from render import stratified_sample
+
+GUILD_NAMES = {False: 'Üye Değil', True: 'Üye'}
+
+
+class PageContext:
+    """
+    What a page reads from the rerun drawing it: the snapshot and frame,
+    the sidebar's filters and chart mode, plus helpers answering page
+    aggregates from the shared cache, the cubes or the filtered rows
+
+    Everything here is shared with other sessions or reruns: pages must
+    not mutate the frames they are handed.
+    """
+
+    def __init__(self, page, snapshot, df, df_filtered, filter_selections, filter_ranges, filter_key,
+                 exact_charts, aggregate_cache, profiler):
+        self.page = page
+        self.snapshot = snapshot
+        # Built from the cube columns only at load time and extended with
+        # each appended batch of rows
+        self.cube = snapshot.cube
+        self.df = df
+        self.df_filtered = df_filtered
+        self.filter_selections = filter_selections
+        self.filter_ranges = filter_ranges
+        self.filter_key = filter_key
+        self.exact_charts = exact_charts
+        self.aggregate_cache = aggregate_cache
+        self.profiler = profiler
+        # Plotly charts are serialised to JSON here, timed on their own when profiling
+        self.plotly_chart = profiler.timed("Grafik serileştirme", st.plotly_chart)
+
+    def grouped_stats(self, by=(), measures=()):
+        """Sufficient statistics of the filtered players, rolled up from the cube when the filters allow it"""
+        return page_metrics.grouped_stats(self.cube, self.df_filtered, self.filter_selections, self.filter_ranges, by, measures)
+
+    def cached_aggregate(self, metric, compute):
+        """Page aggregate from the shared cache; computed once per dataset version, filter combination and metric"""
+        return self.profiler.cached(
+            self.aggregate_cache, (self.snapshot.version, self.filter_key, self.page, metric), compute,
+            f"Hesaplama: {stage_name(metric)}"
+        )
+
+    def filtered_histogram(self, column, paying_only=False):
+        """Bins and bin counts of `column` for the filtered players, summed from the histogram cube when the filters allow it"""
+        histogram_cube = self.snapshot.histogram_cube()
+        return histogram_cube.bins[column], self.cached_aggregate(
+            ('histogram', column, paying_only),
+            lambda: page_metrics.histogram_counts(
+                histogram_cube, self.df_filtered, self.filter_selections, self.filter_ranges, column, paying_only
+            )
+        )
+
+    def filtered_retention(self, segment=None, measures=(), survival=False):
+        """
+        Day tables of the filtered players by `segment` (see
+        retention.RetentionRollup), summed from the snapshot's retention
+        tables when the filters allow it
+        """
+        def compute():
+            # The tables are built on first use, which a date range never needs
+            tables = None if self.filter_ranges else self.snapshot.retention_tables()
+            return page_metrics.retention_rollup(
+                tables, self.df_filtered, self.filter_selections, self.filter_ranges, segment, measures, survival
+            )
+
+        return self.cached_aggregate(('retention', segment, tuple(measures), survival), compute)
+
+    def guild_box_summaries(self, metric, column, positive_only=False):
+        """
+        Box-plot statistics of `column` per GuildMember for the filtered
+        players (values above zero only with `positive_only`), merged from
+        the box cube's sketches unless the filters or exact mode need the rows
+        """
+        def compute():
+            # The cube is built on first use, which a date range or exact mode never needs;
+            # its quartiles are within boxstats.SKETCH_ACCURACY of the exact ones
+            exact = self.exact_charts or bool(self.filter_ranges)
+            box_cube = None if exact else self.snapshot.box_cube()
+            return page_metrics.box_summaries(
+                box_cube, self.df_filtered, self.filter_selections, self.filter_ranges, column, positive_only, exact
+            )
+
+        return self.cached_aggregate(('box', metric, self.exact_charts), compute)
+
+    def scatter_points(self, metric, frame, by=None):
+        """Rows a scatter plot draws: every row in exact mode, else a bounded sample stratified by `by`"""
+        if self.exact_charts:
+            return frame
+        points = self.cached_aggregate(('scatter_sample', metric), lambda: stratified_sample(frame, by))
+        if len(points) < len(frame):
+            st.caption(f"{len(frame):,} oyuncudan {len(points):,} tanesi gösteriliyor (tabakalı örneklem).")
+        return points
@@ -0,0 +1,119 @@
+import plotly.express as px
+import streamlit as st
+
+import page_metrics
+from retention import RETENTION_SEGMENTS, survival_figure
+
+# Columns this page reads besides the sidebar filter columns
+COLUMNS = ['IsActive', 'TotalSpentUSD', 'PlayTimeHours', 'SessionsPerWeek', 'EngagementLevel', 'DaysSinceSignup']
+
+
+def render(ctx):
+    """Genel Bakış: headline KPIs, genre and engagement mix, and the retention and survival curves"""
+    st.title("📊 Genel Bakış")
+    
+    # Key metrics
+    kpis = ctx.cached_aggregate('kpis', lambda: page_metrics.overview_kpis(ctx.grouped_stats))
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            "Toplam Oyuncu",
+            f"{kpis['players']:,}",
+            f"Aktif: {kpis['active']:,}"
+        )
+    
+    with col2:
+        revenue = kpis['revenue']
+        arpu = kpis['arpu']
+        st.metric(
+            "Toplam Gelir",
+            f"${revenue:,.2f}",
+            f"ARPU: ${arpu:.2f}"
+        )
+    
+    with col3:
+        avg_playtime = kpis['avg_playtime']
+        st.metric(
+            "Ort. Oynama Süresi",
+            f"{avg_playtime:.1f} saat",
+            f"Haftalık: {kpis['avg_sessions']:.1f} oturum"
+        )
+    
+    with col4:
+        retention = kpis['retention']
+        st.metric(
+            "Tutundurma Oranı",
+            f"%{retention:.1f}",
+            f"Aktif: {kpis['active']:,} oyuncu"
+        )
+
+    # Charts
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("🎮 Oyun Türü Dağılımı")
+        genre_dist = ctx.cached_aggregate('genre_dist', lambda: page_metrics.player_counts(ctx.grouped_stats, 'GameGenre'))
+        fig = px.pie(
+            values=genre_dist.values,
+            names=genre_dist.index,
+            title="Oyun Türlerine Göre Oyuncu Dağılımı"
+        )
+        ctx.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("📈 Katılım Seviyesi")
+        engagement_dist = ctx.cached_aggregate('engagement_dist', lambda: page_metrics.player_counts(ctx.grouped_stats, 'EngagementLevel'))
+        fig = px.bar(
+            x=engagement_dist.index,
+            y=engagement_dist.values,
+            title="Katılım Seviyesi Dağılımı",
+            labels={'x': 'Seviye', 'y': 'Oyuncu Sayısı'}
+        )
+        ctx.plotly_chart(fig, use_container_width=True)
+
+    # Player retention curve
+    # A fragment: changing its segmentation reruns only this chart, not the
+    # sidebar filters, the KPI tiles or the other charts
+    @st.fragment
+    def retention_curve():
+        st.subheader("📉 Oyuncu Tutundurma Eğrisi")
+    
+        # Add segmentation option
+        selected_segment_label = st.selectbox(
+            "Tutundurma Eğrisini Şuna Göre Segmentle:", 
+            options=list(RETENTION_SEGMENTS.keys()),
+            index=0 # Default to 'Genel'
+        )
+        segment_column = RETENTION_SEGMENTS[selected_segment_label]
+
+        # Both curves are read from the same (segment x day) count tables,
+        # summed over the selected cells (see retention.py)
+        retention_data, survival_data = page_metrics.retention_curves(ctx.filtered_retention, segment_column)
+        if segment_column:
+            title = f"Günlük Tutundurma Oranı ({selected_segment_label} Göre)"
+        else:
+            title = "Günlük Tutundurma Oranı (Genel)"
+        
+        fig_retention = px.line(
+            retention_data,
+            x='DaysSinceSignup',
+            y='IsActive',
+            color=segment_column, # Use segment column for color if selected
+            labels={'DaysSinceSignup': 'Kayıttan Sonra Geçen Gün', 'IsActive': 'Tutundurma Oranı (%)'},
+            title=title
+        )
+        ctx.plotly_chart(fig_retention, use_container_width=True)
+
+        # Kaplan–Meier: share of players not yet churned by days since
+        # signup; players still active are censored at their current tenure
+        st.subheader("⏳ Hayatta Kalma Eğrisi (Kaplan–Meier)")
+        fig_survival = survival_figure(
+            survival_data,
+            segment_column,
+            title=f"Oyuncu Hayatta Kalma Oranı ({selected_segment_label})"
+        )
+        ctx.plotly_chart(fig_survival, use_container_width=True)
+        st.caption("Gölgeli alanlar Greenwood varyansıyla hesaplanan %95 güven aralığıdır; henüz aktif olan oyuncular kayıt süreleri itibarıyla sansürlenir.")
+
+    retention_curve()
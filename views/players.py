@@ -0,0 +1,53 @@
+import plotly.express as px
+import streamlit as st
+
+import page_metrics
+from histogram import histogram_figure
+
+# Columns this page reads besides the sidebar filter columns
+COLUMNS = ['Age', 'Gender', 'PlayTimeHours', 'PlayerLevel', 'EngagementLevel', 'AchievementsUnlocked', 'TotalSpentUSD']
+
+
+def render(ctx):
+    """Oyuncu Analizi: age and gender mix and engagement against play time and level"""
+    st.title("👥 Oyuncu Analizi")
+    
+    # Player demographics
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("📊 Yaş Dağılımı")
+        fig = histogram_figure(
+            *ctx.filtered_histogram('Age'),
+            title="Oyuncu Yaş Dağılımı",
+            x_title='Yaş'
+        )
+        ctx.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("👥 Cinsiyet Dağılımı")
+        gender_dist = ctx.cached_aggregate('gender_dist', lambda: page_metrics.gender_counts(ctx.df_filtered))
+        fig = px.pie(
+            values=gender_dist.values,
+            names=gender_dist.index,
+            title="Cinsiyet Dağılımı"
+        )
+        ctx.plotly_chart(fig, use_container_width=True)
+
+    # Player engagement analysis
+    st.subheader("🎯 Oyuncu Katılımı Analizi")
+    fig = px.scatter(
+        ctx.scatter_points('playtime_level', ctx.df_filtered, by='EngagementLevel'),
+        x='PlayTimeHours',
+        y='PlayerLevel',
+        color='EngagementLevel',
+        size='AchievementsUnlocked',
+        hover_data=['TotalSpentUSD'],
+        title="Oynama Süresi vs Seviye",
+        labels={
+            'PlayTimeHours': 'Oynama Süresi (Saat)',
+            'PlayerLevel': 'Oyuncu Seviyesi',
+            'EngagementLevel': 'Katılım Seviyesi'
+        }
+    )
+    ctx.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,90 @@
+import plotly.express as px
+import streamlit as st
+
+import page_metrics
+from histogram import histogram_figure
+
+# Columns this page reads besides the sidebar filter columns
+COLUMNS = ['HasPurchased', 'TotalSpentUSD', 'EngagementLevel']
+
+
+def render(ctx):
+    """Gelir Analizi: revenue by segment and the spend distribution of paying players"""
+    st.title("💰 Gelir Analizi")
+    
+    # Revenue metrics
+    col1, col2, col3 = st.columns(3)
+    
+    revenue_kpis = ctx.cached_aggregate('revenue_kpis', lambda: page_metrics.revenue_kpis(ctx.grouped_stats, ctx.df_filtered))
+    paying_users = revenue_kpis['paying_users']
+    conversion = revenue_kpis['conversion']
+    arppu = revenue_kpis['arppu']
+    ltv = revenue_kpis['ltv']
+    median_ltv = revenue_kpis['median_ltv']
+    total_revenue = revenue_kpis['total_revenue']
+    
+    with col1:
+        st.metric(
+            "Ödeme Yapan Oyuncular",
+            f"{paying_users:,}",
+            f"Dönüşüm: {conversion:.1f}%"
+        )
+    
+    with col2:
+        st.metric(
+            "ARPPU",
+            f"${arppu:.2f}",
+            f"Toplam: ${total_revenue:,.2f}",
+            help="Ortalama Ödeme Yapan Kullanıcı Başına Gelir (Average Revenue Per Paying User)"
+        )
+    
+    with col3:
+        st.metric(
+            "Ortalama LTV",
+            f"${ltv:.2f}",
+            f"Medyan: ${median_ltv:.2f}",
+            help="Ortalama Oyuncu Yaşam Boyu Değeri (Lifetime Value) - Mevcut verilerle oyuncu başına ortalama gelir olarak hesaplanmıştır."
+        )
+
+    st.divider()
+    st.subheader("📊 Gelir Segmentasyonu")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Revenue by Device
+        revenue_by_device = ctx.cached_aggregate('revenue_by_device', lambda: page_metrics.revenue_by_device(ctx.grouped_stats))
+        fig_dev = px.bar(
+            revenue_by_device,
+            x='Device',
+            y='TotalSpentUSD',
+            title="Cihaza Göre Ortalama Harcama",
+            labels={'Device': 'Cihaz', 'TotalSpentUSD': 'Ortalama Harcama ($)'}
+        )
+        ctx.plotly_chart(fig_dev, use_container_width=True)
+
+    with col2:
+        # Revenue by Engagement Level, in level order
+        revenue_by_engagement = ctx.cached_aggregate('revenue_by_engagement', lambda: page_metrics.revenue_by_engagement(ctx.grouped_stats))
+       
+        fig_eng = px.bar(
+            revenue_by_engagement,
+            x='EngagementLevel',
+            y='TotalSpentUSD',
+            title="Etkileşim Seviyesine Göre Ortalama Harcama",
+            labels={'EngagementLevel': 'Etkileşim Seviyesi', 'TotalSpentUSD': 'Ortalama Harcama ($)'}
+        )
+        ctx.plotly_chart(fig_eng, use_container_width=True)
+
+    st.divider()
+    st.subheader("💵 Ödeme Yapan Oyuncu Harcama Dağılımı")
+    # Revenue distribution for paying users
+    if paying_users > 0:
+        fig_dist_paying = histogram_figure(
+            *ctx.filtered_histogram('TotalSpentUSD', paying_only=True),
+            title="Ödeme Yapan Oyuncu Başına Harcama Dağılımı",
+            x_title='Toplam Harcama ($)'
+        )
+        ctx.plotly_chart(fig_dist_paying, use_container_width=True)
+    else:
+        st.info("Filtrelenen veride ödeme yapan oyuncu bulunmamaktadır.")
@@ -0,0 +1,74 @@
+import plotly.express as px
+import streamlit as st
+
+from segmentation import SEGMENT_FEATURES, load_or_fit_segment_model
+from storage import load_players
+
+# Columns this page reads besides the sidebar filter columns
+COLUMNS = ['PlayerID', 'PlayTimeHours', 'TotalSpentUSD', 'SessionsPerWeek', 'AchievementsUnlocked', 'AvgSessionDurationMinutes', 'FriendsCount']
+
+
+@st.cache_resource
+def load_segment_model(dataset_version, _snapshot):
+    # Loaded from models/ when saved for this dataset version, else fitted
+    # on every player and saved there. Every player is in the snapshot
+    # unless it is scoped to some partitions (a shared image never is);
+    # only then are the features read from the data files
+    def load_frame():
+        if _snapshot.prune is None:
+            return _snapshot.frame(SEGMENT_FEATURES)
+        return load_players(SEGMENT_FEATURES)[0]
+
+    return load_or_fit_segment_model(dataset_version, load_frame)
+
+
+def render(ctx):
+    """Oyuncu Segmentasyonu: K-Means segments of the filtered players"""
+    st.title("🧩 Oyuncu Segmentasyonu (K-Means)")
+    st.info("Bu sayfa, oyuncuları davranışsal metriklerine göre (oynama süresi, harcama, oturumlar, başarılar) gruplara ayırır.")
+
+    if len(ctx.df_filtered) == 0:
+        st.warning("Segmentasyon için yeterli oyuncu verisi yok. Lütfen filtreleri genişletin.")
+    else:
+        # The model is fitted once per base dataset version on every player;
+        # appended rows and the filtered players are only assigned to its clusters
+        segment_model = load_segment_model(ctx.snapshot.base_version, ctx.snapshot)
+        features = segment_model.features
+        # A shallow copy: the Segment column is added without copying the player columns
+        df_filtered_clustered = ctx.df_filtered.copy(deep=False)
+        df_filtered_clustered['Segment'] = ctx.cached_aggregate('segments', lambda: segment_model.segments(ctx.df_filtered))
+        
+        st.subheader("📊 Segmentlerin Görselleştirilmesi")
+
+        # Visualize clusters (Example: PlayTime vs Spending)
+        fig_cluster_scatter = px.scatter(
+            ctx.scatter_points('segments', df_filtered_clustered, by='Segment'),
+            x='PlayTimeHours',
+            y='TotalSpentUSD',
+            color='Segment',
+            size='SessionsPerWeek', # Optional: Size by another metric
+            hover_data=['PlayerID', 'AchievementsUnlocked'],
+            title="Oyuncu Segmentleri (Oynama Süresi vs Harcama)",
+            labels={
+                'PlayTimeHours': 'Oynama Süresi (Saat)',
+                'TotalSpentUSD': 'Toplam Harcama ($)',
+                'Segment': 'Segment'
+            }
+        )
+        ctx.plotly_chart(fig_cluster_scatter, use_container_width=True)
+
+        st.subheader("📈 Segment Özellikleri")
+        # Show summary statistics per cluster
+        cluster_summary = df_filtered_clustered.groupby('Segment', observed=True)[features].mean().reset_index()
+        st.dataframe(cluster_summary)
+        
+        st.subheader("👥 Segment Dağılımı")
+        segment_dist = df_filtered_clustered['Segment'].value_counts().reset_index()
+        segment_dist.columns = ['Segment', 'Oyuncu Sayısı']
+        fig_segment_pie = px.pie(
+            segment_dist, 
+            values='Oyuncu Sayısı', 
+            names='Segment', 
+            title='Oyuncu Sayısı Dağılımı'
+        )
+        ctx.plotly_chart(fig_segment_pie, use_container_width=True)
@@ -0,0 +1,66 @@
+import plotly.express as px
+import streamlit as st
+
+import page_metrics
+from boxstats import box_figure
+from histogram import histogram_figure
+from views.context import GUILD_NAMES
+
+# Columns this page reads besides the sidebar filter columns
+COLUMNS = ['SessionsPerWeek', 'AvgSessionDurationMinutes', 'DaysSinceSignup', 'PlayTimeHours', 'GuildMember']
+
+
+def render(ctx):
+    """Oturum Analizi: session frequency and length, engagement over time and session length by guild membership"""
+    st.title("⏱️ Oturum Analizi")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("📊 Haftalık Oturum Dağılımı")
+        fig = histogram_figure(
+            *ctx.filtered_histogram('SessionsPerWeek'),
+            title="Haftalık Oturum Sayısı",
+            x_title='Oturum/Hafta'
+        )
+        ctx.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("⌛ Oturum Süresi Dağılımı")
+        fig = histogram_figure(
+            *ctx.filtered_histogram('AvgSessionDurationMinutes'),
+            title="Ortalama Oturum Süresi",
+            x_title='Dakika'
+        )
+        ctx.plotly_chart(fig, use_container_width=True)
+
+    st.divider()
+    st.subheader("📈 Zaman İçinde ve Gruplara Göre Etkileşim")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Playtime over Days Since Signup
+        st.subheader("⏳ Kayıttan Beri Geçen Süreye Göre Oynama")
+        playtime_over_time = page_metrics.playtime_by_tenure(ctx.filtered_retention)
+        fig_playtime_time = px.line(
+            playtime_over_time,
+            x='DaysSinceSignup',
+            y='PlayTimeHours',
+            title="Ortalama Oynama Süresi vs Kayıttan Beri Geçen Gün",
+            labels={'DaysSinceSignup': 'Kayıttan Beri Geçen Gün', 'PlayTimeHours': 'Ortalama Oynama Süresi (Saat)'}
+        )
+        ctx.plotly_chart(fig_playtime_time, use_container_width=True)
+
+    with col2:
+        # Session Duration by Guild Membership
+        st.subheader("🛡️ Lonca Üyeliğine Göre Oturum Süresi")
+        # Quartiles and whiskers are computed here; only capped outliers are sent as points
+        fig_guild_session = box_figure(
+            ctx.guild_box_summaries('guild_session', 'AvgSessionDurationMinutes'),
+            title="Lonca Üyeliğine Göre Ortalama Oturum Süresi",
+            x_title='Lonca Üyesi',
+            y_title='Ortalama Oturum Süresi (Dakika)',
+            names=GUILD_NAMES
+        )
+        ctx.plotly_chart(fig_guild_session, use_container_width=True)
@@ -0,0 +1,110 @@
+import plotly.express as px
+import streamlit as st
+
+import page_metrics
+from boxstats import box_figure
+from histogram import histogram_figure
+from render import MAX_SCATTER_POINTS, add_trendline, density_figure
+from views.context import GUILD_NAMES
+
+# Columns this page reads besides the sidebar filter columns
+COLUMNS = ['FriendsCount', 'GuildMember', 'PlayTimeHours', 'TotalSpentUSD']
+
+
+def render(ctx):
+    """Sosyal Analiz: friend counts, guild membership and their relation to engagement and spend"""
+    st.title("🤝 Sosyal Analiz")
+    # st.warning("Bu sayfa henüz geliştirilme aşamasındadır.")
+    
+    # Key metrics
+    social_kpis = ctx.cached_aggregate('social_kpis', lambda: page_metrics.social_kpis(ctx.grouped_stats))
+    col1, col2 = st.columns(2)
+    with col1:
+        avg_friends = social_kpis['avg_friends']
+        st.metric(
+            "Ortalama Arkadaş Sayısı",
+            f"{avg_friends:.1f}",
+            f"Maks: {social_kpis['max_friends']}"
+        )
+    with col2:
+        guild_members = social_kpis['guild_members']
+        guild_percentage = social_kpis['guild_percentage']
+        st.metric(
+            "Lonca Üyeleri",
+            f"{guild_members:,}",
+            f"%{guild_percentage:.1f} oyuncu"
+        )
+        
+    # Charts
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("🧑‍🤝‍🧑 Arkadaş Sayısı Dağılımı")
+        fig = histogram_figure(
+            *ctx.filtered_histogram('FriendsCount'),
+            title="Oyuncu Başına Arkadaş Sayısı",
+            x_title='Arkadaş Sayısı'
+        )
+        ctx.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("🛡️ Lonca Üyelik Durumu")
+        guild_dist = ctx.cached_aggregate('guild_dist', lambda: page_metrics.guild_counts(ctx.grouped_stats))
+        fig = px.pie(
+            values=guild_dist.values,
+            names=guild_dist.index,
+            title="Lonca Üyeliği Dağılımı",
+            color_discrete_map={'Üye':'#1f77b4', 'Üye Değil':'#ff7f0e'} # Optional: Custom colors
+        )
+        ctx.plotly_chart(fig, use_container_width=True)
+        
+    # Engagement by Social Factors
+    st.subheader("📈 Sosyal Faktörlere Göre Etkileşim ve Harcama")
+    
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Box plot for PlayTimeHours by GuildMember (Existing)
+        fig_guild_playtime = box_figure(
+            ctx.guild_box_summaries('guild_playtime', 'PlayTimeHours'),
+            title="Lonca Üyeliğine Göre Oynama Süresi",
+            x_title='Lonca Üyesi',
+            y_title='Oynama Süresi (Saat)',
+            names=GUILD_NAMES
+        )
+        ctx.plotly_chart(fig_guild_playtime, use_container_width=True)
+    
+    with col2:
+        # Box plot for Spending by GuildMember (New)
+        st.subheader("💰 Lonca Üyeliğine Göre Harcama")
+        fig_guild_spending = box_figure(
+            # Only look at spenders for distribution
+            ctx.guild_box_summaries('guild_spending', 'TotalSpentUSD', positive_only=True),
+            title="Lonca Üyeliğine Göre Harcama (Ödeme Yapanlar)",
+            x_title='Lonca Üyesi',
+            y_title='Toplam Harcama ($)',
+            names=GUILD_NAMES
+        )
+        ctx.plotly_chart(fig_guild_spending, use_container_width=True)
+
+    # Scatter plot for FriendsCount vs PlayTimeHours (Existing)
+    # The trendline is fitted on every filtered player; above the point
+    # budget the points are drawn as a density map instead
+    friends_trend = ctx.cached_aggregate('friends_playtime_trend', lambda: page_metrics.friends_playtime_trend(ctx.df_filtered))
+    if ctx.exact_charts or len(ctx.df_filtered) <= MAX_SCATTER_POINTS:
+        fig_friends_playtime = px.scatter(
+            ctx.df_filtered,
+            x='FriendsCount',
+            y='PlayTimeHours',
+            title="Arkadaş Sayısı vs Oynama Süresi",
+            labels={'FriendsCount': 'Arkadaş Sayısı', 'PlayTimeHours': 'Oynama Süresi (Saat)'}
+        )
+    else:
+        friends_density = ctx.cached_aggregate('friends_playtime_density', lambda: page_metrics.friends_playtime_density(ctx.df_filtered))
+        fig_friends_playtime = density_figure(
+            friends_density,
+            title="Arkadaş Sayısı vs Oynama Süresi (Yoğunluk)",
+            x_title='Arkadaş Sayısı',
+            y_title='Oynama Süresi (Saat)'
+        )
+    add_trendline(fig_friends_playtime, friends_trend)
+    ctx.plotly_chart(fig_friends_playtime, use_container_width=True)
@@ -0,0 +1,90 @@
+import plotly.express as px
+import streamlit as st
+
+import page_metrics
+from histogram import histogram_figure
+
+# Columns this page reads besides the sidebar filter columns
+COLUMNS = ['AvgFPS', 'CrashCount', 'GuildMember']
+
+
+def render(ctx):
+    """Teknik Performans: FPS and crash distributions, performance by device and crashes by guild membership"""
+    st.title("🛠️ Teknik Performans")
+    # st.warning("Bu sayfa henüz geliştirilme aşamasındadır.")
+    
+    # Key metrics
+    perf_kpis = ctx.cached_aggregate('perf_kpis', lambda: page_metrics.performance_kpis(ctx.grouped_stats))
+    col1, col2 = st.columns(2)
+    with col1:
+        avg_fps = perf_kpis['avg_fps']
+        st.metric(
+            "Ortalama FPS",
+            f"{avg_fps:.1f}",
+            f"Min: {perf_kpis['min_fps']:.1f}, Maks: {perf_kpis['max_fps']:.1f}"
+        )
+    with col2:
+        total_crashes = perf_kpis['total_crashes']
+        avg_crashes = perf_kpis['avg_crashes']
+        st.metric(
+            "Toplam Çökme",
+            f"{total_crashes:,}",
+            f"Ortalama: {avg_crashes:.2f} / oyuncu"
+        )
+        
+    # Charts
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("📊 FPS Dağılımı")
+        fig = histogram_figure(
+            *ctx.filtered_histogram('AvgFPS'),
+            title="Ortalama FPS Dağılımı",
+            x_title='Ortalama FPS'
+        )
+        ctx.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("💥 Çökme Sayısı Dağılımı")
+        crash_counts = ctx.cached_aggregate('crash_counts', lambda: page_metrics.crash_counts(ctx.df_filtered))
+        fig = px.bar(
+            x=crash_counts.index,
+            y=crash_counts.values,
+            title="Oyuncu Başına Çökme Sayısı",
+            labels={'x': 'Çökme Sayısı', 'y': 'Oyuncu Sayısı'}
+        )
+        ctx.plotly_chart(fig, use_container_width=True)
+        
+    # Performance by Device
+    st.subheader("📱 Cihaza Göre Performans")
+    perf_by_device = ctx.cached_aggregate('perf_by_device', lambda: page_metrics.performance_by_device(ctx.grouped_stats))
+    
+    fig_fps = px.bar(
+        perf_by_device,
+        x='Device',
+        y='AvgFPS',
+        title="Cihaza Göre Ortalama FPS",
+        labels={'Device': 'Cihaz', 'AvgFPS': 'Ortalama FPS'}
+    )
+    ctx.plotly_chart(fig_fps, use_container_width=True)
+    
+    fig_crash = px.bar(
+        perf_by_device,
+        x='Device',
+        y='CrashCount',
+        title="Cihaza Göre Ortalama Çökme Sayısı",
+        labels={'Device': 'Cihaz', 'CrashCount': 'Ortalama Çökme'}
+    )
+    ctx.plotly_chart(fig_crash, use_container_width=True)
+
+    st.divider()
+    # Crashes by Guild Membership (New)
+    st.subheader("🛡️ Lonca Üyeliğine Göre Çökme Sayısı")
+    crashes_by_guild = ctx.cached_aggregate('crashes_by_guild', lambda: page_metrics.crashes_by_guild(ctx.grouped_stats))
+    fig_crash_guild = px.bar(
+        crashes_by_guild,
+        x='GuildMember',
+        y='CrashCount',
+        title="Lonca Üyeliğine Göre Ortalama Çökme Sayısı",
+        labels={'GuildMember': 'Lonca Durumu', 'CrashCount': 'Ortalama Çökme Sayısı'}
+    )
+    ctx.plotly_chart(fig_crash_guild, use_container_width=True)